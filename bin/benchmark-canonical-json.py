@@ -0,0 +1,75 @@
+"""
+Compare the canonical JSON encoders of the signer on collections of realistic sizes.
+
+Usage::
+
+    PYTHONPATH=kinto-remote-settings/src python bin/benchmark-canonical-json.py
+"""
+
+import argparse
+import random
+import timeit
+import uuid
+
+from kinto_remote_settings.signer import serializer
+
+
+SIZES = (100, 1000, 10000, 50000)
+
+
+def fake_record(rnd: random.Random, i: int) -> dict:
+    # Looks like a record of the certificates revocations list.
+    return {
+        "id": str(uuid.UUID(int=rnd.getrandbits(128))),
+        "last_modified": 1700000000000 + i,
+        "schema": 1699999999999,
+        "enabled": True,
+        "details": {
+            "bug": f"https://bugzilla.mozilla.org/show_bug.cgi?id={1800000 + i}",
+            "who": "",
+            "why": "Key compromise",
+            "name": "Certificat révoqué",
+            "created": "2023-11-14T22:13:20Z",
+        },
+        "issuerName": "MIGOMQswCQYDVQQGEwJVUzEXMBUGA1UEChMORGlnaUNlcnQgSW5jLjEZMBcGA1UECxMQ",
+        "serialNumber": f"{rnd.getrandbits(96):x}",
+        "filter_expression": "env.version|versionCompare('115.0a1') >= 0",
+    }
+
+
+def bench(func, repeat: int) -> float:
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1].strip())
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rnd = random.Random(42)
+    print(f"{'records':>8} {'canonicaljson':>14} {'fast':>8} {'cached':>8}")
+    for size in SIZES:
+        records = [fake_record(rnd, i) for i in range(size)]
+        results = []
+        for encoder in serializer.ENCODERS:
+            serializer.encoder = encoder
+            results.append(
+                bench(lambda: serializer.canonical_json(records, size), args.repeat)
+            )
+        # Signature refresh: all fragments are already cached.
+        serializer.canonical_json(records, size, cache_scope="bench")
+        results.append(
+            bench(
+                lambda: serializer.canonical_json(records, size, cache_scope="bench"),
+                args.repeat,
+            )
+        )
+        serializer.fragments_cache.clear()
+        print(
+            f"{size:>8} "
+            + " ".join(f"{r * 1000:>{w}.1f}ms" for r, w in zip(results, (12, 6, 6)))
+        )
+
+
+if __name__ == "__main__":
+    main()
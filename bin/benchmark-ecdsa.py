@@ -0,0 +1,60 @@
+"""
+Compare the signing and verification throughput of the local ECDSA signer backends.
+
+Usage::
+
+    PYTHONPATH=kinto-remote-settings/src python bin/benchmark-ecdsa.py
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from kinto_remote_settings.signer.backends import local_cryptography, local_ecdsa
+
+
+BACKENDS = {
+    "ecdsa": local_ecdsa.ECDSASigner,
+    "cryptography": local_cryptography.ECDSASigner,
+}
+
+
+def throughput(func, duration: float) -> float:
+    count = 0
+    started = time.perf_counter()
+    while (elapsed := time.perf_counter() - started) < duration:
+        func()
+        count += 1
+    return count / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1].strip())
+    parser.add_argument("--duration", type=float, default=2.0)
+    parser.add_argument("--payload-size", type=int, default=1024 * 1024)
+    args = parser.parse_args()
+
+    private_key, _ = local_ecdsa.ECDSASigner.generate_keypair()
+    fd, location = tempfile.mkstemp(suffix="signing-key")
+    with os.fdopen(fd, "wb") as key_file:
+        key_file.write(private_key)
+
+    # Like a serialized collection.
+    payload = b"x" * args.payload_size
+    try:
+        print(f"{'backend':>12} {'sign/s':>8} {'verify/s':>9}")
+        for name, signer_class in BACKENDS.items():
+            signer = signer_class(private_key=location)
+            signature = signer.sign(payload)[0]
+            signs = throughput(lambda: signer.sign(payload), args.duration)
+            verifies = throughput(
+                lambda: signer.verify(payload, signature), args.duration
+            )
+            print(f"{name:>12} {signs:>8.1f} {verifies:>9.1f}")
+    finally:
+        os.remove(location)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Compare the detection of float values in records, on big nested records.
+
+Usage::
+
+    PYTHONPATH=kinto-remote-settings/src python bin/benchmark-float-scan.py
+"""
+
+import argparse
+import random
+import timeit
+
+from kinto_remote_settings.signer import utils
+
+
+# (number of records, number of entries of each record)
+SIZES = ((1000, 10), (100, 1000), (10, 10000))
+
+
+def recursive_scan(d, path=""):
+    # Former implementation of the ``prevent_float_value`` listener.
+    if isinstance(d, list):
+        d = {i: o for i, o in enumerate(d)}
+    for k, v in d.items():
+        path = f"{path}.{k}" if path else k
+        if isinstance(v, float):
+            raise ValueError(path)
+        if isinstance(v, (list, dict)):
+            recursive_scan(v, path)
+
+
+def fake_record(rnd: random.Random, entries: int) -> dict:
+    # Looks like a record with a big nested list (eg. Nimbus experiments).
+    return {
+        "id": f"{rnd.getrandbits(64):x}",
+        "schema": 1700000000000,
+        "branches": [
+            {
+                "slug": f"branch-{i}",
+                "ratio": rnd.randint(1, 100),
+                "features": [{"enabled": True, "value": {"size": i, "tags": ["a"]}}],
+            }
+            for i in range(entries)
+        ],
+    }
+
+
+def bench(func, repeat: int) -> float:
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1].strip())
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rnd = random.Random(42)
+    print(f"{'records':>8} {'entries':>8} {'recursive':>10} {'iterative':>10}")
+    for count, entries in SIZES:
+        records = [fake_record(rnd, entries) for _ in range(count)]
+        recursive = bench(lambda: [recursive_scan(r) for r in records], args.repeat)
+        iterative = bench(lambda: [utils.find_float(r) for r in records], args.repeat)
+        print(
+            f"{count:>8} {entries:>8} {recursive * 1000:>8.1f}ms {iterative * 1000:>8.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -101,12 +101,15 @@ def fetch_all_changesets(
     client: KintoClient,
     with_preview_destination: bool = True,
     with_workspace_buckets: bool = False,
+    fields: list[str] | None = None,
 ) -> list[Any]:
     """
     Return the `/changeset` responses for all collections listed
     in the `monitor/changes` endpoint.
     The result contains the metadata and all the records of all collections
     for both preview and main buckets.
+    If `fields` is specified, records only contain these fields (and `id`,
+    `last_modified`).
     """
     monitor_changeset = client.get_changeset("monitor", "changes", bust_cache=True)
     print("%s collections" % len(monitor_changeset["changes"]))
@@ -145,7 +148,9 @@ def fetch_all_changesets(
                     )
                     break
 
+    params = {"_fields": ",".join(fields)} if fields else {}
     all_changesets = call_parallel(
-        lambda bid, cid, ts: client.get_changeset(bid, cid, _expected=ts), args_list
+        lambda bid, cid, ts: client.get_changeset(bid, cid, _expected=ts, **params),
+        args_list,
     )
     return all_changesets
@@ -170,7 +170,10 @@ def build_compression_dictionaries():
     # collections where compression dictionaries are enabled.
     kinto_client = KintoClient(server_url=SERVER, auth=AUTH)
     workspace_changesets = fetch_all_changesets(
-        kinto_client, with_workspace_buckets=True, with_preview_destination=False
+        kinto_client,
+        with_workspace_buckets=True,
+        with_preview_destination=False,
+        fields=["attachment.mimetype"],
     )
     to_compress = records_to_compress(workspace_changesets)
 
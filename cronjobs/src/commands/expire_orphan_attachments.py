@@ -30,7 +30,11 @@ def expire_orphan_attachments() -> None:
     to purge files from the tree that 404s on the server.
     """
     client = KintoClient(server_url=SERVER, auth=AUTH)
-    all_changesets = fetch_all_changesets(client, with_workspace_buckets=True)
+    all_changesets = fetch_all_changesets(
+        client,
+        with_workspace_buckets=True,
+        fields=["attachment.location", "attachment.size"],
+    )
 
     attachments = set()
     total_size = 0
@@ -82,3 +82,36 @@ def test_fetch_all_changesets():
             ]
         },
     ]
+
+
+@responses.activate
+def test_fetch_all_changesets_with_fields():
+    responses.add(
+        responses.GET,
+        "http://testserver:9999/v1/buckets/monitor/collections/changes/changeset",
+        json={
+            "changes": [
+                {
+                    "id": "a",
+                    "bucket": "main",
+                    "collection": "search-config",
+                    "last_modified": 1620000000000,
+                },
+            ]
+        },
+    )
+    responses.add(
+        responses.GET,
+        "http://testserver:9999/v1/buckets/main/collections/search-config/changeset",
+        json={"changes": []},
+    )
+
+    client = KintoClient(
+        server_url="http://testserver:9999/v1/",
+        auth=("user", "pass"),
+    )
+    fetch_all_changesets(client, fields=["attachment.hash", "attachment.size"])
+
+    assert (
+        "_fields=attachment.hash%2Cattachment.size" in responses.calls[-1].request.url
+    )
@@ -84,7 +84,11 @@ def test_expire_orphan_attachments(mock_fetch_all_changesets, mock_storage_clien
     expire_orphan_attachments()
 
     assert patched_blobs == {"folder1/orphan1.bin", "folder2/orphan2.png"}
-    mock_fetch_all_changesets.assert_called_with(ANY, with_workspace_buckets=True)
+    mock_fetch_all_changesets.assert_called_with(
+        ANY,
+        with_workspace_buckets=True,
+        fields=["attachment.location", "attachment.size"],
+    )
 
 
 @responses.activate
@@ -1,5 +1,9 @@
+import threading
+
+from kinto.core.events import AfterResourceChanged, ResourceChanged
 from pyramid.config import Configurator
-from pyramid.settings import aslist
+from pyramid.events import NewResponse
+from pyramid.settings import asbool, aslist
 
 from .. import __version__
 
@@ -15,6 +19,10 @@ CHANGESET_PATH = "/buckets/{bucket_id}/collections/{collection_id}/changeset"
 
 BROADCASTER_ID = "remote-settings"
 CHANNEL_ID = "monitor_changes"
+BROADCAST_CACHE_KEY = f"{BROADCASTER_ID}/{CHANNEL_ID}/timestamp"
+BROADCAST_LATEST_CACHE_KEY = f"{BROADCASTER_ID}/{CHANNEL_ID}/latest"
+
+DAY_IN_SECONDS = 24 * 60 * 60
 
 
 def includeme(config: Configurator) -> None:
@@ -32,4 +40,51 @@ def includeme(config: Configurator) -> None:
         collections=aslist(collections),
     )
 
+    from . import listeners
+
+    config.add_subscriber(
+        listeners.invalidate_changeset_cache,
+        ResourceChanged,
+        for_resources=("collection", "record"),
+    )
+    config.add_subscriber(
+        listeners.update_broadcast_timestamp,
+        AfterResourceChanged,
+        for_resources=("record",),
+    )
+    config.add_subscriber(
+        listeners.track_publications,
+        AfterResourceChanged,
+        for_resources=("record",),
+    )
+
+    config.add_subscriber(listeners.report_changeset_metrics, NewResponse)
+
+    # Purge CDN responses on changes, if a purge backend is configured.
+    config.registry.cdn_purger = None
+    if purge_backend := settings.get("changes.cdn_purge_backend"):
+        purge_module = config.maybe_dotted(purge_backend)
+        config.registry.cdn_purger = purge_module.load_from_settings(settings)
+
+        from ..signer.events import ReviewApproved
+
+        config.add_subscriber(
+            listeners.queue_cdn_purge,
+            ResourceChanged,
+            for_resources=("collection", "record"),
+        )
+        config.add_subscriber(listeners.queue_cdn_purge_on_approval, ReviewApproved)
+
+    # Notify the long-poll consumers of new broadcasted timestamps, if enabled.
+    config.registry.changes_notifier = None
+    if asbool(settings.get("changes.long_poll_enabled", False)):
+        from . import notifications
+
+        config.registry.changes_notifier = notifications.load_from_settings(
+            settings, cache=config.registry.cache
+        )
+        # Each waiting request holds a worker thread of this process.
+        max_waiters = int(settings.get("changes.long_poll_max_waiters", 10))
+        config.registry.changes_poll_waiters = threading.BoundedSemaphore(max_waiters)
+
     config.scan("kinto_remote_settings.changes.views")
@@ -0,0 +1,58 @@
+import logging
+from typing import Any
+
+import requests
+
+
+logger = logging.getLogger(__name__)
+
+
+def collection_surrogate_key(bucket_id: str, collection_id: str) -> str:
+    return f"{bucket_id}/{collection_id}"
+
+
+def surrogate_keys(bucket_id: str, collection_id: str) -> list[str]:
+    """
+    Keys used to tag the responses of the specified collection, allowing
+    targeted purges at the CDN level (per bucket or per collection).
+    """
+    return [bucket_id, collection_surrogate_key(bucket_id, collection_id)]
+
+
+class CDNPurgerBase(object):
+    def purge(self, keys: list[str]) -> None:
+        """
+        Invalidates the CDN cached responses tagged with the specified
+        surrogate keys.
+        """
+        raise NotImplementedError
+
+
+class HTTPPurger(CDNPurgerBase):
+    """
+    Purge via an HTTP API that accepts the list of surrogate keys in the
+    ``Surrogate-Key`` header (eg. Fastly batch purge).
+    """
+
+    def __init__(self, url: str, token: str | None = None, timeout: int = 5) -> None:
+        self.url = url
+        self.token = token
+        self.timeout = timeout
+
+    def purge(self, keys: list[str]) -> None:
+        headers = {"Surrogate-Key": " ".join(keys)}
+        if self.token:
+            headers["Fastly-Key"] = self.token
+        resp = requests.post(self.url, headers=headers, timeout=self.timeout)
+        resp.raise_for_status()
+        logger.info(
+            "Purged %s surrogate keys from CDN", len(keys), extra={"keys": keys}
+        )
+
+
+def load_from_settings(settings: dict[str, Any]) -> HTTPPurger:
+    return HTTPPurger(
+        url=settings["changes.cdn_purge_url"],
+        token=settings.get("changes.cdn_purge_token"),
+        timeout=int(settings.get("changes.cdn_purge_timeout_seconds", 5)),
+    )
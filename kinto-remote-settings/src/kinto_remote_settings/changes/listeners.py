@@ -0,0 +1,209 @@
+import logging
+import time
+from typing import Any
+
+import transaction
+
+from . import BROADCAST_LATEST_CACHE_KEY, CHANGES_COLLECTION, MONITOR_BUCKET
+from .cdn import collection_surrogate_key
+from .utils import (
+    adaptive_expires_enabled,
+    changeset_cache_invalidate,
+    is_monitored,
+    metrics_enabled,
+    record_publication,
+)
+
+
+logger = logging.getLogger(__name__)
+
+CDN_PURGE_QUEUE = "kinto_remote_settings.changes.cdn_purge"
+PUBLICATIONS_TRACKED = "kinto_remote_settings.changes.publications"
+
+
+def invalidate_changeset_cache(event: Any) -> None:
+    """
+    Drop the cached changeset responses of the collections impacted by
+    this event (records or metadata changes).
+    """
+    payload = event.payload
+    bid = payload["bucket_id"]
+
+    if payload["resource_name"] == "record":
+        cids = {payload["collection_id"]}
+    else:
+        cids = {
+            (impacted.get("new") or impacted["old"])["id"]
+            for impacted in event.impacted_objects
+        }
+
+    for cid in cids:
+        changeset_cache_invalidate(event.request, bid, cid)
+
+
+def update_broadcast_timestamp(event: Any) -> None:
+    """
+    Invalidate the latest timestamp of the monitored collections, so that the
+    broadcast view reads it again from the storage (once per change, instead
+    of on every Push service poll).
+
+    The cached value is not set here, since comparing and setting it is not
+    atomic across processes: concurrent commits could replace a higher value
+    by a lower one. Deleting it is idempotent.
+    """
+    payload = event.payload
+    bid = payload["bucket_id"]
+    cid = payload["collection_id"]
+    # Preview collections don't trigger broadcasts (see ``broadcasts_view``).
+    if "-preview" in f"{bid}/{cid}":
+        return
+    if not is_monitored(event.request.registry.settings, bid, cid):
+        return
+
+    cache = event.request.registry.cache
+    latest_timestamp = cache.get(BROADCAST_LATEST_CACHE_KEY)
+    if latest_timestamp is not None and payload["timestamp"] > latest_timestamp:
+        cache.delete(BROADCAST_LATEST_CACHE_KEY)
+
+
+def track_publications(event: Any) -> None:
+    """
+    Keep track of the publications of monitored collections, in order to adapt
+    their cache TTLs (see ``record_cache_adaptive_*`` settings).
+    """
+    payload = event.payload
+    bid = payload["bucket_id"]
+    cid = payload["collection_id"]
+    settings = event.request.registry.settings
+    if not is_monitored(settings, bid, cid):
+        return
+
+    cache = event.request.registry.cache
+    # A request publishes once, even if several events are sent (eg. one per
+    # action on approval, with different timestamps). The set is shared with
+    # batch subrequests and the signer requests.
+    tracked = event.request.bound_data.setdefault(PUBLICATIONS_TRACKED, set())
+    # Every publication is also a change of the monitor/changes endpoint.
+    for bucket, collection in ((bid, cid), (MONITOR_BUCKET, CHANGES_COLLECTION)):
+        if (bucket, collection) in tracked:
+            continue
+        tracked.add((bucket, collection))
+        if adaptive_expires_enabled(settings, bucket, collection):
+            record_publication(cache, bucket, collection, payload["timestamp"])
+
+
+def _queue_cdn_purge(request: Any, keys: set[str]) -> None:
+    # The queue is shared with batch subrequests, and purged once the
+    # transaction is committed.
+    queue = request.bound_data.get(CDN_PURGE_QUEUE)
+    if queue is None:
+        queue = request.bound_data[CDN_PURGE_QUEUE] = set()
+        transaction.get().addAfterCommitHook(_purge_cdn, args=(request,))
+    queue.update(keys)
+
+
+def _purge_cdn(success: bool, request: Any) -> None:
+    keys = request.bound_data.pop(CDN_PURGE_QUEUE, set())
+    if not success or not keys:
+        return
+    try:
+        request.registry.cdn_purger.purge(sorted(keys))
+    except Exception:
+        # Responses will expire from CDN anyway.
+        logger.error("Unable to purge CDN", exc_info=True)
+
+
+def queue_cdn_purge(event: Any) -> None:
+    """
+    Purge the CDN responses of the monitored collections impacted by this event
+    (records or metadata changes), as well as the monitor/changes endpoint.
+    """
+    payload = event.payload
+    bid = payload["bucket_id"]
+
+    if payload["resource_name"] == "record":
+        cids = {payload["collection_id"]}
+    else:
+        cids = {
+            (impacted.get("new") or impacted["old"])["id"]
+            for impacted in event.impacted_objects
+        }
+
+    settings = event.request.registry.settings
+    keys = {
+        collection_surrogate_key(bid, cid)
+        for cid in cids
+        if is_monitored(settings, bid, cid)
+    }
+    if keys:
+        keys.add(collection_surrogate_key(MONITOR_BUCKET, CHANGES_COLLECTION))
+        _queue_cdn_purge(event.request, keys)
+
+
+def queue_cdn_purge_on_approval(event: Any) -> None:
+    """
+    Purge the CDN responses of the preview and destination collections when
+    a review is approved.
+    """
+    keys = {
+        collection_surrogate_key(
+            event.resource[step]["bucket"], event.resource[step]["collection"]
+        )
+        for step in ("preview", "destination")
+        if event.resource.get(step)
+    }
+    keys.add(collection_surrogate_key(MONITOR_BUCKET, CHANGES_COLLECTION))
+    _queue_cdn_purge(event.request, keys)
+
+
+def report_changeset_metrics(event: Any) -> None:
+    """
+    Report the size, number of records and timings of the changeset responses,
+    per collection (see ``metrics_enabled()``).
+    """
+    request = event.request
+    stats = getattr(request, "changeset_stats", None)
+    if stats is None or event.response.status_code != 200:
+        return
+    if stats.get("streamed"):
+        # Reported once the body is sent (see ``report_changeset_stats()``).
+        return
+
+    if "serialization_seconds" not in stats:
+        stats["serialization_seconds"] = (
+            time.perf_counter() - stats["rendering_started"]
+        )
+    response = event.response
+    body_size = response.content_length
+    if body_size is None:
+        body_size = len(response.body or b"")
+    report_changeset_stats(request, stats, body_size)
+
+
+def report_changeset_stats(request: Any, stats: dict[str, Any], body_size: int) -> None:
+    metrics_service = request.registry.metrics
+    bid, cid = stats["bucket_id"], stats["collection_id"]
+    if metrics_service is None or not metrics_enabled(
+        request.registry.settings, bid, cid
+    ):
+        return
+
+    labels = [("bucket_id", bid), ("collection_id", cid)]
+    metrics_service.count(
+        "plugins.changes.changeset_requests",
+        unique=[*labels, ("type", "since" if stats["since"] else "full")],
+    )
+    metrics_service.observe("plugins.changes.changeset_size", body_size, labels=labels)
+    metrics_service.observe(
+        "plugins.changes.changeset_records", stats["records"], labels=labels
+    )
+    metrics_service.timer(
+        "plugins.changes.changeset_storage_seconds",
+        value=stats["storage_seconds"],
+        labels=labels,
+    )
+    metrics_service.timer(
+        "plugins.changes.changeset_serialization_seconds",
+        value=stats["serialization_seconds"],
+        labels=labels,
+    )
@@ -0,0 +1,86 @@
+import threading
+import time
+from typing import Any
+
+from . import BROADCASTER_ID, CHANNEL_ID, DAY_IN_SECONDS
+
+
+NOTIFICATION_CACHE_KEY = f"{BROADCASTER_ID}/{CHANNEL_ID}/notification"
+
+
+def _is_newer(value: int | None, last_value: int | None) -> bool:
+    return value is not None and (last_value is None or value > last_value)
+
+
+class NotifierBase(object):
+    def publish(self, value: int) -> None:
+        """
+        Notify the waiting consumers that a new timestamp was broadcasted.
+        """
+        raise NotImplementedError
+
+    def wait(self, last_value: int | None, timeout: float) -> int | None:
+        """
+        Block until a timestamp more recent than ``last_value`` is published,
+        and return it. Return ``None`` if nothing was published before ``timeout``
+        (in seconds).
+        """
+        raise NotImplementedError
+
+
+class CacheNotifier(NotifierBase):
+    """
+    Share the published timestamps between processes via the Kinto cache
+    backend, that consumers poll every ``poll_interval`` seconds.
+    """
+
+    def __init__(self, cache: Any, poll_interval: float = 1.0) -> None:
+        self.cache = cache
+        self.poll_interval = poll_interval
+
+    def publish(self, value: int) -> None:
+        self.cache.set(NOTIFICATION_CACHE_KEY, value, ttl=DAY_IN_SECONDS)
+
+    def wait(self, last_value: int | None, timeout: float) -> int | None:
+        deadline = time.monotonic() + timeout
+        while True:
+            value = self.cache.get(NOTIFICATION_CACHE_KEY)
+            if _is_newer(value, last_value):
+                return value
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            time.sleep(min(self.poll_interval, remaining))
+
+
+class MemoryNotifier(NotifierBase):
+    """
+    Wake up the consumers of the current process only (eg. for tests or
+    single process deployments).
+    """
+
+    def __init__(self) -> None:
+        self._condition = threading.Condition()
+        self._value: int | None = None
+
+    def publish(self, value: int) -> None:
+        with self._condition:
+            self._value = value
+            self._condition.notify_all()
+
+    def wait(self, last_value: int | None, timeout: float) -> int | None:
+        with self._condition:
+            changed = self._condition.wait_for(
+                lambda: _is_newer(self._value, last_value),
+                timeout=timeout,
+            )
+            return self._value if changed else None
+
+
+def load_from_settings(settings: dict[str, Any], cache: Any) -> NotifierBase:
+    if settings.get("changes.long_poll_notifier", "cache") == "memory":
+        return MemoryNotifier()
+    return CacheNotifier(
+        cache=cache,
+        poll_interval=float(settings.get("changes.long_poll_interval_seconds", 1.0)),
+    )
@@ -0,0 +1,137 @@
+"""
+Maintenance commands for the monitored collections.
+
+Usage::
+
+    python -m kinto_remote_settings.changes.scripts --ini config/kinto.ini
+"""
+
+import argparse
+import logging
+import os
+import re
+import sys
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from kinto.core.storage import Filter, Sort
+from kinto.core.utils import COMPARISON
+from pyramid.paster import bootstrap
+
+from .utils import is_monitored
+
+
+DEFAULT_CONFIG_FILE = os.getenv("KINTO_INI", "config/kinto.ini")
+
+COLLECTION_URI_REGEX = re.compile(r"^/buckets/([^/]+)/collections/([^/]+)$")
+
+logger = logging.getLogger(__name__)
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def purge_old_tombstones(env: dict[str, Any], batch_size: int = 1000) -> int:
+    """
+    Delete the tombstones of monitored collections that are older than the
+    ``changes.since_max_age_days`` setting. Since clients with an older ``_since``
+    value are redirected to the full list of records, these are never served.
+
+    Tombstones are purged in batches of at most ``batch_size``, each in its own
+    transaction.
+    """
+    registry = env["registry"]
+    settings = registry.settings
+    storage = registry.storage
+
+    max_age_days = int(settings.get("changes.since_max_age_days", 21))
+    if max_age_days < 0:
+        logger.error(
+            "Old `_since` values are not redirected (changes.since_max_age_days < 0). "
+            "Tombstones are kept."
+        )
+        return 1
+    before = int((utcnow() - timedelta(days=max_age_days)).timestamp() * 1000)
+
+    count = 0
+    # In Kinto, the only parents of 'record' resources are collections.
+    for parent_id in sorted(storage.all_resources_timestamps("record")):
+        match = COLLECTION_URI_REGEX.match(parent_id)
+        if match is None or not is_monitored(settings, *match.groups()):
+            continue
+        deleted = _purge_tombstones(storage, parent_id, before, batch_size)
+        if deleted:
+            logger.info("%s tombstone(s) deleted from %s.", deleted, parent_id)
+        count += deleted
+
+    logger.info(
+        "%s tombstone(s) older than %s days deleted in total.", count, max_age_days
+    )
+    return 0
+
+
+def _purge_tombstones(
+    storage: Any, parent_id: str, before: int, batch_size: int
+) -> int:
+    """
+    Delete the tombstones of the specified collection that are older than
+    ``before``, walking through its objects by ascending timestamps (which are
+    unique within a collection) so that each batch is bounded.
+    """
+    count = 0
+    filters = [Filter("last_modified", before, COMPARISON.LT)]
+    while True:
+        page = storage.list_all(
+            resource_name="record",
+            parent_id=parent_id,
+            filters=filters,
+            limit=batch_size,
+            sorting=[Sort("last_modified", 1)],
+            include_deleted=True,
+        )
+        if not page:
+            return count
+        batch_before = min(page[-1]["last_modified"] + 1, before)
+        count += storage.purge_deleted(
+            resource_name="record",
+            parent_id=parent_id,
+            before=batch_before,
+            force_commit=True,
+        )
+        if len(page) < batch_size:
+            return count
+        filters = [
+            Filter("last_modified", page[-1]["last_modified"], COMPARISON.GT),
+            Filter("last_modified", before, COMPARISON.LT),
+        ]
+
+
+def main(args: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Purge tombstones that are older than the `_since` redirection window."
+    )
+    parser.add_argument(
+        "--ini",
+        help="Application configuration file",
+        dest="ini_file",
+        required=False,
+        default=DEFAULT_CONFIG_FILE,
+    )
+    parser.add_argument(
+        "--batch-size",
+        help="Maximum number of tombstones deleted per transaction",
+        dest="batch_size",
+        type=int,
+        required=False,
+        default=1000,
+    )
+    parsed_args = parser.parse_args(args)
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)-5.5s  %(message)s")
+    env = bootstrap(parsed_args.ini_file)
+    return purge_old_tombstones(env, batch_size=parsed_args.batch_size)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
@@ -1,9 +1,18 @@
+import contextlib
 import hashlib
-from typing import Any, Optional
+import itertools
+import json
+from typing import Any, Iterator, Optional
 from uuid import UUID
 
 from kinto.core import utils as core_utils
-from pyramid.settings import aslist
+from kinto.core.storage import Filter, Sort
+from kinto.core.storage import exceptions as storage_exceptions
+from kinto.core.storage import postgresql as postgresql_storage
+from kinto.core.utils import COMPARISON
+from pyramid.settings import asbool, aslist
+
+from . import CHANGES_COLLECTION, MONITOR_BUCKET
 
 
 def bound_limit(settings: dict, value: Optional[int]) -> int:
@@ -18,6 +27,41 @@ def bound_limit(settings: dict, value: Optional[int]) -> int:
     return min(abs(value), max_limit) if value is not None else max_limit
 
 
+def _matches_resources(collection_uri: str, resources_uri: list[str]) -> bool:
+    return any(
+        collection_uri.startswith(uri if "/collections/" in uri else f"{uri}/")
+        for uri in resources_uri
+    )
+
+
+def is_monitored(settings: dict, bucket_id: str, collection_id: str) -> bool:
+    """
+    Return whether the specified collection is part of the monitored resources
+    (ie. listed in the monitor/changes endpoint).
+
+    :rtype: bool
+    """
+    included_resources_uri = aslist(settings.get("changes.resources", ""))
+    excluded_collections_uri = aslist(settings.get("changes.excluded_collections", ""))
+    collection_uri = f"/buckets/{bucket_id}/collections/{collection_id}"
+    return _matches_resources(
+        collection_uri, included_resources_uri
+    ) and not _matches_resources(collection_uri, excluded_collections_uri)
+
+
+def metrics_enabled(settings: dict, bucket_id: str, collection_id: str) -> bool:
+    """
+    Return whether the changeset metrics are reported for this collection.
+    In order to keep cardinality bounded, only the monitored collections and
+    the monitor/changes endpoint are reported.
+
+    :rtype: bool
+    """
+    if (bucket_id, collection_id) == (MONITOR_BUCKET, CHANGES_COLLECTION):
+        return True
+    return is_monitored(settings, bucket_id, collection_id)
+
+
 def monitored_timestamps(request: Any) -> list[tuple[str, str, int]]:
     """
     Return the list of collection timestamps based on the specified
@@ -37,17 +81,9 @@ def monitored_timestamps(request: Any) -> list[tuple[str, str, int]]:
 
     results = []
     for parent_id, timestamp in all_resources_timestamps.items():
-        matches_included = any(
-            parent_id.startswith(uri if "/collections/" in uri else f"{uri}/")
-            for uri in included_resources_uri
-        )
-        if not matches_included:
+        if not _matches_resources(parent_id, included_resources_uri):
             continue
-        matches_excluded = any(
-            parent_id.startswith(uri if "/collections/" in uri else f"{uri}/")
-            for uri in excluded_collections_uri
-        )
-        if matches_excluded:
+        if _matches_resources(parent_id, excluded_collections_uri):
             continue
 
         resource_name, matchdict = core_utils.view_lookup_registry(
@@ -62,6 +98,424 @@ def monitored_timestamps(request: Any) -> list[tuple[str, str, int]]:
     return results
 
 
+CHANGESET_SNAPSHOT_QUERY = """
+WITH collection_metadata AS (
+    SELECT data, as_epoch(last_modified) AS last_modified
+      FROM objects
+     WHERE id = :collection_id
+       AND parent_id = :bucket_uri
+       AND resource_name = 'collection'
+       AND NOT deleted
+),
+records_timestamps AS (
+    -- Same as `resource_timestamp()`: latest record, or empty collection timestamp.
+    (
+        SELECT last_modified
+          FROM objects
+         WHERE parent_id = :collection_uri
+           AND resource_name = 'record'
+         ORDER BY last_modified DESC
+         LIMIT 1
+    )
+    UNION
+    (
+        SELECT last_modified
+          FROM timestamps
+         WHERE parent_id = :collection_uri
+           AND resource_name = 'record'
+    )
+),
+changes AS (
+    SELECT id, last_modified, {projection} AS data
+      FROM objects
+     WHERE parent_id = :collection_uri
+       AND resource_name = 'record'
+       {conditions_deleted}
+       {conditions_filter}
+     ORDER BY last_modified DESC
+     LIMIT :pagination_limit
+)
+SELECT
+    metadata.data AS metadata,
+    metadata.last_modified AS metadata_timestamp,
+    (SELECT as_epoch(MAX(last_modified)) FROM records_timestamps) AS records_timestamp,
+    (
+        SELECT json_agg(
+            json_build_array(id, as_epoch(last_modified), data)
+            ORDER BY last_modified DESC
+        )
+          FROM changes
+    ) AS changes
+  FROM (SELECT 1) AS single_row
+  LEFT JOIN collection_metadata AS metadata ON TRUE;
+"""
+
+
+def changeset_snapshot(
+    storage: Any,
+    bucket_id: str,
+    collection_id: str,
+    filters: list[Filter],
+    limit: int,
+    include_deleted: bool,
+    fields: Optional[list[str]] = None,
+) -> tuple[dict[str, Any], list[dict[str, Any]], int]:
+    """
+    Return the collection metadata, the list of records (sorted by timestamp desc)
+    and the records timestamp, from a consistent snapshot of the storage.
+
+    With the PostgreSQL backend, everything is fetched with a single statement.
+    Otherwise, the timestamps are compared before and after reading the records.
+
+    If ``fields`` is specified, records only contain these fields (see
+    :func:`project_changes`).
+
+    :raises: :class:`kinto.core.storage.exceptions.ObjectNotFoundError` if the
+        collection does not exist.
+    :rtype: tuple[dict,list[dict],int]
+    """
+    bucket_uri = f"/buckets/{bucket_id}"
+    collection_uri = f"{bucket_uri}/collections/{collection_id}"
+
+    if isinstance(storage, postgresql_storage.Storage):
+        return _changeset_snapshot_postgresql(
+            storage,
+            bucket_uri,
+            collection_uri,
+            collection_id,
+            filters,
+            limit,
+            include_deleted,
+            fields,
+        )
+
+    # We'll make sure that data isn't changed while we read metadata, changes, etc.
+    before = storage.resource_timestamp(
+        resource_name="record", parent_id=collection_uri
+    )
+    metadata = storage.get(
+        resource_name="collection", parent_id=bucket_uri, object_id=collection_id
+    )
+    changes = changeset_records(
+        storage,
+        bucket_id,
+        collection_id,
+        filters=filters,
+        limit=limit,
+        include_deleted=include_deleted,
+        fields=fields,
+        records_timestamp=before,
+    )
+    return metadata, changes, before
+
+
+def changeset_records(
+    storage: Any,
+    bucket_id: str,
+    collection_id: str,
+    filters: list[Filter],
+    limit: int,
+    include_deleted: bool,
+    records_timestamp: int,
+    fields: Optional[list[str]] = None,
+) -> list[dict[str, Any]]:
+    """
+    Return the list of records of the collection (sorted by timestamp desc),
+    when the collection metadata and records timestamp were already read.
+
+    :raises: :class:`kinto.core.storage.exceptions.IntegrityError` if records
+        were changed since ``records_timestamp`` was read.
+    :rtype: list[dict]
+    """
+    collection_uri = f"/buckets/{bucket_id}/collections/{collection_id}"
+    changes = storage.list_all(
+        resource_name="record",
+        parent_id=collection_uri,
+        filters=filters,
+        limit=limit,
+        id_field="id",
+        modified_field="last_modified",
+        deleted_field="deleted",
+        sorting=[Sort("last_modified", -1)],
+        include_deleted=include_deleted,
+    )
+    after = storage.resource_timestamp(resource_name="record", parent_id=collection_uri)
+    # Do not serve inconsistent data.
+    if after != records_timestamp:  # pragma: no cover
+        raise storage_exceptions.IntegrityError(message="Inconsistent data. Retry.")
+
+    return project_changes(changes, fields)
+
+
+def _changeset_snapshot_postgresql(
+    storage: Any,
+    bucket_uri: str,
+    collection_uri: str,
+    collection_id: str,
+    filters: list[Filter],
+    limit: int,
+    include_deleted: bool,
+    fields: Optional[list[str]],
+    conn: Any = None,
+) -> tuple[dict[str, Any], list[dict[str, Any]], int]:
+    from kinto.core.utils import sqlalchemy as sa
+
+    placeholders: dict[str, Any] = dict(
+        bucket_uri=bucket_uri,
+        collection_uri=collection_uri,
+        collection_id=collection_id,
+        pagination_limit=limit,
+    )
+    safeholders = {
+        "conditions_deleted": "",
+        "conditions_filter": "",
+        "projection": "data",
+    }
+    if not include_deleted:
+        safeholders["conditions_deleted"] = "AND NOT deleted"
+    if filters:
+        safe_sql, holders = storage._format_conditions(filters, "id", "last_modified")
+        safeholders["conditions_filter"] = f"AND {safe_sql}"
+        placeholders.update(**holders)
+    if fields:
+        # Only fetch the top-level fields, subfields are picked afterwards.
+        safeholders["projection"] = (
+            "COALESCE((SELECT jsonb_object_agg(key, value) FROM jsonb_each(data)"
+            " WHERE key = ANY(:projection_fields)), '{}'::jsonb)"
+        )
+        placeholders["projection_fields"] = sorted(
+            {field.split(".", 1)[0] for field in _projected_fields(fields)}
+        )
+
+    query = CHANGESET_SNAPSHOT_QUERY.format_map(safeholders)
+    if conn is not None:
+        row = conn.execute(sa.text(query), placeholders).fetchone()
+    else:
+        with storage.client.connect(readonly=True) as conn:
+            result = conn.execute(sa.text(query), placeholders)
+            row = result.fetchone()
+
+    if row.metadata is None:
+        raise storage_exceptions.ObjectNotFoundError(collection_id)
+
+    metadata = row.metadata
+    metadata["id"] = collection_id
+    metadata["last_modified"] = row.metadata_timestamp
+
+    changes = []
+    for rid, last_modified, data in row.changes or []:
+        record = data
+        record["id"] = rid
+        record["last_modified"] = last_modified
+        changes.append(record)
+
+    records_timestamp = row.records_timestamp
+    if records_timestamp is None:
+        # The timestamp of this empty collection was never initialized.
+        records_timestamp = storage.resource_timestamp(
+            resource_name="record", parent_id=collection_uri
+        )
+
+    return metadata, project_changes(changes, fields), records_timestamp
+
+
+def _projected_fields(fields: list[str]) -> list[str]:
+    # Like on Kinto records endpoints, the ``id`` and ``last_modified`` fields
+    # are always returned, and tombstones remain distinguishable.
+    return ["id", "last_modified", "deleted", *fields]
+
+
+def project_changes(
+    changes: list[dict[str, Any]], fields: Optional[list[str]]
+) -> list[dict[str, Any]]:
+    """
+    Return the list of changes with only the specified fields (dotted notation
+    is supported for subfields, eg. ``attachment.hash``). Unchanged if ``fields``
+    is empty.
+
+    :rtype: list[dict]
+    """
+    if not fields:
+        return changes
+    fields = _projected_fields(fields)
+    return [core_utils.dict_subset(change, fields) for change in changes]
+
+
+def columnar_changes(changes: list[dict[str, Any]], host: str) -> dict[str, Any]:
+    """
+    Return the monitor/changes entries in a compact columnar form, where
+    bucket and collection names are interned (ie. listed once and referred to
+    by index). The ``id`` field is omitted, since it can be derived from the
+    host, bucket and collection (see ``change_entry_id()``).
+
+    :rtype: dict
+    """
+    buckets: dict[str, int] = {}
+    collections: dict[str, int] = {}
+    bucket_column = []
+    collection_column = []
+    last_modified_column = []
+    for change in changes:
+        bucket_column.append(buckets.setdefault(change["bucket"], len(buckets)))
+        collection_column.append(
+            collections.setdefault(change["collection"], len(collections))
+        )
+        last_modified_column.append(change["last_modified"])
+    return {
+        "host": host,
+        "buckets": list(buckets),
+        "collections": list(collections),
+        "bucket": bucket_column,
+        "collection": collection_column,
+        "last_modified": last_modified_column,
+    }
+
+
+def changeset_page_size(settings: dict) -> int:
+    """
+    Size of the pages read from storage when changesets are built incrementally,
+    bounded by the storage max fetch size. ``0`` when disabled (default).
+
+    :rtype: int
+    """
+    value = int(settings.get("changes.changeset_page_size", 0))
+    return min(value, settings["storage_max_fetch_size"]) if value > 0 else 0
+
+
+@contextlib.contextmanager
+def snapshot_connection(storage: Any) -> Iterator[Any]:
+    """
+    Hold a read-only connection to the PostgreSQL storage, whose statements all
+    see the same snapshot of the data (``REPEATABLE READ``). It is independent
+    from the request transaction, and can thus outlive it.
+
+    :raises: :class:`kinto.core.storage.exceptions.BackendError`
+    """
+    from kinto.core.utils import sqlalchemy as sa
+
+    engine = storage.client.session_factory().get_bind()
+    try:
+        with engine.connect() as conn:
+            conn = conn.execution_options(isolation_level="REPEATABLE READ")
+            with conn.begin():
+                conn.execute(sa.text("SET TRANSACTION READ ONLY"))
+                yield conn
+    except sa.exc.SQLAlchemyError as e:
+        raise storage_exceptions.BackendError(original=e) from e
+
+
+def changeset_pages(
+    storage: Any,
+    bucket_id: str,
+    collection_id: str,
+    filters: list[Filter],
+    include_deleted: bool,
+    page_size: int,
+    limit: Optional[int] = None,
+    fields: Optional[list[str]] = None,
+) -> Iterator[Any]:
+    """
+    Yield the collection metadata and the records timestamp, and then the pages
+    of records (sorted by timestamp desc), all from a consistent snapshot of the
+    storage. Stops when a page is incomplete or when ``limit`` is reached.
+
+    With the PostgreSQL backend, the pages are read while they are consumed,
+    through a connection that is held until the generator is closed (see
+    :func:`snapshot_connection`). Otherwise, they are all read first, and the
+    timestamps are compared before and after.
+
+    If ``fields`` is specified, records only contain these fields (see
+    :func:`project_changes`).
+
+    :raises: :class:`kinto.core.storage.exceptions.ObjectNotFoundError` if the
+        collection does not exist.
+    :raises: :class:`kinto.core.storage.exceptions.IntegrityError` if records
+        were changed while being read.
+    """
+    bucket_uri = f"/buckets/{bucket_id}"
+    collection_uri = f"{bucket_uri}/collections/{collection_id}"
+    first_page_limit = page_size if limit is None else min(page_size, limit)
+
+    if isinstance(storage, postgresql_storage.Storage):
+        with snapshot_connection(storage) as conn:
+
+            def read_snapshot(page_filters, page_limit):
+                return _changeset_snapshot_postgresql(
+                    storage,
+                    bucket_uri,
+                    collection_uri,
+                    collection_id,
+                    page_filters,
+                    page_limit,
+                    include_deleted,
+                    fields,
+                    conn=conn,
+                )
+
+            metadata, first_page, records_timestamp = read_snapshot(
+                filters, first_page_limit
+            )
+            yield metadata, records_timestamp
+            yield from _keyset_pages(
+                lambda *args: read_snapshot(*args)[1],
+                first_page,
+                filters,
+                page_size,
+                limit,
+            )
+        return
+
+    def read_page(page_filters, page_limit):
+        page = storage.list_all(
+            resource_name="record",
+            parent_id=collection_uri,
+            filters=page_filters,
+            limit=page_limit,
+            id_field="id",
+            modified_field="last_modified",
+            deleted_field="deleted",
+            sorting=[Sort("last_modified", -1)],
+            include_deleted=include_deleted,
+        )
+        return project_changes(page, fields)
+
+    before = storage.resource_timestamp(
+        resource_name="record", parent_id=collection_uri
+    )
+    metadata = storage.get(
+        resource_name="collection", parent_id=bucket_uri, object_id=collection_id
+    )
+    first_page = read_page(filters, first_page_limit)
+    pages = list(_keyset_pages(read_page, first_page, filters, page_size, limit))
+    after = storage.resource_timestamp(resource_name="record", parent_id=collection_uri)
+    # Do not serve inconsistent data.
+    if after != before:
+        raise storage_exceptions.IntegrityError(message="Inconsistent data. Retry.")
+
+    yield metadata, before
+    yield from pages
+
+
+def _keyset_pages(
+    read_page: Any,
+    first_page: list[dict[str, Any]],
+    filters: list[Filter],
+    page_size: int,
+    limit: Optional[int],
+) -> Iterator[list[dict[str, Any]]]:
+    # Keyset pagination on ``last_modified`` (records timestamps are unique
+    # within a collection).
+    page = first_page
+    count = len(page)
+    yield page
+    while len(page) == page_size and (limit is None or count < limit):
+        page_limit = page_size if limit is None else min(page_size, limit - count)
+        before = Filter("last_modified", page[-1]["last_modified"], COMPARISON.LT)
+        page = read_page([*filters, before], page_limit)
+        count += len(page)
+        yield page
+
+
 _CHANGES_ENTRIES_ID_CACHE: dict[tuple[str, str, str], str] = {}
 
 
@@ -85,3 +539,216 @@ def change_entry_id(
         entry_id = str(UUID(identifier))
         _CHANGES_ENTRIES_ID_CACHE[cache_key] = entry_id
     return _CHANGES_ENTRIES_ID_CACHE[cache_key]
+
+
+CHANGESET_CACHE_PREFIX = "changeset"
+CHANGESET_CACHE_MAX_ENTRIES = 10
+
+
+def _changeset_cache_setting(
+    settings: dict, bid: str, cid: str, name: str, default: Any = None
+) -> Any:
+    # Like the other ``record_cache_*`` settings, the collection-specific value
+    # has priority over the bucket-wide value.
+    for prefix in (f"{bid}.{cid}.", f"{bid}."):
+        value = settings.get(f"{prefix}record_cache_changeset_{name}")
+        if value is not None:
+            return value
+    return default
+
+
+def changeset_cache_ttl(settings: dict, bid: str, cid: str) -> Optional[int]:
+    """
+    Return the TTL of the changeset responses cache for this collection,
+    or ``None`` if the cache is not enabled.
+    """
+    ttl = _changeset_cache_setting(settings, bid, cid, "ttl_seconds")
+    return int(ttl) if ttl is not None else None
+
+
+def _changeset_cache_max_entries(settings: dict, bid: str, cid: str) -> int:
+    return int(
+        _changeset_cache_setting(
+            settings, bid, cid, "max_entries", default=CHANGESET_CACHE_MAX_ENTRIES
+        )
+    )
+
+
+def changeset_cache_key(
+    settings: dict,
+    bid: str,
+    cid: str,
+    records_timestamp: int,
+    metadata_timestamp: int,
+    querystring: dict[str, Any],
+) -> tuple[str, str]:
+    """
+    Return the cache key of a changeset response, and the fingerprint of its
+    content.
+
+    Each querystring is stored in one of the ``max_entries`` slots of the
+    collection, so that the number of entries is bounded without having to
+    maintain an index of the stored keys. The fingerprint is stored along the
+    response, and compared when it is read.
+
+    The ``_expected`` cache busting value has no effect on the response content,
+    and is thus left out.
+    """
+    normalized = sorted((k, str(v)) for k, v in querystring.items() if k != "_expected")
+    slot_digest = hashlib.sha256(json.dumps(normalized).encode("utf-8")).hexdigest()
+    slot = int(slot_digest, 16) % _changeset_cache_max_entries(settings, bid, cid)
+    fingerprint = json.dumps([records_timestamp, metadata_timestamp, normalized])
+    digest = hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()
+    return f"{CHANGESET_CACHE_PREFIX}/{bid}/{cid}/{slot}", digest
+
+
+def changeset_cache_get(
+    request: Any,
+    bid: str,
+    cid: str,
+    records_timestamp: int,
+    metadata_timestamp: int,
+    querystring: dict[str, Any],
+) -> Optional[list[dict[str, Any]]]:
+    """
+    Return the cached list of changes, or ``None`` if missing or if the slot
+    contains another response.
+    """
+    key, fingerprint = changeset_cache_key(
+        request.registry.settings,
+        bid,
+        cid,
+        records_timestamp,
+        metadata_timestamp,
+        querystring,
+    )
+    entry = request.registry.cache.get(key)
+    if entry is None or entry["fingerprint"] != fingerprint:
+        return None
+    return entry["changes"]
+
+
+def changeset_cache_set(
+    request: Any,
+    bid: str,
+    cid: str,
+    records_timestamp: int,
+    metadata_timestamp: int,
+    querystring: dict[str, Any],
+    value: list[dict[str, Any]],
+) -> None:
+    """
+    Store a changeset list of changes in cache. Concurrent writes of the same
+    slot are harmless: the last one wins.
+    """
+    settings = request.registry.settings
+    ttl = changeset_cache_ttl(settings, bid, cid)
+    if ttl is None:
+        return
+    key, fingerprint = changeset_cache_key(
+        settings, bid, cid, records_timestamp, metadata_timestamp, querystring
+    )
+    request.registry.cache.set(
+        key, {"fingerprint": fingerprint, "changes": value}, ttl=ttl
+    )
+
+
+def changeset_cache_invalidate(request: Any, bid: str, cid: str) -> None:
+    """
+    Drop every cached changeset response of the specified collection.
+    """
+    settings = request.registry.settings
+    if changeset_cache_ttl(settings, bid, cid) is None:
+        return
+    cache = request.registry.cache
+    for slot in range(_changeset_cache_max_entries(settings, bid, cid)):
+        cache.delete(f"{CHANGESET_CACHE_PREFIX}/{bid}/{cid}/{slot}")
+
+
+PUBLICATIONS_CACHE_PREFIX = "publications"
+PUBLICATIONS_HISTORY_SIZE = 20
+PUBLICATIONS_HISTORY_TTL_SECONDS = 30 * 24 * 60 * 60
+ADAPTIVE_EXPIRES_DEFAULT_MINIMUM_SECONDS = 60
+ADAPTIVE_EXPIRES_DEFAULT_MAXIMUM_SECONDS = 24 * 60 * 60
+ADAPTIVE_EXPIRES_DEFAULT_RATIO = 0.1
+
+
+def _adaptive_expires_setting(
+    settings: dict, bid: str, cid: str, name: str, default: Any = None
+) -> Any:
+    for prefix in (f"{bid}.{cid}.", f"{bid}.", ""):
+        value = settings.get(f"{prefix}record_cache_adaptive_{name}")
+        if value is not None:
+            return value
+    return default
+
+
+def adaptive_expires_enabled(settings: dict, bid: str, cid: str) -> bool:
+    """
+    Return whether the cache TTLs of this collection are computed from its
+    publications frequency.
+    """
+    return asbool(_adaptive_expires_setting(settings, bid, cid, "expires"))
+
+
+def record_publication(cache: Any, bid: str, cid: str, timestamp: int) -> None:
+    """
+    Keep track of the latest publication timestamps of the specified collection.
+    """
+    key = f"{PUBLICATIONS_CACHE_PREFIX}/{bid}/{cid}"
+    history = cache.get(key) or []
+    if history and history[-1] >= timestamp:
+        # Several events are sent for the same publication.
+        return
+    history = [*history, timestamp][-PUBLICATIONS_HISTORY_SIZE:]
+    cache.set(key, history, ttl=PUBLICATIONS_HISTORY_TTL_SECONDS)
+
+
+def adaptive_cache_control(
+    settings: dict, cache: Any, bid: str, cid: str
+) -> Optional[tuple[int, int, int]]:
+    """
+    Compute the ``max-age``, ``stale-while-revalidate`` and ``stale-if-error``
+    values from the median interval between the latest publications of the
+    collection, within the configured bounds.
+
+    Return ``None`` if adaptive TTLs are disabled or if the history is too short.
+
+    :rtype: tuple[int,int,int]
+    """
+    if not adaptive_expires_enabled(settings, bid, cid):
+        return None
+    history = cache.get(f"{PUBLICATIONS_CACHE_PREFIX}/{bid}/{cid}") or []
+    if len(history) < 2:
+        return None
+
+    minimum = int(
+        _adaptive_expires_setting(
+            settings,
+            bid,
+            cid,
+            "minimum_expires_seconds",
+            ADAPTIVE_EXPIRES_DEFAULT_MINIMUM_SECONDS,
+        )
+    )
+    maximum = int(
+        _adaptive_expires_setting(
+            settings,
+            bid,
+            cid,
+            "maximum_expires_seconds",
+            ADAPTIVE_EXPIRES_DEFAULT_MAXIMUM_SECONDS,
+        )
+    )
+    ratio = float(
+        _adaptive_expires_setting(
+            settings, bid, cid, "expires_ratio", ADAPTIVE_EXPIRES_DEFAULT_RATIO
+        )
+    )
+
+    intervals = sorted(after - before for before, after in itertools.pairwise(history))
+    median_interval_seconds = intervals[len(intervals) // 2] / 1000
+    max_age = min(max(int(median_interval_seconds * ratio), minimum), maximum)
+    # Serve stale content while revalidating for as long as it was fresh, and
+    # keep serving it if the origin fails.
+    return max_age, max_age, maximum
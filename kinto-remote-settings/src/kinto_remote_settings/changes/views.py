@@ -1,40 +1,77 @@
+import contextlib
 import logging
+import time
 from datetime import datetime, timedelta, timezone
-from typing import Any
+from typing import Any, Iterator
 from urllib.parse import urlencode
 
 import colander
 import kinto.core
+import transaction
 from kinto.authorization import RouteFactory
-from kinto.core import Service, resource
+from kinto.core import Service, errors, resource
 from kinto.core import utils as core_utils
 from kinto.core.cornice.validators import colander_validator
 from kinto.core.storage import Filter, Sort
 from kinto.core.storage import exceptions as storage_exceptions
 from kinto.core.storage.memory import extract_object_set
 from kinto.core.utils import COMPARISON, instance_uri
+from kinto.views import NameGenerator
 from pyramid import httpexceptions
+from pyramid.response import Response
 from pyramid.security import NO_PERMISSION_REQUIRED, IAuthorizationPolicy
 from zope.interface import implementer
 
 from . import (
+    BROADCAST_CACHE_KEY,
+    BROADCAST_LATEST_CACHE_KEY,
     BROADCASTER_ID,
     CHANGES_COLLECTION,
     CHANGES_COLLECTION_PATH,
     CHANGES_RECORDS_PATH,
     CHANGESET_PATH,
     CHANNEL_ID,
+    DAY_IN_SECONDS,
     MONITOR_BUCKET,
 )
-from .utils import bound_limit, change_entry_id, monitored_timestamps
+from .cdn import surrogate_keys
+from .listeners import report_changeset_stats
+from .utils import (
+    adaptive_cache_control,
+    bound_limit,
+    change_entry_id,
+    changeset_cache_get,
+    changeset_cache_set,
+    changeset_cache_ttl,
+    changeset_page_size,
+    changeset_pages,
+    changeset_records,
+    changeset_snapshot,
+    columnar_changes,
+    is_monitored,
+    monitored_timestamps,
+    project_changes,
+)
 
 
-DAY_IN_SECONDS = 24 * 60 * 60
 POSTGRESQL_MAX_INTEGER_VALUE = 2**63
 JANUARY_1ST_2100 = 4102444800000
 positive_big_integer = colander.Range(min=0, max=POSTGRESQL_MAX_INTEGER_VALUE)
 timestamp_range = colander.Range(min=0, max=JANUARY_1ST_2100)
 
+# Querystring parameters supported by the monitor/changes changeset endpoint.
+CHANGESET_QUERYSTRING_PARAMS = (
+    "_expected",
+    "_fields",
+    "_format",
+    "_limit",
+    "_since",
+    "bucket",
+    "collection",
+)
+# Compact representation of the monitor/changes entries (``?_format=columnar``).
+COLUMNAR_FORMAT = "columnar"
+
 
 logger = logging.getLogger(__name__)
 
@@ -136,6 +173,9 @@ class Changes(resource.Resource):
         _handle_stale_expected(request)
         # Bypass call to storage if _since is too old.
         _handle_old_since_redirect(request)
+        # Redirect equivalent querystrings to their canonical form. Unknown
+        # parameters are kept here, since they can be filters.
+        _handle_canonical_querystring_redirect(request)
         # Inject custom model.
         self.model = ChangesModel(request)
         super().__init__(request, context)
@@ -151,6 +191,7 @@ class Changes(resource.Resource):
             result = self.postprocess([])
 
         _handle_cache_expires(self.request, MONITOR_BUCKET, CHANGES_COLLECTION)
+        _handle_surrogate_keys(self.request, MONITOR_BUCKET, CHANGES_COLLECTION)
         return result
 
 
@@ -162,6 +203,7 @@ def _handle_cache_expires(request: Any, bid: str, cid: str) -> None:
     default_expires = settings.get(f"{prefix}_expires_seconds")
     minimum_expires = settings.get(f"{prefix}_minimum_expires_seconds", default_expires)
     maximum_expires = settings.get(f"{prefix}_maximum_expires_seconds", default_expires)
+    pinned_timestamp = False
 
     if cache_bust_value := request.GET.get("_expected"):
         # If cache busting value is "0", or starts with "9999" (random cache busts values
@@ -178,12 +220,23 @@ def _handle_cache_expires(request: Any, bid: str, cid: str) -> None:
             cache_expires = minimum_expires
         else:
             cache_expires = maximum_expires
+            pinned_timestamp = True
     else:
         # If cache busting is not present, we use the default expires value.
         # This can only happen in the /records endpoint since _expected is mandatory in /changeset.
         cache_expires = default_expires
 
-    if cache_expires is not None:
+    # Unless a specific timestamp is requested, the TTLs can be adapted to how
+    # frequently this collection is published.
+    if not pinned_timestamp and (
+        adaptive := adaptive_cache_control(settings, request.registry.cache, bid, cid)
+    ):
+        max_age, stale_while_revalidate, stale_if_error = adaptive
+        request.response.cache_expires(seconds=max_age)
+        request.response.cache_control.stale_while_revalidate = stale_while_revalidate
+        request.response.cache_control.stale_if_error = stale_if_error
+
+    elif cache_expires is not None:
         request.response.cache_expires(seconds=int(cache_expires))
 
     elif bucket_expires := settings.get(f"{bid}.record_cache_expires_seconds"):
@@ -193,6 +246,12 @@ def _handle_cache_expires(request: Any, bid: str, cid: str) -> None:
         request.response.cache_expires(seconds=int(global_expires))
 
 
+def _handle_surrogate_keys(request: Any, bid: str, cid: str) -> None:
+    # Tag responses, so that they can be purged from the CDN on changes.
+    if request.registry.cdn_purger is not None:
+        request.response.headers["Surrogate-Key"] = " ".join(surrogate_keys(bid, cid))
+
+
 def _handle_stale_expected(request: Any) -> None:
     try:
         # `request.validated` is not populated yet (resource was not instantiated yet,
@@ -256,20 +315,11 @@ def _handle_old_since_redirect(request: Any) -> None:
         # Since value is recent. No redirect.
         return
 
-    http_scheme = settings.get("http_scheme") or "https"
-    http_host = settings.get(
-        "changes.http_host", request.registry.settings.get("http_host")
-    )
-    host_uri = f"{http_scheme}://{http_host}"
-    redirect = host_uri + request.matched_route.generate(request.matchdict)
-
     queryparams = request.GET.copy()
     del queryparams["_since"]
-    if queryparams:
-        redirect += "?" + urlencode(queryparams)
 
     # Serve a redirection, with optional cache control headers.
-    response = httpexceptions.HTTPTemporaryRedirect(redirect)
+    response = httpexceptions.HTTPTemporaryRedirect(_redirect_uri(request, queryparams))
     cache_seconds = int(
         settings.get("changes.since_max_age_redirect_ttl_seconds", 86400)
     )
@@ -278,30 +328,88 @@ def _handle_old_since_redirect(request: Any) -> None:
     raise response
 
 
-def _handle_quoted_expected_redirect(request: Any) -> None:
+def _canonical_querystring(
+    request: Any,
+    known_params: tuple[str, ...] | None = None,
+    max_limit: int | None = None,
+) -> tuple[list[tuple[str, str]], set[str]]:
+    """
+    Return the canonical form of the request querystring (parameters sorted by
+    name, unquoted timestamps, without unknown parameters nor redundant limit),
+    along with the variants that were found in the original one.
     """
-    Redirect requests with quoted _expected values to unquoted ones,
+    variants = set()
+    queryparams = []
+    for name, value in request.GET.items():
+        if known_params is not None and name not in known_params:
+            # Cache busting values, ignored by the view.
+            variants.add("unknown_param")
+            continue
+        if name in ("_expected", "_since") and '"' in value:
+            variants.add("quoted_timestamp")
+            value = value.replace('"', "")
+        if name == "_limit" and max_limit is not None:
+            try:
+                redundant = int(value) >= max_limit
+            except ValueError:
+                # Will fail later during querystring validation.
+                redundant = False
+            if redundant:
+                variants.add("redundant_limit")
+                continue
+        queryparams.append((name, value))
+
+    # Repeated parameters keep their relative order (sort is stable).
+    canonical = sorted(queryparams, key=lambda param: param[0])
+    if canonical != queryparams:
+        variants.add("params_order")
+    return canonical, variants
+
+
+def _handle_canonical_querystring_redirect(
+    request: Any,
+    known_params: tuple[str, ...] | None = None,
+    max_limit: int | None = None,
+) -> None:
+    """
+    Clients send many equivalent variants of the same querystring (parameters
+    order, quoted timestamps, cache busting values...), and each of them is a
+    different object on the CDN. Redirect them to a single canonical form,
     to maximize caching.
     """
-    settings = request.registry.settings
-    qs_expected = request.GET.get("_expected")
-    if qs_expected and (unquoted := qs_expected.replace('"', "")) != qs_expected:
-        # Only redirect if unquoting changes the value
-        queryparams = request.GET.copy()
-        queryparams["_expected"] = unquoted
-        http_scheme = settings.get("http_scheme") or "https"
-        http_host = settings.get(
-            "changes.http_host", request.registry.settings.get("http_host")
-        )
-        host_uri = f"{http_scheme}://{http_host}"
-        redirect = (
-            host_uri
-            + request.matched_route.generate(request.matchdict)
-            + "?"
-            + urlencode(queryparams)
+    queryparams, variants = _canonical_querystring(request, known_params, max_limit)
+    if not variants:
+        return
+
+    metrics_service = request.registry.metrics
+    if metrics_service is not None:
+        for variant in sorted(variants):
+            metrics_service.count(
+                "plugins.changes.canonical_redirects", unique=[("variant", variant)]
+            )
+
+    # The canonical form of a querystring never changes, the redirection
+    # can be cached for long.
+    response = httpexceptions.HTTPTemporaryRedirect(_redirect_uri(request, queryparams))
+    cache_seconds = int(
+        request.registry.settings.get(
+            "changes.canonical_redirect_ttl_seconds", 7 * DAY_IN_SECONDS
         )
-        response = httpexceptions.HTTPTemporaryRedirect(redirect)
-        raise response
+    )
+    if cache_seconds >= 0:
+        response.cache_expires(cache_seconds)
+    raise response
+
+
+def _redirect_uri(request: Any, queryparams: Any) -> str:
+    settings = request.registry.settings
+    http_scheme = settings.get("http_scheme") or "https"
+    http_host = settings.get("changes.http_host", settings.get("http_host"))
+    host_uri = f"{http_scheme}://{http_host}"
+    redirect = host_uri + request.matched_route.generate(request.matchdict)
+    if queryparams:
+        redirect += "?" + urlencode(queryparams)
+    return redirect
 
 
 @implementer(IAuthorizationPolicy)
@@ -359,7 +467,14 @@ class ChangeSetQuerystring(colander.MappingSchema):
     _limit = colander.SchemaNode(
         colander.Integer(), missing=colander.drop, validator=positive_big_integer
     )
+    # Comma separated list of fields (eg. ``id,attachment.hash``).
+    _fields = colander.SchemaNode(colander.String(), missing=colander.drop)
     # Query parameters used on monitor/changes endpoint.
+    _format = colander.SchemaNode(
+        colander.String(),
+        missing=colander.drop,
+        validator=colander.OneOf([COLUMNAR_FORMAT]),
+    )
     bucket = colander.SchemaNode(colander.String(), missing=colander.drop)
     collection = colander.SchemaNode(colander.String(), missing=colander.drop)
 
@@ -371,28 +486,44 @@ class ChangeSetSchema(colander.MappingSchema):
 @changeset.get(
     schema=ChangeSetSchema(), permission="read", validators=(colander_validator,)
 )
-def get_changeset(request: Any) -> dict[str, Any]:
+def get_changeset(request: Any) -> Any:
     bid = request.matchdict["bucket_id"]
     cid = request.matchdict["collection_id"]
 
+    settings = request.registry.settings
     storage = request.registry.storage
 
     queryparams = request.validated["querystring"]
-    limit = bound_limit(request.registry.settings, queryparams.get("_limit"))
+    limit = bound_limit(settings, queryparams.get("_limit"))
+    pages = None
     filters = []
     include_deleted = False
     if "_since" in queryparams:
         filters = [Filter("last_modified", queryparams["_since"], COMPARISON.GT)]
         # Include tombstones when querying with _since
         include_deleted = True
+    fields = [f.strip() for f in queryparams.get("_fields", "").split(",") if f.strip()]
+
+    # Reported by the ``report_changeset_metrics`` listener once the response
+    # is rendered.
+    stats = request.changeset_stats = {
+        "bucket_id": bid,
+        "collection_id": cid,
+        "since": "_since" in queryparams,
+    }
+    storage_started = time.perf_counter()
 
     if (bid, cid) == (MONITOR_BUCKET, CHANGES_COLLECTION):
-        # Redirect quoted _expected values, to simplify caching.
-        _handle_quoted_expected_redirect(request)
         # Reject requests with stale expected value
         _handle_stale_expected(request)
-        # Redirect old since, on monitor/changes only.
+        # Redirect old since.
         _handle_old_since_redirect(request)
+        # Redirect equivalent querystrings to their canonical form.
+        _handle_canonical_querystring_redirect(
+            request,
+            known_params=CHANGESET_QUERYSTRING_PARAMS,
+            max_limit=bound_limit(settings, None),
+        )
 
         if "bucket" in queryparams:
             filters.append(Filter("bucket", queryparams["bucket"], COMPARISON.EQ))
@@ -416,21 +547,85 @@ def get_changeset(request: Any) -> dict[str, Any]:
             include_deleted=include_deleted,
             sorting=sorting,
         )
+        if queryparams.get("_format") == COLUMNAR_FORMAT:
+            http_host = settings.get("http_host") or ""
+            changes = columnar_changes(changes, host=http_host)
+        else:
+            changes = project_changes(changes, fields)
 
     else:
+        if is_monitored(settings, bid, cid):
+            # The old tombstones of monitored collections can be purged (see
+            # ``scripts.purge_old_tombstones()``).
+            _handle_old_since_redirect(request)
+
         bucket_uri = instance_uri(request, "bucket", id=bid)
         collection_uri = instance_uri(request, "collection", bucket_id=bid, id=cid)
 
+        # Responses can be shared between requests if enabled for this collection.
+        cache_enabled = changeset_cache_ttl(settings, bid, cid)
+        cache_params = {**queryparams, "_limit": limit}
+
+        # Unless cached, big changesets can be read and encoded page by page,
+        # without being truncated to the storage max fetch size.
+        page_size = 0 if cache_enabled else changeset_page_size(settings)
+        if page_size:
+            limit = queryparams.get("_limit")
+
         try:
-            # We'll make sure that data isn't changed while we read metadata, changes,
-            # etc.
-            before = storage.resource_timestamp(
-                resource_name="record", parent_id=collection_uri
-            )
-            # Fetch collection metadata.
-            metadata = storage.get(
-                resource_name="collection", parent_id=bucket_uri, object_id=cid
-            )
+            if cache_enabled:
+                # The timestamps are read once, to look up the cache and to
+                # fetch the records on cache miss.
+                records_timestamp = storage.resource_timestamp(
+                    resource_name="record", parent_id=collection_uri
+                )
+                metadata = storage.get(
+                    resource_name="collection", parent_id=bucket_uri, object_id=cid
+                )
+                cache_args = (
+                    records_timestamp,
+                    metadata["last_modified"],
+                    cache_params,
+                )
+                changes = changeset_cache_get(request, bid, cid, *cache_args)
+                if changes is None:
+                    changes = changeset_records(
+                        storage,
+                        bid,
+                        cid,
+                        filters=filters,
+                        limit=limit,
+                        include_deleted=include_deleted,
+                        records_timestamp=records_timestamp,
+                        fields=fields,
+                    )
+                    changeset_cache_set(request, bid, cid, *cache_args, changes)
+            elif page_size:
+                # The pages are read from the same snapshot as the collection
+                # metadata and records timestamp, while the body is sent.
+                pages = changeset_pages(
+                    storage,
+                    bid,
+                    cid,
+                    filters=filters,
+                    include_deleted=include_deleted,
+                    page_size=page_size,
+                    limit=limit,
+                    fields=fields,
+                )
+                metadata, records_timestamp = next(pages)
+            else:
+                # Fetch collection metadata, list of changes, and current records
+                # timestamp from a consistent snapshot.
+                metadata, changes, records_timestamp = changeset_snapshot(
+                    storage,
+                    bid,
+                    cid,
+                    filters=filters,
+                    limit=limit,
+                    include_deleted=include_deleted,
+                    fields=fields,
+                )
 
         except storage_exceptions.ObjectNotFoundError:
             raise httpexceptions.HTTPNotFound()
@@ -443,22 +638,6 @@ def get_changeset(request: Any) -> dict[str, Any]:
                 raise httpexceptions.HTTPNotFound()
             raise
 
-        # Fetch list of changes.
-        changes = storage.list_all(
-            resource_name="record",
-            parent_id=collection_uri,
-            filters=filters,
-            limit=limit,
-            id_field="id",
-            modified_field="last_modified",
-            deleted_field="deleted",
-            sorting=[Sort("last_modified", -1)],
-            include_deleted=include_deleted,
-        )
-        # Fetch current collection timestamp.
-        records_timestamp = storage.resource_timestamp(
-            resource_name="record", parent_id=collection_uri
-        )
         # We use the timestamp from the collection metadata, because we want it to
         # be bumped when the signature is refreshed. Indeed, the CDN will revalidate
         # the origin's response, only if the `Last-Modified` header has changed.
@@ -467,12 +646,17 @@ def get_changeset(request: Any) -> dict[str, Any]:
         # in the collection metadata that are automatically bumped when records change.
         last_modified = metadata["last_modified"]
 
-        # Do not serve inconsistent data.
-        if before != records_timestamp:  # pragma: no cover
-            raise storage_exceptions.IntegrityError(message="Inconsistent data. Retry.")
+    stats["storage_seconds"] = time.perf_counter() - storage_started
+    if pages is None:
+        stats["records"] = (
+            len(changes["last_modified"]) if isinstance(changes, dict) else len(changes)
+        )
+        # The JSON renderer will serialize the returned data.
+        stats["rendering_started"] = time.perf_counter()
 
     # Cache control.
     _handle_cache_expires(request, bid, cid)
+    _handle_surrogate_keys(request, bid, cid)
 
     # Set Last-Modified response header (Pyramid takes care of converting).
     request.response.last_modified = last_modified / 1000.0
@@ -503,6 +687,15 @@ def get_changeset(request: Any) -> dict[str, Any]:
             },
         )
 
+    if pages is not None:
+        stats["streamed"] = True
+        return _render_changeset_pages(
+            request,
+            metadata={**metadata, "bucket": bid},
+            timestamp=records_timestamp,
+            pages=pages,
+        )
+
     data = {
         "metadata": {
             **metadata,
@@ -514,6 +707,205 @@ def get_changeset(request: Any) -> dict[str, Any]:
     return data
 
 
+class StreamedResponse(Response):
+    """
+    JSON response whose body is produced by the specified iterator while it is
+    sent. Kinto reads the body of every response in its ``NewResponse``
+    subscribers (eg. to observe its size), which would consume the stream: it
+    only becomes the body when the response is called by the WSGI server.
+    """
+
+    def __init__(self, request: Any, stream: Iterator[bytes]):
+        super().__init__(
+            status=request.response.status,
+            headerlist=list(request.response.headerlist),
+            app_iter=[],
+        )
+        self.content_type = "application/json"
+        self.content_length = None
+        self.stream = stream
+
+    def __call__(self, environ: Any, start_response: Any) -> Any:
+        self.app_iter = self.stream
+        self.content_length = None
+        return super().__call__(environ, start_response)
+
+
+def _streamed_response(request: Any, stream: Iterator[bytes]) -> Any:
+    if hasattr(request, "parent") and not getattr(request, "stream_body", False):
+        # The response of a subrequest is read by its parent (eg. batch).
+        response = request.response
+        response.content_type = "application/json"
+        response.app_iter = stream
+        return response
+    return StreamedResponse(request, stream)
+
+
+@contextlib.contextmanager
+def _stream_transaction(request: Any) -> Iterator[None]:
+    """
+    Streamed bodies are produced once the request transaction is over, and
+    read the storage in their own transaction (unless read by a parent request).
+    """
+    if hasattr(request, "parent"):
+        yield
+        return
+    with transaction.manager:
+        yield
+
+
+def _render_changeset_pages(
+    request: Any, metadata: dict[str, Any], timestamp: int, pages: Any
+) -> Any:
+    """
+    Stream the changeset one page of records at a time: pages are read from the
+    storage while the body is sent, and are never all held in memory. The
+    produced body is identical to the one of the JSON renderer.
+    """
+    return _streamed_response(
+        request, _iter_changeset_pages(request, metadata, timestamp, pages)
+    )
+
+
+def _iter_changeset_pages(
+    request: Any, metadata: dict[str, Any], timestamp: int, pages: Any
+) -> Iterator[bytes]:
+    stats = request.changeset_stats
+    rendering_started = time.perf_counter()
+    dumps = core_utils.json.dumps
+
+    head = f'{{"metadata":{dumps(metadata)},"timestamp":{dumps(timestamp)},"changes":['
+    body_size = len(head)
+    yield head.encode("utf-8")
+
+    separator = b""
+    records_count = 0
+    # Release the storage snapshot even if the body is not sent entirely.
+    with contextlib.closing(pages):
+        for page in pages:
+            if not page:
+                continue
+            records_count += len(page)
+            chunk = separator + ",".join(dumps(r) for r in page).encode("utf-8")
+            body_size += len(chunk)
+            yield chunk
+            separator = b","
+
+    yield b"]}"
+
+    stats["records"] = records_count
+    # Pages are read from the storage while being encoded.
+    stats["serialization_seconds"] = time.perf_counter() - rendering_started
+    report_changeset_stats(request, stats, body_size=body_size + 2)
+
+
+class ObjectId(colander.SchemaNode):  # ty: ignore[unsupported-base]
+    """Bucket or collection id, as accepted by Kinto."""
+
+    schema_type = colander.String
+    # Since ids are formatted into the subrequests paths, reject trailing newlines.
+    validator = colander.Regex(NameGenerator.regexp.removesuffix("$") + "(?!\n)$")
+
+
+class ChangesetRequestSchema(colander.MappingSchema):
+    bucket = ObjectId()
+    collection = ObjectId()
+    _since = QuotedTimestamp(missing=colander.drop)
+    _expected = colander.SchemaNode(colander.String())
+
+
+class ChangesetRequestsSchema(colander.SequenceSchema):
+    changeset = ChangesetRequestSchema()
+
+
+class ChangesetsPayloadSchema(colander.MappingSchema):
+    changesets = ChangesetRequestsSchema(validator=colander.Length(min=1))
+
+
+class ChangesetsSchema(colander.MappingSchema):
+    body = ChangesetsPayloadSchema()
+
+
+changesets = Service(
+    name="changesets",
+    path="/changesets",
+    description="Fetch the changesets of several collections",
+)
+
+
+@changesets.post(
+    schema=ChangesetsSchema(),
+    permission=NO_PERMISSION_REQUIRED,
+    validators=(colander_validator,),
+)
+def post_changesets(request: Any) -> Any:
+    """
+    Return the changesets of the specified collections in one response. Each
+    of them is fetched via a subrequest on its ``/changeset`` endpoint, in order
+    to check the permissions per collection and share its caching and paging.
+    """
+    specs = request.validated["body"]["changesets"]
+
+    limit = request.registry.settings["batch_max_requests"]
+    if limit and len(specs) > int(limit):
+        error_msg = f"Number of changesets is limited to {limit}"
+        request.errors.add("body", "changesets", error_msg)
+        return
+
+    return _streamed_response(request, _iter_changesets(request, specs))
+
+
+def _iter_changesets(request: Any, specs: list[dict[str, Any]]) -> Iterator[bytes]:
+    """
+    Stream the changesets one after the other, as their subrequests are
+    executed. Paged changesets are streamed too.
+    """
+    dumps = core_utils.json.dumps
+    with _stream_transaction(request):
+        yield b'{"changesets":['
+        for i, spec in enumerate(specs):
+            path = CHANGESET_PATH.format(
+                bucket_id=spec["bucket"], collection_id=spec["collection"]
+            )
+            queryparams = {
+                k: v for k, v in spec.items() if k in ("_expected", "_since")
+            }
+            subrequest = core_utils.build_request(
+                request, {"method": "GET", "path": f"{path}?{urlencode(queryparams)}"}
+            )
+            # Paged changesets are streamed into this body.
+            subrequest.stream_body = True
+            try:
+                # Invoke subrequest without individual transaction.
+                resp, subrequest = request.follow_subrequest(
+                    subrequest, use_tweens=False
+                )
+            except httpexceptions.HTTPException as e:
+                # JSONify raw Pyramid errors (eg. 403 when collection is not readable).
+                if e.empty_body or e.content_type == "application/json":
+                    resp = e
+                else:
+                    resp = errors.http_error(e)
+            entry = (
+                f'{{"bucket":{dumps(spec["bucket"])},'
+                f'"collection":{dumps(spec["collection"])},'
+                f'"status":{resp.status_code},"body":'
+            )
+            separator = b"," if i > 0 else b""
+            yield separator + entry.encode("utf-8")
+            # Changesets are not decoded and encoded again.
+            body = resp.stream if isinstance(resp, StreamedResponse) else resp.app_iter
+            empty = True
+            for chunk in body:
+                if chunk:
+                    empty = False
+                    yield chunk
+            if empty:
+                yield b"null"
+            yield b"}"
+    yield b"]}"
+
+
 class BroadcastResponseSchema(colander.MappingSchema):
     body = colander.SchemaNode(colander.Mapping())
 
@@ -547,20 +939,31 @@ def broadcasts_view(request: Any) -> dict[str, Any]:
         )  # 5 min by default.
     )
 
+    # A change committed while the latest timestamp is read from the storage
+    # could be missed, hence a short TTL.
+    latest_ttl = int(settings.get("changes.broadcast_latest_ttl_seconds", 60))
+
+    cache = request.registry.cache
+
     def get_rs_timestamp() -> int:
-        # We want to filter out preview entries, because we don't want to notify all clients
-        # when a review is requested.
-        # Note: This will also filter out the `nimbus-preview` collection which isn't directly
-        # consumed by clients and therefore doesn't need to trigger a broadcast when it changes.
-        return max(
-            ts
-            for bid, cid, ts in monitored_timestamps(request)
-            if "-preview" not in f"{bid}/{cid}"
-        )
+        # The latest timestamp is invalidated by the ``update_broadcast_timestamp``
+        # listener, the storage is only hit when it is missing from the cache.
+        latest_timestamp = cache.get(BROADCAST_LATEST_CACHE_KEY)
+        if latest_timestamp is None:
+            # We want to filter out preview entries, because we don't want to notify all clients
+            # when a review is requested.
+            # Note: This will also filter out the `nimbus-preview` collection which isn't directly
+            # consumed by clients and therefore doesn't need to trigger a broadcast when it changes.
+            latest_timestamp = max(
+                ts
+                for bid, cid, ts in monitored_timestamps(request)
+                if "-preview" not in f"{bid}/{cid}"
+            )
+            cache.set(BROADCAST_LATEST_CACHE_KEY, latest_timestamp, ttl=latest_ttl)
+        return latest_timestamp
 
     # First, get the current value from cache.
-    cache_key = f"{BROADCASTER_ID}/{CHANNEL_ID}/timestamp"
-    last_published_timestamp = request.registry.cache.get(cache_key)
+    last_published_timestamp = cache.get(BROADCAST_CACHE_KEY)
     debounced_timestamp = last_published_timestamp
 
     if last_published_timestamp is None:
@@ -625,9 +1028,76 @@ def broadcasts_view(request: Any) -> dict[str, Any]:
 
     # Store the published timestamp in the cache for next calls (skip write if unchanged).
     if debounced_timestamp != last_published_timestamp:
-        request.registry.cache.set(cache_key, debounced_timestamp, ttl=DAY_IN_SECONDS)
+        cache.set(BROADCAST_CACHE_KEY, debounced_timestamp, ttl=DAY_IN_SECONDS)
+        # Wake up the long-poll consumers.
+        if (notifier := request.registry.changes_notifier) is not None:
+            notifier.publish(debounced_timestamp)
     # Expose it for the Push service to pull.
     return {
         "broadcasts": {f"{BROADCASTER_ID}/{CHANNEL_ID}": f'"{debounced_timestamp}"'},
         "code": 200,
     }
+
+
+class BroadcastPollQuerystring(colander.MappingSchema):
+    # Last timestamp known by the client.
+    _since = QuotedTimestamp(missing=colander.drop)
+    _timeout = colander.SchemaNode(
+        colander.Integer(), missing=colander.drop, validator=colander.Range(min=0)
+    )
+
+
+class BroadcastPollSchema(colander.MappingSchema):
+    querystring = BroadcastPollQuerystring()
+
+
+broadcasts_poll = Service(
+    name="broadcast-poll",
+    path="/__broadcasts__/poll",
+    description="Wait for the next broadcast",
+)
+
+
+@broadcasts_poll.get(
+    schema=BroadcastPollSchema(),
+    permission=NO_PERMISSION_REQUIRED,
+    validators=(colander_validator,),
+    tags=["Utilities"],
+    operation_id="broadcast_poll_view",
+)
+def broadcasts_poll_view(request: Any) -> dict[str, Any]:
+    """
+    Long-poll alternative to Push notifications: the connection is held until
+    the broadcasted timestamp differs from ``?_since``, or until the timeout.
+    """
+    notifier = request.registry.changes_notifier
+    if notifier is None:
+        # Disabled (see ``changes.long_poll_enabled`` setting).
+        raise httpexceptions.HTTPNotFound()
+
+    settings = request.registry.settings
+    max_timeout = int(settings.get("changes.long_poll_max_timeout_seconds", 30))
+    queryparams = request.validated["querystring"]
+    timeout = min(queryparams.get("_timeout", max_timeout), max_timeout)
+
+    timestamp = request.registry.cache.get(BROADCAST_CACHE_KEY)
+    since = queryparams.get("_since")
+    if since is not None and (timestamp is None or timestamp <= since):
+        # Bound the number of worker threads held by waiting requests (see
+        # ``changes.long_poll_max_waiters`` setting).
+        waiters = request.registry.changes_poll_waiters
+        if not waiters.acquire(blocking=False):
+            response = errors.http_error(
+                httpexceptions.HTTPServiceUnavailable(),
+                errno=errors.ERRORS.BACKEND,
+                message="Too many waiting requests. Retry later.",
+            )
+            response.headers["Retry-After"] = str(settings["retry_after_seconds"])
+            raise response
+        try:
+            timestamp = notifier.wait(last_value=since, timeout=timeout) or since
+        finally:
+            waiters.release()
+
+    # The client is expected to poll again with this value.
+    return {"timestamp": timestamp}
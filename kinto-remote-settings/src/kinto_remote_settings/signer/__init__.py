@@ -10,11 +10,12 @@ from kinto.core import utils as core_utils
 from kinto.core.events import ACTIONS, ResourceChanged
 from pyramid.authorization import Authenticated
 from pyramid.events import ApplicationCreated, NewRequest
+from pyramid.exceptions import ConfigurationError
 from pyramid.settings import asbool, aslist
 
 from .. import __version__
-from . import listeners, utils
-from .backends import heartbeat
+from . import listeners, serializer, utils
+from .backends import Heartbeat
 from .events import ReviewApproved, ReviewRejected, ReviewRequested
 
 
@@ -22,8 +23,14 @@ IS_RUNNING_MIGRATE = "migrate" in sys.argv
 
 DEFAULT_SETTINGS: dict[str, Any] = {
     "allow_floats": False,
+    "async_signing_enabled": False,
+    "async_signing_timeout_seconds": 3600,
     "auto_create_resources": False,
     "auto_create_resources_principals": [Authenticated],
+    "canonical_json_cache_max_bytes": serializer.DEFAULT_FRAGMENTS_CACHE_MAX_BYTES,
+    "canonical_json_encoder": "canonicaljson",
+    "heartbeat_cache_ttl_seconds": 0,
+    "incremental_diff_enabled": False,
     "resources": "/buckets/main-workspace -> /buckets/main-preview -> /buckets/main",
     "signer_backend": "kinto_remote_settings.signer.backends.local_ecdsa",
     "to_review_enabled": False,
@@ -45,23 +52,48 @@ def on_review_approved(event: Any) -> None:
         )
 
 
-def load_signed_resources_configuration(config: Any) -> dict[str, Any]:
+def load_signed_resources_configuration(
+    config: Any, created: list[tuple[str, str]] | None = None
+) -> dict[str, Any] | None:
+    """
+    Load the signed resources and their signers from settings.
+
+    When ``created`` collections (bucket and collection ids) are specified, only
+    the glob settings that match them are expanded, and the existing signers
+    are kept. Return ``None`` if the configuration is unchanged.
+    """
     settings = config.get_settings()
 
-    # Load settings from KINTO_SIGNER_* environment variables.
-    for setting, default_value in DEFAULT_SETTINGS.items():
-        settings[f"signer.{setting}"] = utils.get_first_matching_setting(
-            setting_name=setting,
-            settings=settings,
-            prefixes=["signer."],
-            default=default_value,
+    if created is None:
+        # Load settings from KINTO_SIGNER_* environment variables.
+        for setting, default_value in DEFAULT_SETTINGS.items():
+            settings[f"signer.{setting}"] = utils.get_first_matching_setting(
+                setting_name=setting,
+                settings=settings,
+                prefixes=["signer."],
+                default=default_value,
+            )
+
+        # Expand glob settings into concrete settings using existing objects in DB.
+        # (eg. "signer.main-workspace.magic-(\w+)" -> "signer.main-workspace.magic-word")
+        glob_settings = utils.compile_glob_settings(settings)
+        config.registry.signer_glob_settings = glob_settings
+        expanded_settings = utils.expand_collections_glob_settings(
+            config.registry.storage, settings, glob_settings
         )
+        previous_signers = {}
+    else:
+        expanded_settings = {}
+        for bid, cid in created:
+            expanded_settings.update(
+                utils.expand_collection_glob_settings(
+                    config.registry.signer_glob_settings, bid, cid
+                )
+            )
+        if not expanded_settings:
+            return None
+        previous_signers = config.registry.signers
 
-    # Expand glob settings into concrete settings using existing objects in DB.
-    # (eg. "signer.main-workspace.magic-(\w+)" -> "signer.main-workspace.magic-word")
-    expanded_settings = utils.expand_collections_glob_settings(
-        config.registry.storage, settings
-    )
     config.add_settings(expanded_settings)
     settings.update(**expanded_settings)
 
@@ -110,7 +142,7 @@ def load_signed_resources_configuration(config: Any) -> dict[str, Any]:
     # For each resource that is configured, we determine what signer is
     # configured and what are the review settings.
     # Note: the `resource` values are mutated in place.
-    config.registry.signers = {}
+    signers = {}
     for signer_key, resource in resources.items():
         bid = resource["source"]["bucket"]
         server_wide = "signer."
@@ -125,16 +157,19 @@ def load_signed_resources_configuration(config: Any) -> dict[str, Any]:
             deprecated = f"signer.{bid}_{cid}."
             prefixes = [collection_wide, deprecated, *prefixes]
 
-        # Instantiates the signers associated to this resource.
-        dotted_location = utils.get_first_matching_setting(
-            "signer_backend",
-            settings,
-            prefixes,
-            default=DEFAULT_SETTINGS["signer_backend"],
-        )
-        signer_module = config.maybe_dotted(dotted_location)
-        backend = signer_module.load_from_settings(settings, prefixes=prefixes)
-        config.registry.signers[signer_key] = backend
+        # Instantiates the signers associated to this resource, unless the
+        # expanded settings (reviews only) were loaded for new collections.
+        backend = previous_signers.get(signer_key)
+        if backend is None:
+            dotted_location = utils.get_first_matching_setting(
+                "signer_backend",
+                settings,
+                prefixes,
+                default=DEFAULT_SETTINGS["signer_backend"],
+            )
+            signer_module = config.maybe_dotted(dotted_location)
+            backend = signer_module.load_from_settings(settings, prefixes=prefixes)
+        signers[signer_key] = backend
 
         # Check if review enabled/disabled for this particular resources.
         resource_to_review_enabled = asbool(
@@ -154,6 +189,14 @@ def load_signed_resources_configuration(config: Any) -> dict[str, Any]:
         else:
             resource.pop("to_review_enabled", None)
 
+    # Replace the signers and the resolved resources of each collection (see
+    # ``listeners.ResourcesIndex``) together, once they are complete, since they
+    # are read by concurrent requests.
+    config.registry.signers, config.registry.signer_resources_index = (
+        signers,
+        listeners.ResourcesIndex(resources, signers),
+    )
+
     # Expose the capabilities in the root endpoint.
     exposed_resources = [
         core_utils.dict_subset(
@@ -181,13 +224,15 @@ def load_signed_resources_configuration(config: Any) -> dict[str, Any]:
 
 
 def includeme(config: Any) -> None:
-    # Register heartbeat to check signer integration.
-    config.registry.heartbeats["signer"] = heartbeat
-
     resources = load_signed_resources_configuration(config)
 
     settings = config.get_settings()
 
+    # Register heartbeat to check signer integration.
+    config.registry.heartbeats["signer"] = Heartbeat(
+        ttl=float(settings["signer.heartbeat_cache_ttl_seconds"])
+    )
+
     global_settings = {
         k: v
         for k, v in config.registry.api_capabilities["signer"].items()
@@ -196,8 +241,13 @@ def includeme(config: Any) -> None:
 
     # Since we have settings that can contain glob patterns, we refresh the settings
     # and exposed resources when a new collection is created.
+    def on_collection_created(event: Any) -> None:
+        bid = event.payload["bucket_id"]
+        created = [(bid, impacted["new"]["id"]) for impacted in event.impacted_objects]
+        load_signed_resources_configuration(config, created=created)
+
     config.add_subscriber(
-        lambda _: load_signed_resources_configuration(config),
+        on_collection_created,
         ResourceChanged,
         for_actions=(ACTIONS.CREATE,),
         for_resources=("collection",),
@@ -253,6 +303,20 @@ def includeme(config: Any) -> None:
         for_resources=("collection",),
     )
 
+    encoder = settings["signer.canonical_json_encoder"]
+    if encoder not in serializer.ENCODERS:
+        raise ConfigurationError(
+            f"Unknown canonical JSON encoder {encoder!r} (choices: {serializer.ENCODERS})"
+        )
+    if encoder == "fast" and asbool(settings["signer.allow_floats"]):
+        # Floats are not serialized like ``canonicaljson`` does.
+        raise ConfigurationError("The fast canonical JSON encoder forbids floats.")
+    # Records encodings are cached between signatures (``0`` to disable).
+    config.registry.signer_serializer = serializer.Serializer(
+        encoder=encoder,
+        cache_max_bytes=int(settings["signer.canonical_json_cache_max_bytes"]),
+    )
+
     if not asbool(settings["signer.allow_floats"]):
         config.add_subscriber(
             functools.partial(listeners.prevent_float_value, resources=resources),
@@ -275,6 +339,24 @@ def includeme(config: Any) -> None:
         for_resources=("collection",),
     )
 
+    # Sign approved changes in background, if enabled.
+    config.registry.signing_worker = None
+    if asbool(settings["signer.async_signing_enabled"]):
+        from . import jobs
+
+        signing_worker = jobs.SigningWorker(config.registry, resources)
+        config.registry.signing_worker = signing_worker
+        config.add_subscriber(
+            jobs.delete_jobs,
+            ResourceChanged,
+            for_actions=(ACTIONS.DELETE,),
+            for_resources=("collection",),
+        )
+        if not IS_RUNNING_MIGRATE:
+            config.add_subscriber(lambda _: signing_worker.resume(), ApplicationCreated)
+
+    config.scan("kinto_remote_settings.signer.views")
+
     def on_new_request(event: Any) -> None:
         """Send the signer events in the before commit hook.
         This allows database operations done in subscribers to be automatically
@@ -1,25 +1,121 @@
 import logging
-from typing import Any
+import threading
+import time
+from typing import Any, Hashable
+
+from pyramid.request import Request
+
+from .base import SignerBase
 
 
 logger = logging.getLogger(__name__)
 
 
+HEARTBEAT_PAYLOAD = "This is a heartbeat test."
+
+
+def check_signer(signer: Any, request: Any) -> bool:
+    """Test that the specified signer is operational."""
+    try:
+        signer.sign(HEARTBEAT_PAYLOAD)
+
+        # Additional checks for this signer backend.
+        signer.healthcheck(request)
+    except Exception as e:
+        logger.exception(e)
+        return False
+    return True
+
+
+def distinct_signers(signers: dict[str, Any]) -> dict[Hashable, Any]:
+    """
+    Return one signer for each distinct backend configuration
+    (see :meth:`~.base.SignerBase.heartbeat_key`).
+    """
+    return {
+        signer.heartbeat_key() if isinstance(signer, SignerBase) else id(signer): signer
+        for signer in list(signers.values())
+    }
+
+
+class Heartbeat(object):
+    """
+    Heartbeat of the signer backends.
+
+    Signers that share the same configuration are checked once. When ``ttl``
+    is set, the results are kept for ``ttl`` seconds, and refreshed in a
+    background thread, so that the heartbeat endpoint does not hit the
+    signer backends on every request.
+    """
+
+    def __init__(self, ttl: float = 0) -> None:
+        self.ttl = ttl
+        # Time and result of the last check, by backend configuration.
+        self._results: dict[Hashable, tuple[float, bool]] = {}
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def __call__(self, request: Any) -> bool:
+        """Test that signer is operational.
+
+        :param request: current request object
+        :type request: :class:`~pyramid:pyramid.request.Request`
+        :returns: ``True`` is everything is ok, ``False`` otherwise.
+        :rtype: bool
+        """
+        if self.ttl > 0:
+            self._start_refresher(request.registry)
+
+        for key, signer in distinct_signers(request.registry.signers).items():
+            cached = self._results.get(key)
+            if cached is not None and time.monotonic() - cached[0] < self.ttl:
+                ok = cached[1]
+            else:
+                ok = self._check(key, signer, request)
+            if not ok:
+                return False
+        return True
+
+    def _check(self, key: Hashable, signer: Any, request: Any) -> bool:
+        ok = check_signer(signer, request)
+        self._results[key] = (time.monotonic(), ok)
+        return ok
+
+    def refresh(self, registry: Any) -> None:
+        """Check every distinct signer backend, and keep the results."""
+        request = Request.blank(path="/")
+        request.registry = registry
+        for key, signer in distinct_signers(registry.signers).items():
+            self._check(key, signer, request)
+
+    def _start_refresher(self, registry: Any) -> None:
+        with self._lock:
+            # Started lazily, since threads do not survive forks.
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._refresh_forever,
+                    args=(registry,),
+                    name="signer-heartbeat",
+                    daemon=True,
+                )
+                self._thread.start()
+
+    def _refresh_forever(self, registry: Any) -> None:
+        while True:
+            # Refresh the results before they expire.
+            time.sleep(self.ttl / 2)
+            try:
+                self.refresh(registry)
+            except Exception:
+                logger.exception("Unable to refresh signer heartbeat")
+
+
 def heartbeat(request: Any) -> bool:
-    """Test that signer is operational.
+    """Test that signer is operational, without cache (see :class:`Heartbeat`).
 
     :param request: current request object
     :type request: :class:`~pyramid:pyramid.request.Request`
     :returns: ``True`` is everything is ok, ``False`` otherwise.
     :rtype: bool
     """
-    for signer in request.registry.signers.values():
-        try:
-            signer.sign("This is a heartbeat test.")
-
-            # Additional checks for this signer backend.
-            signer.healthcheck(request)
-        except Exception as e:
-            logger.exception(e)
-            return False
-    return True
+    return Heartbeat()(request)
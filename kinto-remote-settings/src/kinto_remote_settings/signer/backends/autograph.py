@@ -2,11 +2,12 @@ import base64
 import datetime
 import logging
 import warnings
-from typing import Any
+from typing import Any, Hashable
 from urllib.parse import urljoin
 
 import requests
 from pyramid.settings import aslist
+from requests.adapters import HTTPAdapter
 from requests_hawk import HawkAuth
 
 from ..utils import fetch_cert, get_first_matching_setting
@@ -19,15 +20,38 @@ logger = logging.getLogger(__name__)
 SIGNATURE_FIELDS = ["signature", "x5u"]
 EXTRA_SIGNATURE_FIELDS = ["mode", "public_key", "type", "signer_id", "ref"]
 
+DEFAULT_POOL_MAXSIZE = 10
+
 
 class AutographSigner(SignerBase):
     def __init__(
-        self, server_url: str, hawk_id: str, hawk_secret: str, keyids: list[str]
+        self,
+        server_url: str,
+        hawk_id: str,
+        hawk_secret: str,
+        keyids: list[str],
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
     ) -> None:
         self.server_url = server_url
         self.auth = HawkAuth(id=hawk_id, key=hawk_secret)
         # List of keys to use for signing.
         self.key_ids = keyids
+        # Keep the connections to the Autograph server alive between signatures.
+        # The pool size should match the number of threads of the application.
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def heartbeat_key(self) -> Hashable:
+        credentials = self.auth.credentials
+        return (
+            type(self),
+            self.server_url,
+            credentials["id"],
+            credentials["key"],
+            tuple(self.key_ids),
+        )
 
     def healthcheck(self, request: Any) -> None:
         if not self.server_url.startswith("https"):
@@ -71,53 +95,68 @@ class AutographSigner(SignerBase):
         )
 
     def sign(self, payload: str | bytes) -> list[dict]:
-        if isinstance(payload, str):  # pragma: no cover
-            payload = payload.encode("utf-8")
-
-        b64_payload = base64.b64encode(payload)
+        return self.sign_many([payload])[0]
+
+    def sign_many(self, payloads: list[str | bytes]) -> list[list[dict]]:
+        b64_payloads = [
+            base64.b64encode(
+                payload.encode("utf-8") if isinstance(payload, str) else payload
+            ).decode("utf-8")
+            for payload in payloads
+        ]
         url = urljoin(self.server_url, "/sign/data")
 
-        # Iterate over the configured keys, and return the list of
-        # signatures obtained from Autograph.
-        signatures = []
-        for key_id in self.key_ids:
-            logger.info(
-                "Sign %s bytes using Autograph %s with key %r",
-                len(b64_payload),
-                url,
-                key_id,
-            )
-            resp = requests.post(
-                url,
-                auth=self.auth,
-                json=[
-                    {
-                        "input": b64_payload.decode("utf-8"),
-                        "keyid": key_id,
+        # Sign every payload with each of the configured keys, in a single
+        # batch request.
+        logger.info(
+            "Sign %s payload(s) of %s bytes using Autograph %s with keys %r",
+            len(b64_payloads),
+            sum(len(p) for p in b64_payloads),
+            url,
+            self.key_ids,
+        )
+        resp = self.session.post(
+            url,
+            auth=self.auth,
+            json=[
+                {"input": b64_payload, "keyid": key_id}
+                for b64_payload in b64_payloads
+                for key_id in self.key_ids
+            ],
+        )
+        resp.raise_for_status()
+        signature_bundles = resp.json()
+        if len(signature_bundles) != len(b64_payloads) * len(self.key_ids):
+            raise ValueError("Unexpected number of signatures from Autograph")
+        logger.info(
+            "Obtained %s response from Autograph %s",
+            resp.status_code,
+            [bundle.get("ref") for bundle in signature_bundles],
+        )
+
+        # Return the list of signatures obtained from Autograph for each payload,
+        # in the order of the configured keys.
+        results = []
+        for i in range(len(b64_payloads)):
+            signatures = []
+            offset = i * len(self.key_ids)
+            for signature_bundle in signature_bundles[
+                offset : offset + len(self.key_ids)
+            ]:
+                # Critical fields must be present, will raise if missing.
+                infos = {field: signature_bundle[field] for field in SIGNATURE_FIELDS}
+                # Other fields are returned and will be stored as part of the signature.
+                # but client won't break if they are missing, so don't raise.
+                infos.update(
+                    **{
+                        field: signature_bundle[field]
+                        for field in EXTRA_SIGNATURE_FIELDS
+                        if field in signature_bundle
                     }
-                ],
-            )
-            resp.raise_for_status()
-            signature_bundle = resp.json()[0]
-
-            # Critical fields must be present, will raise if missing.
-            infos = {field: signature_bundle[field] for field in SIGNATURE_FIELDS}
-            # Other fields are returned and will be stored as part of the signature.
-            # but client won't break if they are missing, so don't raise.
-            infos.update(
-                **{
-                    field: signature_bundle[field]
-                    for field in EXTRA_SIGNATURE_FIELDS
-                    if field in signature_bundle
-                }
-            )
-            logger.info(
-                "Obtained %s response from Autograph %s",
-                resp.status_code,
-                signature_bundle["ref"],
-            )
-            signatures.append(infos)
-        return signatures
+                )
+                signatures.append(infos)
+            results.append(signatures)
+        return results
 
 
 def load_from_settings(
@@ -149,4 +188,12 @@ def load_from_settings(
                 default="remote-settings",
             )
         ),
+        pool_maxsize=int(
+            get_first_matching_setting(
+                "autograph.pool_maxsize",
+                settings,
+                prefixes,
+                default=DEFAULT_POOL_MAXSIZE,
+            )
+        ),
     )
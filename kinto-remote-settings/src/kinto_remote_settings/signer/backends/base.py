@@ -1,7 +1,14 @@
-from typing import Any
+from typing import Any, Hashable
 
 
 class SignerBase(object):
+    def heartbeat_key(self) -> Hashable:
+        """
+        Identifies the configuration of this signing backend. Signers with the
+        same key are checked once by the heartbeat.
+        """
+        return id(self)
+
     def healthcheck(self, request: Any) -> None:
         """
         Performs a series of checks for this signing backend.
@@ -17,3 +24,12 @@ class SignerBase(object):
         :rtype: list[dict]
         """
         raise NotImplementedError
+
+    def sign_many(self, payloads: list[str | bytes]) -> list[list[dict]]:
+        """
+        Signs each of the specified `payloads`, and returns the list of
+        signatures metadata of each payload (see :meth:`sign`).
+
+        Backends can override it to sign them all at once.
+        """
+        return [self.sign(payload) for payload in payloads]
@@ -0,0 +1,85 @@
+"""
+Same as the ``local_ecdsa`` backend, but the signatures are computed with the
+``cryptography`` package (OpenSSL) instead of the pure-Python ``ecdsa`` package.
+
+Enable it with ``kinto.signer.signer_backend = kinto_remote_settings.signer.backends.local_cryptography``.
+See ``bin/benchmark-ecdsa.py``.
+"""
+
+import base64
+
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.hazmat.primitives.asymmetric.utils import (
+    decode_dss_signature,
+    encode_dss_signature,
+)
+
+from . import local_ecdsa
+from .exceptions import BadSignatureError
+from .local_ecdsa import SIGN_PREFIX
+
+
+SIGNATURE_ALGORITHM = ec.ECDSA(hashes.SHA384())
+
+
+class ECDSASigner(local_ecdsa.ECDSASigner):
+    def load_private_key(self) -> ec.EllipticCurvePrivateKey:
+        if self.private_key is None:
+            msg = "Please, specify the private_key location."
+            raise ValueError(msg)
+
+        return self._load_key(
+            self.private_key,
+            lambda pem: serialization.load_pem_private_key(pem, password=None),
+        )
+
+    def load_public_key(self) -> ec.EllipticCurvePublicKey | None:
+        if self.private_key:
+            return self.load_private_key().public_key()
+        if self.public_key:
+            return self._load_key(self.public_key, serialization.load_pem_public_key)
+        return None
+
+    def sign(self, payload: str | bytes) -> list[dict]:
+        if isinstance(payload, str):  # pragma: no cover
+            payload = payload.encode("utf-8")
+
+        private_key = self.load_private_key()
+        der_signature = private_key.sign(SIGN_PREFIX + payload, SIGNATURE_ALGORITHM)
+        # Same encoding as the ``ecdsa`` package and Autograph (raw r||s).
+        r, s = decode_dss_signature(der_signature)
+        size = (private_key.curve.key_size + 7) // 8
+        signature = r.to_bytes(size, "big") + s.to_bytes(size, "big")
+        enc_signature = base64.urlsafe_b64encode(signature).decode("utf-8")
+        return [{"signature": enc_signature, "x5u": "", "mode": "p384ecdsa"}]
+
+    def verify(self, payload: str | bytes, signature_bundle: dict) -> None:
+        if isinstance(payload, str):  # pragma: no cover
+            payload = payload.encode("utf-8")
+
+        signature = signature_bundle["signature"]
+        if isinstance(signature, str):  # pragma: no cover
+            signature = signature.encode("utf-8")
+
+        signature_bytes = base64.urlsafe_b64decode(signature)
+
+        public_key = self.load_public_key()
+        assert public_key is not None
+        size = len(signature_bytes) // 2
+        r = int.from_bytes(signature_bytes[:size], "big")
+        s = int.from_bytes(signature_bytes[size:], "big")
+        try:
+            public_key.verify(
+                encode_dss_signature(r, s), SIGN_PREFIX + payload, SIGNATURE_ALGORITHM
+            )
+        except InvalidSignature as e:
+            raise BadSignatureError(e)
+
+
+def load_from_settings(
+    settings: dict, prefix: str = "", *, prefixes: list[str] | None = None
+) -> ECDSASigner:
+    signer = local_ecdsa.load_from_settings(settings, prefix, prefixes=prefixes)
+    return ECDSASigner(private_key=signer.private_key, public_key=signer.public_key)
@@ -1,7 +1,8 @@
 import base64
 import hashlib
+import os
 import warnings
-from typing import Any
+from typing import Any, Callable, Hashable
 
 import ecdsa
 import ecdsa.util
@@ -25,6 +26,25 @@ class ECDSASigner(SignerBase):
             raise ValueError(msg)
         self.private_key = private_key
         self.public_key = public_key
+        # Parsed keys by location, with the modification time of the file.
+        self._keys: dict[str, tuple[int, Any]] = {}
+
+    def _load_key(self, location: str, parse: Callable[[bytes], Any]) -> Any:
+        """
+        Return the key parsed from the PEM file at `location`. Keys are parsed
+        once, and again only if the file was modified (eg. key rotation).
+        """
+        mtime = os.stat(location).st_mtime_ns
+        cached = self._keys.get(location)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        with open(location, "rb") as key_file:
+            key = parse(key_file.read())
+        self._keys[location] = (mtime, key)
+        return key
+
+    def heartbeat_key(self) -> Hashable:
+        return (type(self), self.private_key, self.public_key)
 
     def healthcheck(self, request: Any) -> None:
         pass
@@ -40,8 +60,7 @@ class ECDSASigner(SignerBase):
             msg = "Please, specify the private_key location."
             raise ValueError(msg)
 
-        with open(self.private_key, "rb") as key_file:
-            return SigningKey.from_pem(key_file.read())
+        return self._load_key(self.private_key, SigningKey.from_pem)
 
     def load_public_key(self) -> VerifyingKey | None:
         # Check settings validity
@@ -49,8 +68,7 @@ class ECDSASigner(SignerBase):
             private_key = self.load_private_key()
             return private_key.get_verifying_key()
         if self.public_key:
-            with open(self.public_key, "rb") as key_file:
-                return VerifyingKey.from_pem(key_file.read())
+            return self._load_key(self.public_key, VerifyingKey.from_pem)
         return None
 
     def sign(self, payload: str | bytes) -> list[dict]:
@@ -0,0 +1,356 @@
+"""
+Asynchronous signing (see ``signer.async_signing_enabled`` setting).
+
+Instead of diffing, pushing and signing the changes in the editor's request,
+approving them (``status: to-sign``) stores a signing job next to the source
+collection, whose status becomes ``signing``. Once the request transaction is
+committed, the job is processed by a background thread, in its own
+transaction. Pending jobs are stored in the storage backend, and resumed
+when the application restarts.
+
+Jobs can be processed by any process: the first one to claim a pending job
+(ie. switch its status to ``running`` in its own transaction) signs it.
+"""
+
+import logging
+import queue
+import threading
+from typing import Any
+
+import transaction
+from kinto.core.storage import Filter
+from kinto.core.storage import postgresql as postgresql_storage
+from kinto.core.storage.exceptions import ObjectNotFoundError
+from kinto.core.utils import COMPARISON, instance_uri, msec_time
+from pyramid.events import NewRequest
+from pyramid.request import Request, apply_request_extensions
+from pyramid.settings import asbool
+from pyramid.threadlocal import RequestContext
+
+from . import events as signer_events
+from . import listeners
+from .updater import LocalUpdater
+from .utils import STATUS
+
+
+logger = logging.getLogger(__name__)
+
+
+JOB_RESOURCE_NAME = "signer-job"
+# Only the latest job of each collection is kept.
+JOB_OBJECT_ID = "latest"
+
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+# The details of failures are only logged, since jobs are readable by editors.
+JOB_FAILED_ERROR = "Signature failed"
+
+
+def delete_jobs(event: Any) -> None:
+    """Delete the signing job of the deleted collections."""
+    storage = event.request.registry.storage
+    for impacted in event.impacted_objects:
+        uri = instance_uri(
+            event.request,
+            "collection",
+            bucket_id=event.payload["bucket_id"],
+            id=impacted["old"]["id"],
+        )
+        storage.delete_all(
+            resource_name=JOB_RESOURCE_NAME, parent_id=uri, with_deleted=False
+        )
+
+
+def _notify_after_commit(success: bool, request: Any) -> None:
+    # Same as ``kinto.core.events.setup_transaction_hook()`` for requests.
+    if not success:
+        return
+    for event in request.get_resource_events(after_commit=True):
+        try:
+            request.registry.notify(event)
+        except Exception:
+            logger.error("Unable to notify", exc_info=True)
+
+
+class SigningWorker(object):
+    def __init__(self, registry: Any, resources: dict[str, Any]) -> None:
+        self.registry = registry
+        self.resources = resources
+        self._queue: queue.Queue[str] = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._claim_lock = threading.Lock()
+
+    def get_job(self, uri: str) -> dict[str, Any] | None:
+        try:
+            return self.registry.storage.get(
+                resource_name=JOB_RESOURCE_NAME,
+                parent_id=uri,
+                object_id=JOB_OBJECT_ID,
+            )
+        except ObjectNotFoundError:
+            return None
+
+    def submit(
+        self, request: Any, source: dict[str, str], previous_status: Any
+    ) -> None:
+        """
+        Store a signing job for the specified source collection, that will be
+        processed once the current transaction is committed.
+        """
+        uri = "/buckets/{bucket}/collections/{collection}".format(**source)
+        job = {
+            "uri": uri,
+            "bucket_id": source["bucket"],
+            "collection_id": source["collection"],
+            "status": JOB_PENDING,
+            "user_id": request.prefixed_userid,
+            "previous_status": previous_status,
+        }
+        self.registry.storage.update(
+            resource_name=JOB_RESOURCE_NAME,
+            parent_id=uri,
+            object_id=JOB_OBJECT_ID,
+            obj=job,
+        )
+
+        def enqueue_on_commit(success: bool) -> None:
+            if success:
+                self.enqueue(uri)
+
+        transaction.get().addAfterCommitHook(enqueue_on_commit)
+
+    def enqueue(self, uri: str) -> None:
+        with self._lock:
+            # Started lazily, since threads do not survive forks.
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="signer-worker", daemon=True
+                )
+                self._thread.start()
+        self._queue.put(uri)
+
+    def resume(self) -> None:
+        """
+        Enqueue the jobs that were left pending (eg. on shutdown), and the ones
+        that have been running for too long (eg. process killed while signing).
+        """
+        timeout = int(self.registry.settings["signer.async_signing_timeout_seconds"])
+        stalled_before = msec_time() - timeout * 1000
+        with transaction.manager:
+            jobs = self.registry.storage.list_all(
+                resource_name=JOB_RESOURCE_NAME,
+                parent_id="*",
+                filters=[Filter("status", [JOB_PENDING, JOB_RUNNING], COMPARISON.IN)],
+            )
+            for job in jobs:
+                if (
+                    job["status"] == JOB_RUNNING
+                    and job["last_modified"] < stalled_before
+                ):
+                    logger.warning("Signing job of %s stalled. Resume.", job["uri"])
+                    self._set_job_status(job, JOB_PENDING)
+        for job in jobs:
+            self.enqueue(job["uri"])
+
+    def wait(self) -> None:
+        """Block until all enqueued jobs are processed."""
+        self._queue.join()
+
+    def _run(self) -> None:
+        while True:
+            uri = self._queue.get()
+            try:
+                self.process(uri)
+            except Exception:
+                logger.exception("Unable to process signing job of %s", uri)
+            finally:
+                self._queue.task_done()
+
+    def _build_request(self, job: dict[str, Any]) -> Any:
+        request = Request.blank(path=f"/{self.registry.route_prefix}{job['uri']}")
+        request.registry = self.registry
+        apply_request_extensions(request)
+        request.matchdict = {"bucket_id": job["bucket_id"], "id": job["collection_id"]}
+        # Changes are signed on behalf of the user who approved them.
+        request.authn_type, request.selected_userid = job["user_id"].split(":", 1)
+        # Authorize kinto-attachment metadata write access. #190
+        request._attachment_auto_save = True
+        return request
+
+    def claim(self, uri: str) -> dict[str, Any] | None:
+        """
+        Switch the status of the specified pending job to ``running``, and return
+        it. Return ``None`` if it is not pending (eg. claimed by another process).
+        """
+        storage = self.registry.storage
+        if isinstance(storage, postgresql_storage.Storage):
+            from kinto.core.utils import sqlalchemy as sa
+
+            # The row is locked until committed: concurrent claims wait, and do
+            # not match the pending status anymore.
+            query = """
+            UPDATE objects
+               SET data = jsonb_set(data, '{status}', to_jsonb(CAST(:running AS TEXT)))
+             WHERE id = :object_id
+               AND parent_id = :parent_id
+               AND resource_name = :resource_name
+               AND NOT deleted
+               AND data->>'status' = :pending
+            RETURNING id;
+            """
+            placeholders = dict(
+                object_id=JOB_OBJECT_ID,
+                parent_id=uri,
+                resource_name=JOB_RESOURCE_NAME,
+                running=JOB_RUNNING,
+                pending=JOB_PENDING,
+            )
+            with storage.client.connect() as conn:
+                claimed = conn.execute(sa.text(query), placeholders).fetchone()
+            return self.get_job(uri) if claimed else None
+
+        # Other backends are not shared between processes.
+        with self._claim_lock:
+            job = self.get_job(uri)
+            if job is None or job["status"] != JOB_PENDING:
+                return None
+            self._set_job_status(job, JOB_RUNNING)
+            return self.get_job(uri)
+
+    def process(self, uri: str) -> None:
+        with transaction.manager:
+            job = self.claim(uri)
+        if job is None:
+            # Already processed (eg. by another process).
+            return
+
+        request = self._build_request(job)
+        try:
+            with RequestContext(request), transaction.manager:
+                self._sign(request, job)
+                # Like the listeners and hooks of a request transaction.
+                for event in request.get_resource_events():
+                    self.registry.notify(event)
+                listeners.send_signer_events(NewRequest(request))
+                transaction.get().addAfterCommitHook(
+                    _notify_after_commit, args=(request,)
+                )
+        except Exception:
+            logger.exception("Signature of %s failed", uri)
+            request = self._build_request(job)
+            with RequestContext(request), transaction.manager:
+                self._fail(request, job)
+                for event in request.get_resource_events():
+                    self.registry.notify(event)
+                transaction.get().addAfterCommitHook(
+                    _notify_after_commit, args=(request,)
+                )
+
+    def _get_updater(self, request: Any, job: dict[str, Any]) -> tuple[Any, Any]:
+        resource, signer = listeners.pick_resource_and_signer(
+            request,
+            self.resources,
+            bucket_id=job["bucket_id"],
+            collection_id=job["collection_id"],
+        )
+        if resource is None:
+            raise ValueError(f"{job['uri']} is not configured for signing")
+        updater = LocalUpdater(
+            signer=signer,
+            storage=self.registry.storage,
+            permission=self.registry.permission,
+            source=resource["source"],
+            destination=resource["destination"],
+            incremental_diff=asbool(
+                self.registry.settings["signer.incremental_diff_enabled"]
+            ),
+            serializer=self.registry.signer_serializer,
+        )
+        return resource, updater
+
+    def _get_source_collection(self, job: dict[str, Any]) -> dict[str, Any]:
+        return self.registry.storage.get(
+            parent_id=f"/buckets/{job['bucket_id']}",
+            resource_name="collection",
+            object_id=job["collection_id"],
+        )
+
+    def _sign(self, request: Any, job: dict[str, Any]) -> None:
+        source_collection = self._get_source_collection(job)
+        if source_collection.get("status") != STATUS.SIGNING:
+            raise ValueError(f"{job['uri']} is not being signed")
+
+        resource, updater = self._get_updater(request, job)
+        # Preview and destination are signed at once.
+        destinations = [resource["destination"]]
+        if "preview" in resource:
+            destinations.insert(0, resource["preview"])
+
+        changes_count, changes_size_bytes = updater.sign_and_update_destinations(
+            request,
+            destinations,
+            source_attributes=source_collection,
+            previous_source_status=job["previous_status"],
+        )
+        self._set_job_status(job, JOB_DONE)
+
+        payload = {
+            "action": "update",
+            "resource_name": "collection",
+            "uri": job["uri"],
+            "bucket_id": job["bucket_id"],
+            "collection_id": job["collection_id"],
+            "user_id": job["user_id"],
+            "timestamp": source_collection["last_modified"],
+        }
+        review_event = signer_events.ReviewApproved(
+            request=request,
+            payload=payload,
+            impacted_objects=[{"new": source_collection}],
+            resource=resource,
+            original_event=None,
+            changes_count=changes_count,
+            changes_size_bytes=changes_size_bytes,
+        )
+        request.bound_data.setdefault("kinto_remote_settings.signer.events", []).append(
+            review_event
+        )
+        logger.info(
+            "%s approved %s changes on %s",
+            job["user_id"],
+            changes_count,
+            job["collection_id"],
+            extra={
+                "user_id": job["user_id"],
+                "collection_id": job["collection_id"],
+                "action": "approve",
+                "changes_count": changes_count,
+                "changes_size_bytes": changes_size_bytes,
+            },
+        )
+
+    def _fail(self, request: Any, job: dict[str, Any]) -> None:
+        try:
+            source_collection = self._get_source_collection(job)
+        except ObjectNotFoundError:
+            # Collection (and its job) was deleted in the meantime.
+            return
+        self._set_job_status(job, JOB_FAILED, error=JOB_FAILED_ERROR)
+        if source_collection.get("status") == STATUS.SIGNING:
+            # Let reviewers approve again.
+            _, updater = self._get_updater(request, job)
+            previous_status = job["previous_status"] or STATUS.WORK_IN_PROGRESS.value
+            updater.restore_source_status(request, STATUS(previous_status))
+
+    def _set_job_status(self, job: dict[str, Any], status: str, **fields: Any) -> None:
+        job = {**job, "status": status, **fields}
+        job.pop("last_modified", None)
+        self.registry.storage.update(
+            resource_name=JOB_RESOURCE_NAME,
+            parent_id=job["uri"],
+            object_id=JOB_OBJECT_ID,
+            obj=job,
+        )
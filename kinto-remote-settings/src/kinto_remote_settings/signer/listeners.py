@@ -13,7 +13,7 @@ from pyramid.settings import asbool
 
 from . import events as signer_events
 from .updater import TRACKING_FIELDS, LocalUpdater
-from .utils import PLUGIN_USERID, STATUS, ensure_resource_exists
+from .utils import PLUGIN_USERID, STATUS, ensure_resource_exists, find_float
 
 
 logger = logging.getLogger(__name__)
@@ -29,39 +29,75 @@ def raise_forbidden(**kwargs: Any) -> None:
     raise errors.http_error(httpexceptions.HTTPForbidden(), **kwargs)
 
 
+class ResourcesIndex(object):
+    """
+    Resolved resource and signer of each collection, computed once for a
+    configuration of resources and signers.
+
+    The resolved resources are plain dicts (eg. sent in the signer events),
+    copied from the configuration once when resolved. Since they are shared
+    between requests, they must not be modified.
+    """
+
+    def __init__(self, resources: dict[str, Any], signers: dict[str, Any]) -> None:
+        self.resources = resources
+        self.signers = signers
+        self._resolved: dict[tuple[str, str], tuple[dict[str, Any] | None, Any]] = {}
+
+    def resolve(
+        self, bucket_id: str, collection_id: str
+    ) -> tuple[dict[str, Any] | None, Any]:
+        key = (bucket_id, collection_id)
+        resolved = self._resolved.get(key)
+        if resolved is None:
+            resolved = self._resolved[key] = self._resolve(bucket_id, collection_id)
+        return resolved
+
+    def _resolve(
+        self, bucket_id: str, collection_id: str
+    ) -> tuple[dict[str, Any] | None, Any]:
+        bucket_key = f"/buckets/{bucket_id}"
+        collection_key = f"{bucket_key}/collections/{collection_id}"
+
+        resource = signer = None
+
+        # Review might have been configured explicitly for this collection,
+        if collection_key in self.resources:
+            resource = copy.deepcopy(self.resources[collection_key])
+        elif bucket_key in self.resources:
+            # Or via its bucket.
+            resource = copy.deepcopy(self.resources[bucket_key])
+            # Since it was configured per bucket, we want to make this
+            # resource look as if it was configured explicitly for this
+            # collection.
+            resource["source"]["collection"] = collection_id
+            resource["destination"]["collection"] = collection_id
+            if "preview" in resource:
+                resource["preview"]["collection"] = collection_id
+
+        if collection_key in self.signers:
+            signer = self.signers[collection_key]
+        elif bucket_key in self.signers:
+            signer = self.signers[bucket_key]
+
+        return resource, signer
+
+
 def pick_resource_and_signer(
     request: Any,
     resources: dict[str, Any],
     bucket_id: str,
     collection_id: str,
 ) -> tuple[dict[str, Any] | None, Any]:
-    bucket_key = instance_uri(request, "bucket", id=bucket_id)
-    collection_key = instance_uri(
-        request, "collection", bucket_id=bucket_id, id=collection_id
-    )
-
-    resource = signer = None
-
-    # Review might have been configured explicitly for this collection,
-    if collection_key in resources:
-        resource = resources[collection_key]
-    elif bucket_key in resources:
-        # Or via its bucket.
-        resource = copy.deepcopy(resources[bucket_key])
-        # Since it was configured per bucket, we want to make this
-        # resource look as if it was configured explicitly for this
-        # collection.
-        resource["source"]["collection"] = collection_id
-        resource["destination"]["collection"] = collection_id
-        if "preview" in resource:
-            resource["preview"]["collection"] = collection_id
-
-    if collection_key in request.registry.signers:
-        signer = request.registry.signers[collection_key]
-    elif bucket_key in request.registry.signers:
-        signer = request.registry.signers[bucket_key]
-
-    return resource, signer
+    """
+    Return the resource and the signer of the specified collection, from the index
+    of the current configuration (replaced when it is reloaded). The specified
+    ``resources`` are only used if the plugin configuration was not loaded.
+    """
+    index = getattr(request.registry, "signer_resources_index", None)
+    if not isinstance(index, ResourcesIndex):
+        index = ResourcesIndex(resources, request.registry.signers)
+    return index.resolve(bucket_id, collection_id)
 
 
 def sign_collection_data(event: Any, resources: dict[str, Any], **kwargs: Any) -> None:
@@ -106,6 +142,10 @@ def sign_collection_data(event: Any, resources: dict[str, Any], **kwargs: Any) -
             permission=event.request.registry.permission,
             source=resource["source"],
             destination=resource["destination"],
+            incremental_diff=asbool(
+                event.request.registry.settings["signer.incremental_diff_enabled"]
+            ),
+            serializer=event.request.registry.signer_serializer,
         )
 
         uri = instance_uri(
@@ -141,18 +181,15 @@ def sign_collection_data(event: Any, resources: dict[str, Any], **kwargs: Any) -
             "user_id": current_user_id,
             "collection_id": new_collection["id"],
         }
+        # Preview and destination are signed at once.
+        destinations = [resource["destination"]]
+        if has_preview_collection:
+            destinations.insert(0, resource["preview"])
+
         if is_new_collection:
-            if has_preview_collection:
-                updater.destination = resource["preview"]
-                updater.sign_and_update_destination(
-                    event.request,
-                    source_attributes=new_collection,
-                    # Do not update source attributes (done below).
-                    next_source_status=None,
-                )
-            updater.destination = resource["destination"]
-            updater.sign_and_update_destination(
+            updater.sign_and_update_destinations(
                 event.request,
+                destinations,
                 source_attributes=new_collection,
                 # Prevents last_review_date to be set.
                 previous_source_status=STATUS.SIGNED,
@@ -163,20 +200,30 @@ def sign_collection_data(event: Any, resources: dict[str, Any], **kwargs: Any) -
         elif old_status == new_status:
             continue
 
+        elif new_status == STATUS.TO_SIGN and asbool(
+            event.request.registry.settings["signer.async_signing_enabled"]
+        ):
+            # Signed in background, once this transaction is committed.
+            updater.update_source_status(STATUS.SIGNING, event.request)
+            event.request.registry.signing_worker.submit(
+                event.request, resource["source"], previous_status=old_status
+            )
+            logger.info(
+                "%s requested signature of %s",
+                current_user_id,
+                new_collection["id"],
+                extra={
+                    **logger_fields,
+                    "action": "enqueue",
+                },
+            )
+
         elif new_status == STATUS.TO_SIGN:
             # Run signature process (will set `last_reviewer` field).
-            if has_preview_collection:
-                updater.destination = resource["preview"]
-                updater.sign_and_update_destination(
-                    event.request,
-                    source_attributes=new_collection,
-                    previous_source_status=old_status,
-                )
-
-            updater.destination = resource["destination"]
             review_event_cls = signer_events.ReviewApproved
-            changes_count, changes_size_bytes = updater.sign_and_update_destination(
+            changes_count, changes_size_bytes = updater.sign_and_update_destinations(
                 event.request,
+                destinations,
                 source_attributes=new_collection,
                 previous_source_status=old_status,
             )
@@ -353,6 +400,9 @@ def check_collection_status(
             # When collection is created old_status == new_status == None.
             continue
 
+        if old_status == STATUS.SIGNING:
+            raise_invalid(message="Signature in progress")
+
         # 0. Nobody can remove the status
         if new_status is None:
             raise_invalid(message="Cannot remove status")
@@ -443,18 +493,6 @@ def prevent_float_value(event: Any, resources: dict[str, Any]) -> None:
     [0] https://github.com/gibson042/canonicaljson-spec
     """
 
-    def scan(d: Any, path: str | int = "") -> None:
-        if isinstance(d, list):
-            d = {i: o for i, o in enumerate(d)}
-        for k, v in d.items():
-            path = f"{path}.{k}" if path else k
-            if isinstance(v, float):
-                raise ValueError(
-                    f"field contains float value (tip: use integer or string), '{path}'"
-                )
-            if isinstance(v, (list, dict)):
-                scan(v, path)
-
     # Only raise in configured resources.
     resource, _ = pick_resource_and_signer(
         event.request,
@@ -467,10 +505,11 @@ def prevent_float_value(event: Any, resources: dict[str, Any]) -> None:
 
     # Check each created/updated record in the batch.
     for impacted in event.impacted_objects:
-        try:
-            scan(impacted["new"])
-        except ValueError as e:
-            raise_invalid(message=str(e))
+        path = find_float(impacted["new"])
+        if path is not None:
+            raise_invalid(
+                message=f"field contains float value (tip: use integer or string), '{path}'"
+            )
 
 
 def prevent_collection_delete(event: Any, resources: dict[str, Any]) -> None:
@@ -612,9 +651,22 @@ def set_work_in_progress_status(event: Any, resources: dict[str, Any]) -> None:
     if resource is None:
         return
 
+    storage = event.request.registry.storage
+    if asbool(event.request.registry.settings["signer.async_signing_enabled"]):
+        source_collection = storage.get(
+            parent_id=instance_uri(
+                event.request, "bucket", id=resource["source"]["bucket"]
+            ),
+            resource_name="collection",
+            object_id=resource["source"]["collection"],
+        )
+        # The changes being signed are frozen.
+        if source_collection.get("status") == STATUS.SIGNING:
+            raise_invalid(message="Signature in progress")
+
     updater = LocalUpdater(
         signer=signer,
-        storage=event.request.registry.storage,
+        storage=storage,
         permission=event.request.registry.permission,
         source=resource["source"],
         destination=resource["destination"],
@@ -780,6 +832,7 @@ def cleanup_preview_destination(event: Any, resources: dict[str, Any]) -> None:
                     permission=event.request.registry.permission,
                     source=resource["source"],
                     destination=resource[k],
+                    serializer=event.request.registry.signer_serializer,
                 )
 
                 # At this point, the DELETE event was sent for the source collection,
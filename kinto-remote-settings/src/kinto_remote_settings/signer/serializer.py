@@ -1,15 +1,161 @@
+import json
 import operator
-from typing import Iterable
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Iterable
 
 import canonicaljson
 
 
-def canonical_json(records: Iterable[dict], last_modified: int) -> str:
-    records = (r for r in records if not r.get("deleted", False))
-    records = sorted(records, key=operator.itemgetter("id"))
+DEFAULT_FRAGMENTS_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+ENCODERS = ("canonicaljson", "fast")
+
+# Range of the integers supported by ``canonicaljson``.
+MIN_INTEGER = -(2**63)
+MAX_INTEGER = 2**64 - 1
+
+# The C accelerated encoder of the standard library gives the same output as
+# ``canonicaljson`` (sorted keys, compact separators, ASCII output with
+# lowercase ``\uXXXX`` escapes and surrogate pairs), except for floats.
+_fast_encoder = json.JSONEncoder(
+    sort_keys=True,
+    separators=(",", ":"),
+    ensure_ascii=True,
+    allow_nan=False,
+    check_circular=False,
+)
+
+
+def _check_encodable(value: Any) -> None:
+    """
+    Raise ``TypeError`` on the values that ``canonicaljson`` rejects and that the
+    standard library encoder accepts: out of range integers and strings with
+    surrogate code points.
+    """
+    stack = [value]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, str):
+            if not value.isascii():
+                try:
+                    value.encode("utf-8")
+                except UnicodeEncodeError:
+                    raise TypeError("Invalid type: str") from None
+        elif isinstance(value, int):
+            if not MIN_INTEGER <= value <= MAX_INTEGER:
+                raise TypeError("Invalid type: int")
+        elif isinstance(value, dict):
+            stack.extend(value.keys())
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+
+
+def dumps(value: Any, encoder: str = "canonicaljson") -> str:
+    """
+    Canonical JSON encoding of the specified value, with the specified encoder.
+    The ``fast`` one must not be used if records can contain floats
+    (see ``signer.allow_floats`` setting).
+    """
+    if encoder == "fast":
+        _check_encodable(value)
+        return _fast_encoder.encode(value)
+    return canonicaljson.dumps(value)  # ty: ignore[unresolved-attribute]
+
+
+class FragmentsCache(object):
+    """
+    LRU cache of the records canonical JSON encodings, keyed by collection,
+    record id and timestamp, and bounded by the total size of the fragments.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_FRAGMENTS_CACHE_MAX_BYTES,
+        dumps: Callable[[Any], str] = dumps,
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.dumps = dumps
+        self._fragments: OrderedDict[tuple[str, str, Any], str] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
 
-    payload = {"data": records, "last_modified": "%s" % last_modified}
+    def encode(self, scope: str, record: dict[str, Any]) -> str:
+        if "last_modified" not in record:
+            return self.dumps(record)
 
-    dump = canonicaljson.dumps(payload)  # ty: ignore[unresolved-attribute]
+        # Within a collection, the timestamp changes on every update.
+        key = (scope, record["id"], record["last_modified"])
+        with self._lock:
+            fragment = self._fragments.get(key)
+            if fragment is not None:
+                self._fragments.move_to_end(key)
+                return fragment
 
-    return dump
+        fragment = self.dumps(record)
+        with self._lock:
+            if key not in self._fragments and len(fragment) <= self.max_bytes:
+                self._fragments[key] = fragment
+                self._size += len(fragment)
+                while self._size > self.max_bytes:
+                    _, evicted = self._fragments.popitem(last=False)
+                    self._size -= len(evicted)
+        return fragment
+
+    def clear(self) -> None:
+        with self._lock:
+            self._fragments.clear()
+            self._size = 0
+
+
+class Serializer(object):
+    """
+    Serialize the records of collections for signing, with the specified encoder
+    (see ``signer.canonical_json_encoder`` setting), and cache the records
+    encodings between signatures (``cache_max_bytes=0`` to disable).
+    """
+
+    def __init__(
+        self, encoder: str = "canonicaljson", cache_max_bytes: int = 0
+    ) -> None:
+        if encoder not in ENCODERS:
+            raise ValueError(f"Unknown canonical JSON encoder {encoder!r}")
+        self.encoder = encoder
+        self.fragments_cache = FragmentsCache(
+            max_bytes=cache_max_bytes, dumps=self.dumps
+        )
+
+    def dumps(self, value: Any) -> str:
+        return dumps(value, encoder=self.encoder)
+
+    def canonical_json(
+        self,
+        records: Iterable[dict],
+        last_modified: int,
+        cache_scope: str | None = None,
+    ) -> str:
+        """
+        Serialize the records of a collection for signing. If ``cache_scope`` is
+        specified (eg. collection URI), the encoding of each record is cached and
+        only the new or changed records are encoded.
+        """
+        records = (r for r in records if not r.get("deleted", False))
+        records = sorted(records, key=operator.itemgetter("id"))
+
+        if cache_scope is None:
+            payload = {"data": records, "last_modified": "%s" % last_modified}
+            return self.dumps(payload)
+
+        # Same output as above, since canonical JSON has neither whitespaces nor
+        # indentation, and ``data`` is sorted before ``last_modified``.
+        data = ",".join(self.fragments_cache.encode(cache_scope, r) for r in records)
+        timestamp = self.dumps("%s" % last_modified)
+        return '{"data":[%s],"last_modified":%s}' % (data, timestamp)
+
+
+def canonical_json(records: Iterable[dict], last_modified: int) -> str:
+    """
+    Serialize the records of a collection for signing, with ``canonicaljson``.
+    """
+    return Serializer().canonical_json(records, last_modified)
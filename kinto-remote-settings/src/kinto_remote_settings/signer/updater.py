@@ -4,16 +4,21 @@ from enum import Enum
 from typing import Any
 
 from kinto.core.events import ACTIONS
-from kinto.core.storage.exceptions import RecordNotFoundError
+from kinto.core.storage import Filter
+from kinto.core.storage.exceptions import ObjectNotFoundError
+from kinto.core.utils import COMPARISON
 from pyramid.authorization import Everyone
 
-from .serializer import canonical_json
+from .serializer import Serializer
 from .utils import (
     STATUS,
     attachments_size_diff,
+    chunks,
     ensure_resource_exists,
+    notify_records_events,
     notify_resource_event,
     records_diff,
+    upsert_records,
 )
 
 
@@ -22,6 +27,11 @@ logger = logging.getLogger(__name__)
 
 FIELD_ID = "id"
 FIELD_LAST_MODIFIED = "last_modified"
+# Number of records created, updated or deleted per storage call on approval.
+PUSH_BATCH_SIZE = 1000
+# Storage objects (not exposed in the API) that keep track of the source
+# timestamp up to which the destination is known to be in sync.
+SYNC_RESOURCE_NAME = "signer-sync"
 # Source collection fields to be copied to destination.
 PUBLISHED_COLLECTION_FIELDS = (
     "flags",  # used in build_bundles lambda.
@@ -72,6 +82,15 @@ class LocalUpdater(object):
     :param storage:
         The instance of kinto.core.storage that will be used to retrieve
         records from the source and add new items to the destination.
+
+    :param incremental_diff:
+        Only read the source records modified since the last synchronization
+        when comparing the source and the destination (see
+        ``signer.incremental_diff_enabled`` setting).
+
+    :param serializer:
+        The canonical JSON serializer of the records (see
+        ``signer.canonical_json_encoder`` setting).
     """
 
     def __init__(
@@ -81,6 +100,8 @@ class LocalUpdater(object):
         signer: Any,
         storage: Any,
         permission: Any,
+        incremental_diff: bool = False,
+        serializer: Serializer | None = None,
     ) -> None:
         self._source: dict[str, Any] | None = None
         self._destination: dict[str, Any] | None = None
@@ -90,6 +111,8 @@ class LocalUpdater(object):
         self.signer = signer
         self.storage = storage
         self.permission = permission
+        self.incremental_diff = incremental_diff
+        self.serializer = serializer or Serializer()
 
     @property
     def source(self) -> dict[str, Any]:
@@ -136,22 +159,56 @@ class LocalUpdater(object):
 
         Return number of changes and size of changes.
         """
+        return self.sign_and_update_destinations(
+            request,
+            [self.destination],
+            source_attributes=source_attributes,
+            next_source_status=next_source_status,
+            previous_source_status=previous_source_status,
+            push_records=push_records,
+        )
+
+    def sign_and_update_destinations(
+        self,
+        request: Any,
+        destinations: list[dict[str, Any]],
+        source_attributes: dict[str, Any],
+        next_source_status: STATUS | None = STATUS.SIGNED,
+        previous_source_status: STATUS | None = None,
+        push_records: bool = True,
+    ) -> tuple[int, int]:
+        """Same as :meth:`sign_and_update_destination` for several destinations
+        of the source (eg. preview and destination), whose contents are signed
+        with a single call to the signer.
+
+        Return number of changes and size of changes of the last destination.
+        """
         changes_count = 0
         changes_size_bytes = 0
 
-        self.create_destination(request)
+        serialized = []
+        for destination in destinations:
+            self.destination = destination
+            self.create_destination(request)
+
+            if push_records:
+                changes_count, changes_size_bytes = self.push_records_to_destination(
+                    request
+                )
 
-        if push_records:
-            changes_count, changes_size_bytes = self.push_records_to_destination(
-                request
+            records, timestamp = self.get_destination_records(empty_none=False)
+            serialized_records = self.serializer.canonical_json(
+                records, timestamp, cache_scope=self.destination_collection_uri
             )
+            logger.debug(f"{self.destination_collection_uri}:\t'{serialized_records}'")
+            serialized.append(serialized_records)
 
-        records, timestamp = self.get_destination_records(empty_none=False)
-        serialized_records = canonical_json(records, timestamp)
-        logger.debug(f"{self.source_collection_uri}:\t'{serialized_records}'")
-        signatures = self.signer.sign(serialized_records)
+        all_signatures = self.signer.sign_many(serialized)
+
+        for destination, signatures in zip(destinations, all_signatures):
+            self.destination = destination
+            self.set_destination_signatures(signatures, source_attributes, request)
 
-        self.set_destination_signatures(signatures, source_attributes, request)
         if next_source_status is not None:
             self.update_source_status(
                 next_source_status, request, previous_source_status
@@ -170,7 +227,9 @@ class LocalUpdater(object):
         )
 
         records, timestamp = self.get_destination_records(empty_none=False)
-        serialized_records = canonical_json(records, timestamp)
+        serialized_records = self.serializer.canonical_json(
+            records, timestamp, cache_scope=self.destination_collection_uri
+        )
         logger.debug(f"{self.source_collection_uri}:\t'{serialized_records}'")
         signature = self.signer.sign(serialized_records)
         self.set_destination_signatures(
@@ -195,9 +254,8 @@ class LocalUpdater(object):
         recreate deleted, and restore changes) (eg. destination -> preview,
         or preview -> source).
         """
-        dest_records, _ = self.get_destination_records(empty_none=False)
+        source_records, dest_records, source_timestamp = self.get_records_to_diff()
         dest_by_id = {r["id"]: r for r in dest_records}
-        source_records, _ = self.get_source_records()
 
         changes_since_approval = records_diff(source_records, dest_records)
 
@@ -207,6 +265,7 @@ class LocalUpdater(object):
         }
 
         changed_count = 0
+        notified = []
         for record in changes_since_approval:
             action = None
             record_before = None
@@ -243,29 +302,18 @@ class LocalUpdater(object):
 
             if action is not None:
                 changed_count += 1
-                # Notify resource event, in order to leave a trace in the history.
-                matchdict = {
-                    "bucket_id": self.destination["bucket"],
-                    "collection_id": self.destination["collection"],
-                    FIELD_ID: record[FIELD_ID],
-                }
-                record_uri = (
-                    "/buckets/{bucket_id}/collections/{collection_id}/records/{id}"
-                ).format(**matchdict)
-
-                notify_resource_event(
-                    request,
-                    {
-                        "method": "DELETE" if action == ACTIONS.DELETE else "PUT",
-                        "path": record_uri,
-                    },
-                    matchdict=matchdict,
-                    resource_name="record",
-                    parent_id=self.source_collection_uri,
-                    obj=impacted,  # ty: ignore[invalid-argument-type]  # impacted is always set when action is not None
-                    action=action,
-                    old=record_before,
-                )
+                notified.append((action, impacted, record_before))
+
+        # Notify resource events, in order to leave a trace in the history.
+        notify_records_events(
+            request,
+            parent_id=self.source_collection_uri,
+            matchdict={
+                "bucket_id": self.destination["bucket"],
+                "collection_id": self.destination["collection"],
+            },
+            changes=notified,
+        )
 
         if refresh_last_edit:
             current_userid = request.prefixed_userid
@@ -279,6 +327,8 @@ class LocalUpdater(object):
             attrs[TRACKING_FIELDS.LAST_EDIT_DATE.value] = current_date
             self._update_source_attributes(request, **attrs)
 
+        self._set_sync_timestamp(source_timestamp)
+
         return changed_count
 
     def create_destination(self, request: Any) -> None:
@@ -338,77 +388,191 @@ class LocalUpdater(object):
     ) -> tuple[list[dict[str, Any]], Any]:
         return self._get_records(self.destination, **kwargs)
 
+    def get_records_to_diff(
+        self,
+    ) -> tuple[list[dict[str, Any]], list[dict[str, Any]], int]:
+        """
+        Return the source and destination records to be compared, and the
+        timestamp of the most recent source record that was read.
+
+        With the incremental diff, only the source records modified since the
+        last synchronization are returned (with the destination records that
+        have the same ids). All records are read if it is disabled, or if the
+        result could be inconsistent.
+        """
+        if self.incremental_diff:
+            changed = self._get_changed_records()
+            if changed is not None:
+                return changed
+
+        source_records, _ = self.get_source_records()
+        dest_records, _ = self.get_destination_records()
+        source_timestamp = max(
+            (r[FIELD_LAST_MODIFIED] for r in source_records), default=0
+        )
+        return source_records, dest_records, source_timestamp
+
+    def _get_changed_records(
+        self,
+    ) -> tuple[list[dict[str, Any]], list[dict[str, Any]], int] | None:
+        try:
+            sync = self.storage.get(
+                resource_name=SYNC_RESOURCE_NAME,
+                parent_id=self.destination_collection_uri,
+                object_id=self.source_collection_uri,
+            )
+        except ObjectNotFoundError:
+            return None
+
+        # The destination records are only modified by the signer. If they were
+        # changed since (eg. destination emptied), compare everything.
+        dest_timestamp = self.storage.resource_timestamp(
+            resource_name="record", parent_id=self.destination_collection_uri
+        )
+        if dest_timestamp != sync["destination_timestamp"]:
+            return None
+
+        # Tombstones are included, to get the records deleted since.
+        changed = self.storage.list_all(
+            resource_name="record",
+            parent_id=self.source_collection_uri,
+            filters=[
+                Filter(FIELD_LAST_MODIFIED, sync["source_timestamp"], COMPARISON.GT)
+            ],
+            include_deleted=True,
+        )
+        source_records = [r for r in changed if not r.get("deleted", False)]
+        dest_records = []
+        if changed:
+            dest_records = self.storage.list_all(
+                resource_name="record",
+                parent_id=self.destination_collection_uri,
+                filters=[
+                    Filter(FIELD_ID, [r[FIELD_ID] for r in changed], COMPARISON.IN)
+                ],
+            )
+
+        # Records created with a past timestamp, or tombstones purged since the
+        # last synchronization would be missed. Make sure the number of
+        # records will match once the changes are applied.
+        source_ids = {r[FIELD_ID] for r in source_records}
+        dest_ids = {r[FIELD_ID] for r in dest_records}
+        expected_count = (
+            self.storage.count_all(
+                resource_name="record", parent_id=self.destination_collection_uri
+            )
+            + len(source_ids - dest_ids)
+            - len(dest_ids - source_ids)
+        )
+        source_count = self.storage.count_all(
+            resource_name="record", parent_id=self.source_collection_uri
+        )
+        if source_count != expected_count:
+            logger.warning(
+                "Cannot compare %s and %s incrementally.",
+                self.source_collection_uri,
+                self.destination_collection_uri,
+            )
+            return None
+
+        source_timestamp = max(
+            (r[FIELD_LAST_MODIFIED] for r in changed),
+            default=sync["source_timestamp"],
+        )
+        return source_records, dest_records, source_timestamp
+
+    def _set_sync_timestamp(self, source_timestamp: int) -> None:
+        """
+        Remember that the destination is in sync with the source records
+        modified until the specified timestamp.
+        """
+        if not self.incremental_diff:
+            return
+        dest_timestamp = self.storage.resource_timestamp(
+            resource_name="record", parent_id=self.destination_collection_uri
+        )
+        self.storage.update(
+            resource_name=SYNC_RESOURCE_NAME,
+            parent_id=self.destination_collection_uri,
+            object_id=self.source_collection_uri,
+            obj={
+                "source_timestamp": source_timestamp,
+                "destination_timestamp": dest_timestamp,
+            },
+        )
+
     def push_records_to_destination(self, request: Any) -> tuple[int, int]:
-        dest_records, _dest_timestamp = self.get_destination_records()
-        source_records, _source_timestamp = self.get_source_records()
+        source_records, dest_records, source_timestamp = self.get_records_to_diff()
         new_records = records_diff(source_records, dest_records)
         changes_count = len(new_records)
         if changes_count == 0:
+            self._set_sync_timestamp(source_timestamp)
             return 0, 0
 
         # Compute size of payload pulled by clients on diff and all new
         # attachments size.
         changes_size_bytes = len(
-            canonical_json(new_records, 0)
+            self.serializer.canonical_json(
+                new_records, 0, cache_scope=self.source_collection_uri
+            )
         ) + attachments_size_diff(source_records, dest_records)
 
-        # Update the destination collection.
+        # Update the destination collection, in batches. The previous versions
+        # of the records are the destination records we already have.
+        dest_by_id = {r[FIELD_ID]: r for r in dest_records}
+        deleted_ids = []
+        upserts = []
         for record in new_records:
-            storage_kwargs = {
-                "parent_id": self.destination_collection_uri,
-                "resource_name": "record",
-            }
-            try:
-                before = self.storage.get(object_id=record[FIELD_ID], **storage_kwargs)
-            except RecordNotFoundError:
-                before = None
-
-            # Timestamp should be bumped in destination.
-            record = {**record}
-            del record[FIELD_LAST_MODIFIED]
-
-            deleted = record.get("deleted", False)
-            if deleted:
-                try:
-                    pushed = self.storage.delete(
-                        object_id=record[FIELD_ID],
-                        **storage_kwargs,
-                    )
-                    action = ACTIONS.DELETE
-                except RecordNotFoundError:
-                    # If the record doesn't exists in the destination
-                    # we are good and can ignore it.
-                    continue
+            if record.get("deleted", False):
+                # If the record doesn't exist in the destination
+                # we are good and can ignore it.
+                if record[FIELD_ID] in dest_by_id:
+                    deleted_ids.append(record[FIELD_ID])
             else:
-                if before is None:
-                    pushed = self.storage.create(obj=record, **storage_kwargs)
-                    action = ACTIONS.CREATE
-                else:
-                    pushed = self.storage.update(
-                        object_id=record[FIELD_ID], obj=record, **storage_kwargs
-                    )
-                    action = ACTIONS.UPDATE
-
-            matchdict = {
-                "bucket_id": self.destination["bucket"],
-                "collection_id": self.destination["collection"],
-                FIELD_ID: record[FIELD_ID],
-            }
-            bid = matchdict["bucket_id"]
-            cid = matchdict["collection_id"]
-            rid = matchdict["id"]
-            record_uri = f"/buckets/{bid}/collections/{cid}/records/{rid}"
-
-            notify_resource_event(
-                request,
-                {"method": "DELETE" if deleted else "PUT", "path": record_uri},
-                matchdict=matchdict,
+                # Timestamp should be bumped in destination.
+                record = {**record}
+                del record[FIELD_LAST_MODIFIED]
+                upserts.append(record)
+
+        pushed_by_id = {}
+        for chunk in chunks(deleted_ids, PUSH_BATCH_SIZE):
+            tombstones = self.storage.delete_all(
                 resource_name="record",
                 parent_id=self.destination_collection_uri,
-                obj=pushed,
-                action=action,
-                old=before,
+                filters=[Filter(FIELD_ID, chunk, COMPARISON.IN)],
+            )
+            pushed_by_id.update({t[FIELD_ID]: t for t in tombstones})
+        for chunk in chunks(upserts, PUSH_BATCH_SIZE):
+            pushed = upsert_records(
+                self.storage, self.destination_collection_uri, chunk
             )
+            pushed_by_id.update({r[FIELD_ID]: r for r in pushed})
+
+        notified = []
+        for record in new_records:
+            rid = record[FIELD_ID]
+            if rid not in pushed_by_id:
+                continue
+            before = dest_by_id.get(rid)
+            if record.get("deleted", False):
+                action = ACTIONS.DELETE
+            elif before is None:
+                action = ACTIONS.CREATE
+            else:
+                action = ACTIONS.UPDATE
+            notified.append((action, pushed_by_id[rid], before))
+
+        notify_records_events(
+            request,
+            parent_id=self.destination_collection_uri,
+            matchdict={
+                "bucket_id": self.destination["bucket"],
+                "collection_id": self.destination["collection"],
+            },
+            changes=notified,
+        )
+
+        self._set_sync_timestamp(source_timestamp)
 
         return changes_count, changes_size_bytes
 
@@ -490,6 +654,10 @@ class LocalUpdater(object):
             attrs[TRACKING_FIELDS.LAST_SIGNATURE_DATE.value] = current_date
         return self._update_source_attributes(request, **attrs)
 
+    def restore_source_status(self, request: Any, status: STATUS) -> None:
+        """Restore the status of the source (eg. when its signature failed)."""
+        return self._update_source_attributes(request, status=status.value)
+
     def _update_source_attributes(self, request: Any, **kwargs: Any) -> None:
         parent_id = "/buckets/%s" % self.source["bucket"]
         resource_name = "collection"
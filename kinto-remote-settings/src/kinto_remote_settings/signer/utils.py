@@ -3,12 +3,13 @@ import re
 import ssl
 from collections import OrderedDict
 from enum import Enum
-from typing import Any
+from typing import Any, Iterable, Iterator
 from urllib.parse import urlparse
 
 from kinto.core.events import ACTIONS
+from kinto.core.storage import postgresql as postgresql_storage
 from kinto.core.storage.exceptions import UnicityError
-from kinto.core.utils import build_request, instance_uri, read_env
+from kinto.core.utils import build_request, instance_uri, json, read_env
 from kinto.views import NameGenerator
 from pyramid.exceptions import ConfigurationError
 
@@ -27,6 +28,8 @@ class STATUS(Enum):
     TO_REVIEW = "to-review"
     TO_ROLLBACK = "to-rollback"
     SIGNED = "signed"
+    # While the changes are signed in background (see ``jobs``).
+    SIGNING = "signing"
 
     def __eq__(self, other: object) -> bool:
         if not hasattr(other, "value"):
@@ -235,17 +238,69 @@ def storage_create_raw(
         logger.warning(f"{object_uri} already exists.")
 
 
-def notify_resource_event(
+UPSERT_RECORDS_QUERY = """
+INSERT INTO objects (id, parent_id, resource_name, data, last_modified, deleted)
+SELECT r.id, :parent_id, 'record', r.data, NULL, FALSE
+  FROM jsonb_to_recordset((:records)::JSONB) AS r(id TEXT, data JSONB)
+ON CONFLICT (id, parent_id, resource_name) DO UPDATE
+SET data = EXCLUDED.data,
+    deleted = FALSE,
+    last_modified = EXCLUDED.last_modified
+RETURNING id, as_epoch(last_modified) AS last_modified;
+"""
+
+
+def chunks(items: list[Any], size: int) -> Iterator[list[Any]]:
+    for i in range(0, len(items), size):
+        yield items[i : i + size]
+
+
+def upsert_records(
+    storage: Any, parent_id: str, records: list[dict[str, Any]]
+) -> list[dict[str, Any]]:
+    """
+    Create or replace the specified records, and return them with their new
+    timestamps. Like ``storage.update()``, but with a single statement for all
+    the records with the PostgreSQL backend.
+    """
+    if not isinstance(storage, postgresql_storage.Storage):
+        return [
+            storage.update(
+                resource_name="record",
+                parent_id=parent_id,
+                object_id=record["id"],
+                obj=record,
+            )
+            for record in records
+        ]
+
+    from kinto.core.utils import sqlalchemy as sa
+
+    rows = [
+        {
+            "id": record["id"],
+            "data": {
+                k: v for k, v in record.items() if k not in ("id", FIELD_LAST_MODIFIED)
+            },
+        }
+        for record in records
+    ]
+    placeholders = {"parent_id": parent_id, "records": json.dumps(rows)}
+    with storage.client.connect() as conn:
+        result = conn.execute(sa.text(UPSERT_RECORDS_QUERY), placeholders)
+        timestamps = dict(result.fetchall())
+
+    return [
+        {**record, FIELD_LAST_MODIFIED: timestamps[record["id"]]} for record in records
+    ]
+
+
+def _build_plugin_request(
     request: Any,
     request_options: dict[str, Any],
     matchdict: dict[str, Any],
     resource_name: str,
-    parent_id: str,
-    obj: dict[str, Any],
-    action: Any,
-    old: dict[str, Any] | None = None,
-) -> None:
-    """Helper that triggers resource events as real requests."""
+) -> Any:
     fakerequest = build_request(request, request_options)
     fakerequest.matchdict = matchdict
     fakerequest.bound_data = request.bound_data
@@ -263,7 +318,23 @@ def notify_resource_event(
     # See https://github.com/mozilla/remote-settings/issues/788
     # and https://github.com/Kinto/kinto-signer/issues/256.
     fakerequest._attachment_auto_save = True
+    return fakerequest
 
+
+def notify_resource_event(
+    request: Any,
+    request_options: dict[str, Any],
+    matchdict: dict[str, Any],
+    resource_name: str,
+    parent_id: str,
+    obj: dict[str, Any],
+    action: Any,
+    old: dict[str, Any] | None = None,
+) -> None:
+    """Helper that triggers resource events as real requests."""
+    fakerequest = _build_plugin_request(
+        request, request_options, matchdict, resource_name
+    )
     fakerequest.notify_resource_event(
         parent_id=parent_id,
         timestamp=obj[FIELD_LAST_MODIFIED],
@@ -273,6 +344,48 @@ def notify_resource_event(
     )
 
 
+def notify_records_events(
+    request: Any,
+    parent_id: str,
+    matchdict: dict[str, Any],
+    changes: Iterable[tuple[Any, dict[str, Any], dict[str, Any] | None]],
+) -> None:
+    """
+    Same as :func:`notify_resource_event` for several records, specified as
+    ``(action, obj, old)`` tuples. Since Kinto merges the events of a same
+    action and parent, and keeps the payload and request of the first one,
+    a single fake request is built per action.
+
+    The ``matchdict`` contains the bucket and collection ids of the records URIs.
+    """
+    by_action: dict[Any, list[tuple[dict[str, Any], dict[str, Any] | None]]] = {}
+    for action, obj, old in changes:
+        by_action.setdefault(action, []).append((obj, old))
+
+    for action, objects in by_action.items():
+        first_matchdict = {**matchdict, "id": objects[0][0]["id"]}
+        record_uri = (
+            "/buckets/{bucket_id}/collections/{collection_id}/records/{id}"
+        ).format(**first_matchdict)
+        fakerequest = _build_plugin_request(
+            request,
+            {
+                "method": "DELETE" if action == ACTIONS.DELETE else "PUT",
+                "path": record_uri,
+            },
+            matchdict=first_matchdict,
+            resource_name="record",
+        )
+        for obj, old in objects:
+            fakerequest.notify_resource_event(
+                parent_id=parent_id,
+                timestamp=obj[FIELD_LAST_MODIFIED],
+                data=obj,
+                action=action,
+                old=old,
+            )
+
+
 def records_equal(a: dict[str, Any], b: dict[str, Any]) -> bool:
     ignore_fields = ("last_modified", "schema")
     ac = {k: v for k, v in a.items() if k not in ignore_fields}
@@ -325,6 +438,35 @@ def attachments_size_diff(
     return changed
 
 
+def find_float(obj: dict[str, Any] | list[Any]) -> str | None:
+    """
+    Return the path of the first float value in the specified object
+    (eg. ``"a.0.b"``), or ``None`` if there is none.
+    """
+    # Iterators of the containers being scanned, and the keys leading to them.
+    stack: list[Iterator[tuple[Any, Any]]] = [
+        iter(obj.items()) if isinstance(obj, dict) else enumerate(obj)
+    ]
+    keys: list[Any] = []
+    while stack:
+        for key, value in stack[-1]:
+            if isinstance(value, float):
+                return ".".join(str(k) for k in (*keys, key))
+            if isinstance(value, dict):
+                stack.append(iter(value.items()))
+                keys.append(key)
+                break
+            if isinstance(value, list):
+                stack.append(enumerate(value))
+                keys.append(key)
+                break
+        else:
+            stack.pop()
+            if keys:
+                keys.pop()
+    return None
+
+
 def fetch_cert(url: str) -> Any:
     """
     Returns the SSL certificate object for the specified `url`.
@@ -345,8 +487,47 @@ def fetch_cert(url: str) -> Any:
     return cert
 
 
+GlobSettings = dict[str, tuple[re.Pattern[str], re.Pattern[str], str, str, Any]]
+
+
+def compile_glob_settings(settings: dict[str, Any]) -> GlobSettings:
+    r"""
+    Compile the bucket and collection patterns of glob settings
+    (eg. ``"signer.main-workspace.quicksuggest-(\w+).to_review_enabled"``).
+    """
+    glob_settings: GlobSettings = {}
+    for key, value in settings.items():
+        tokens = key.split(".")
+        # Skip if not a supported glob pattern (for simplicity, just for to_review_enabled now)
+        if "(" not in key or len(tokens) != 4 or tokens[-1] != "to_review_enabled":
+            continue
+        prefix, bucket_pattern, collection_pattern, setting = tokens
+        glob_settings[key] = (
+            re.compile(bucket_pattern),
+            re.compile(collection_pattern),
+            prefix,
+            setting,
+            value,
+        )
+    return glob_settings
+
+
+def expand_collection_glob_settings(
+    glob_settings: GlobSettings, bid: str, cid: str
+) -> dict[str, Any]:
+    """
+    Return the concrete settings of the specified collection, for the glob
+    settings that match it.
+    """
+    return {
+        f"{prefix}.{bid}.{cid}.{setting}": value
+        for bucket_re, collection_re, prefix, setting, value in glob_settings.values()
+        if bucket_re.fullmatch(bid) and collection_re.fullmatch(cid)
+    }
+
+
 def expand_collections_glob_settings(
-    storage: Any, settings: dict[str, Any]
+    storage: Any, settings: dict[str, Any], glob_settings: GlobSettings | None = None
 ) -> dict[str, Any]:
     r"""
     Expand glob patterns in settings using actual bucket and collection names from storage.
@@ -364,6 +545,9 @@ def expand_collections_glob_settings(
         # The DB is a memory backend, or is not ready yet, do not even try to list collections.
         return settings
 
+    if glob_settings is None:
+        glob_settings = compile_glob_settings(settings)
+
     # Fetch all buckets
     buckets = storage.list_all(parent_id="", resource_name="bucket")
 
@@ -376,22 +560,11 @@ def expand_collections_glob_settings(
         )
     ]
 
-    expanded_settings: dict[str, Any] = {}
-
-    for key, value in settings.items():
-        tokens = key.split(".")
-        # Skip if not a supported glob pattern (for simplicity, just for to_review_enabled now)
-        if "(" not in key or len(tokens) != 4 or tokens[-1] != "to_review_enabled":
-            expanded_settings[key] = value
-            continue
-
-        prefix, bucket_pattern, collection_pattern, setting = tokens
-
-        # Match and expand glob patterns
-        for bid, cid in collections:
-            if re.fullmatch(bucket_pattern, bid) and re.fullmatch(
-                collection_pattern, cid
-            ):
-                expanded_settings[f"{prefix}.{bid}.{cid}.{setting}"] = value
+    expanded_settings = {k: v for k, v in settings.items() if k not in glob_settings}
+    # Match and expand glob patterns
+    for bid, cid in collections:
+        expanded_settings.update(
+            expand_collection_glob_settings(glob_settings, bid, cid)
+        )
 
     return expanded_settings
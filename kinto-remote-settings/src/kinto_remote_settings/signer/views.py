@@ -0,0 +1,56 @@
+from typing import Any
+
+import kinto.core
+from kinto.authorization import RouteFactory
+from kinto.core import errors
+from kinto.core.errors import ERRORS
+from kinto.core.utils import instance_uri
+from pyramid import httpexceptions
+from pyramid.security import IAuthorizationPolicy
+from zope.interface import implementer
+
+
+SIGNING_JOB_PATH = "/buckets/{bucket_id}/collections/{collection_id}/signing-job"
+
+
+@implementer(IAuthorizationPolicy)
+class SigningJobRoute(RouteFactory):
+    """The signing job has the same permissions as the collection metadata."""
+
+    def __init__(self, request: Any):
+        super().__init__(request)
+        bid = request.matchdict["bucket_id"]
+        cid = request.matchdict["collection_id"]
+        collection_uri = instance_uri(request, "collection", bucket_id=bid, id=cid)
+        self.permission_object_id = collection_uri
+        self.required_permission = "read"
+
+
+signing_job = kinto.core.Service(
+    name="signing-job", path=SIGNING_JOB_PATH, factory=SigningJobRoute
+)
+
+
+@signing_job.get(permission="read")
+def get_signing_job(request: Any) -> dict[str, Any]:
+    """
+    Return the latest signing job of the collection, that clients can poll
+    to follow the progress of asynchronous signatures.
+    """
+    worker = request.registry.signing_worker
+    if worker is None:
+        # Disabled (see ``signer.async_signing_enabled`` setting).
+        raise httpexceptions.HTTPNotFound()
+
+    bid = request.matchdict["bucket_id"]
+    cid = request.matchdict["collection_id"]
+    uri = instance_uri(request, "collection", bucket_id=bid, id=cid)
+    job = worker.get_job(uri)
+    if job is None:
+        details = {"id": cid, "resource_name": "signing-job"}
+        raise errors.http_error(
+            httpexceptions.HTTPNotFound(),
+            errno=ERRORS.MISSING_RESOURCE,
+            details=details,
+        )
+    return {"data": job}
@@ -1,7 +1,12 @@
 import datetime
+import threading
 import unittest
 from unittest import mock
 
+from kinto.core.cache.memory import Cache
+from kinto_remote_settings.changes import BROADCAST_CACHE_KEY, listeners
+from kinto_remote_settings.changes.notifications import CacheNotifier, MemoryNotifier
+
 from . import BaseWebTest
 
 
@@ -60,6 +65,27 @@ class BroadcastsTest(BaseWebTest, unittest.TestCase):
         assert self.get_broadcasted_version() == f'"{FAKE_TIMESTAMP}"'
         self.monitored_timestamps.assert_called_once()  # Only one call to the database, second call is cached
 
+    def test_database_is_not_hit_when_latest_timestamp_is_cached(self):
+        cache_timestamp = int(
+            (FAKE_NOW - datetime.timedelta(minutes=8)).timestamp() * 1000
+        )
+        latest_timestamp = int(
+            (FAKE_NOW - datetime.timedelta(minutes=6)).timestamp() * 1000
+        )
+        self.app.app.registry.cache.set(
+            "remote-settings/monitor_changes/timestamp",
+            cache_timestamp,
+            ttl=DAY_IN_SECONDS,
+        )
+        self.app.app.registry.cache.set(
+            "remote-settings/monitor_changes/latest",
+            latest_timestamp,
+            ttl=DAY_IN_SECONDS,
+        )
+
+        assert self.get_broadcasted_version() == f'"{latest_timestamp}"'
+        self.monitored_timestamps.assert_not_called()
+
     def test_database_is_not_hit_when_last_published_is_younger_than_min_debounce(self):
         """
         ================o=>>>
@@ -97,10 +123,16 @@ class BroadcastsTest(BaseWebTest, unittest.TestCase):
             latest_timestamp = int(
                 (FAKE_NOW - datetime.timedelta(minutes=age + 1)).timestamp() * 1000
             )
-            self.monitored_timestamps.return_value = [("main", "cid", latest_timestamp)]
+            # The latest timestamp is maintained by the listener.
+            self.app.app.registry.cache.set(
+                "remote-settings/monitor_changes/latest",
+                latest_timestamp,
+                ttl=DAY_IN_SECONDS,
+            )
             obtained.append(self.get_broadcasted_version())
 
         assert obtained == [obtained[0]] * 6 + [obtained[-1]]
+        assert obtained[0] != obtained[-1]
 
     def test_return_cache_if_cached_and_current_are_older_than_min_debounce(
         self,
@@ -199,3 +231,202 @@ class BroadcastsTest(BaseWebTest, unittest.TestCase):
         self.monitored_timestamps.return_value = [("main", "cid", latest_timestamp)]
 
         assert self.get_broadcasted_version() == f'"{latest_timestamp}"'
+
+
+class BroadcastsListenerTest(BaseWebTest, unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.create_collection("blocklists-preview", "certificates")
+        self.create_collection("blocklists", "excluded")
+        self.cache = self.app.app.registry.cache
+        self.cache.set("remote-settings/monitor_changes/latest", 42, ttl=60)
+
+    def tearDown(self):
+        super().tearDown()
+        self.cache.flush()
+
+    def create_record(self, bucket_id, collection_id):
+        resp = self.app.post_json(
+            f"/buckets/{bucket_id}/collections/{collection_id}/records",
+            {},
+            headers=self.headers,
+        )
+        return resp.json["data"]["last_modified"]
+
+    def test_latest_timestamp_is_invalidated_on_monitored_changes(self):
+        self.create_record("blocklists", "certificates")
+
+        assert self.cache.get("remote-settings/monitor_changes/latest") is None
+
+    def test_latest_timestamp_is_not_invalidated_by_older_changes(self):
+        self.cache.set("remote-settings/monitor_changes/latest", 2**50, ttl=60)
+
+        self.create_record("blocklists", "certificates")
+
+        assert self.cache.get("remote-settings/monitor_changes/latest") == 2**50
+
+    def test_latest_timestamp_is_not_lowered_by_interleaved_listeners(self):
+        request = mock.MagicMock()
+        request.registry = self.app.app.registry
+
+        def event(timestamp):
+            payload = {
+                "bucket_id": "blocklists",
+                "collection_id": "certificates",
+                "timestamp": timestamp,
+            }
+            return mock.MagicMock(payload=payload, request=request)
+
+        # The second listener runs while the first one reads the cache.
+        cache_get = self.cache.get
+
+        def interleaved_get(key):
+            value = cache_get(key)
+            with mock.patch.object(self.cache, "get", cache_get):
+                listeners.update_broadcast_timestamp(event(300))
+            return value
+
+        with mock.patch.object(self.cache, "get", interleaved_get):
+            listeners.update_broadcast_timestamp(event(200))
+
+        assert self.cache.get("remote-settings/monitor_changes/latest") is None
+        timestamp = self.create_record("blocklists", "certificates")
+        resp = self.app.get("/__broadcasts__")
+        assert resp.json["broadcasts"]["remote-settings/monitor_changes"] == (
+            f'"{timestamp}"'
+        )
+
+    def test_latest_timestamp_is_not_updated_on_preview_changes(self):
+        self.create_record("blocklists-preview", "certificates")
+
+        assert self.cache.get("remote-settings/monitor_changes/latest") == 42
+
+    def test_latest_timestamp_is_not_updated_on_excluded_changes(self):
+        self.create_record("blocklists", "excluded")
+
+        assert self.cache.get("remote-settings/monitor_changes/latest") == 42
+
+    def test_latest_timestamp_is_not_initialized_by_listener(self):
+        self.cache.delete("remote-settings/monitor_changes/latest")
+
+        self.create_record("blocklists", "certificates")
+
+        assert self.cache.get("remote-settings/monitor_changes/latest") is None
+
+    def test_broadcast_view_uses_latest_timestamp(self):
+        self.cache.delete("remote-settings/monitor_changes/latest")
+        timestamp = self.create_record("blocklists", "certificates")
+
+        resp = self.app.get("/__broadcasts__")
+
+        assert resp.json["broadcasts"]["remote-settings/monitor_changes"] == (
+            f'"{timestamp}"'
+        )
+        assert self.cache.get("remote-settings/monitor_changes/latest") == timestamp
+        # Bounds the delay of changes committed while it was read.
+        assert self.cache.ttl("remote-settings/monitor_changes/latest") <= 60
+
+
+class BroadcastsPollTest(BaseWebTest, unittest.TestCase):
+    poll_uri = "/__broadcasts__/poll"
+
+    @classmethod
+    def get_app_settings(cls, extras=None):
+        settings = super().get_app_settings(extras)
+        settings["changes.long_poll_enabled"] = "true"
+        settings["changes.long_poll_notifier"] = "memory"
+        return settings
+
+    def setUp(self):
+        super().setUp()
+        self.cache = self.app.app.registry.cache
+        self.notifier = self.app.app.registry.changes_notifier
+        self.cache.set(BROADCAST_CACHE_KEY, FAKE_TIMESTAMP, ttl=DAY_IN_SECONDS)
+        self.notifier.publish(FAKE_TIMESTAMP)
+
+    def tearDown(self):
+        super().tearDown()
+        self.cache.flush()
+
+    def test_returns_current_timestamp_without_since(self):
+        resp = self.app.get(self.poll_uri)
+
+        assert resp.json == {"timestamp": FAKE_TIMESTAMP}
+
+    def test_returns_immediately_if_since_is_outdated(self):
+        resp = self.app.get(self.poll_uri + f"?_since={FAKE_TIMESTAMP - 1}")
+
+        assert resp.json == {"timestamp": FAKE_TIMESTAMP}
+
+    def test_returns_since_if_nothing_published_before_timeout(self):
+        resp = self.app.get(self.poll_uri + f'?_since="{FAKE_TIMESTAMP}"&_timeout=0')
+
+        assert resp.json == {"timestamp": FAKE_TIMESTAMP}
+
+    def test_returns_as_soon_as_a_new_timestamp_is_published(self):
+        timer = threading.Timer(0.05, self.notifier.publish, args=(FAKE_TIMESTAMP + 1,))
+        timer.start()
+        self.addCleanup(timer.cancel)
+
+        resp = self.app.get(self.poll_uri + f"?_since={FAKE_TIMESTAMP}&_timeout=5")
+
+        assert resp.json == {"timestamp": FAKE_TIMESTAMP + 1}
+
+    def test_returns_503_if_too_many_requests_are_waiting(self):
+        waiters = self.app.app.registry.changes_poll_waiters
+        with mock.patch.object(waiters, "acquire", return_value=False):
+            resp = self.app.get(
+                self.poll_uri + f"?_since={FAKE_TIMESTAMP}&_timeout=5", status=503
+            )
+
+        assert resp.json["message"] == "Too many waiting requests. Retry later."
+        retry_after = self.app.app.registry.settings["retry_after_seconds"]
+        assert resp.headers["Retry-After"] == str(retry_after)
+
+    def test_waiter_is_released_after_timeout(self):
+        waiters = self.app.app.registry.changes_poll_waiters
+        with mock.patch.object(waiters, "release", wraps=waiters.release) as mocked:
+            self.app.get(self.poll_uri + f"?_since={FAKE_TIMESTAMP}&_timeout=0")
+
+        mocked.assert_called_once_with()
+
+    def test_broadcasted_timestamps_are_published(self):
+        self.app.post_json(
+            "/buckets/blocklists/collections/certificates/records",
+            {},
+            headers=self.headers,
+        )
+        self.cache.flush()
+        with mock.patch.object(self.notifier, "publish") as mocked:
+            resp = self.app.get("/__broadcasts__")
+
+        version = resp.json["broadcasts"]["remote-settings/monitor_changes"]
+        mocked.assert_called_with(int(version.strip('"')))
+
+
+class BroadcastsPollDisabledTest(BaseWebTest, unittest.TestCase):
+    def test_poll_endpoint_is_not_available_by_default(self):
+        self.app.get("/__broadcasts__/poll", status=404)
+
+
+class NotifiersTest(unittest.TestCase):
+    def test_memory_notifier_wakes_up_consumers(self):
+        notifier = MemoryNotifier()
+        threading.Timer(0.05, notifier.publish, args=(42,)).start()
+
+        assert notifier.wait(last_value=41, timeout=5) == 42
+
+    def test_memory_notifier_returns_none_on_timeout(self):
+        notifier = MemoryNotifier()
+        notifier.publish(42)
+
+        assert notifier.wait(last_value=42, timeout=0.01) is None
+
+    def test_cache_notifier_polls_the_cache(self):
+        cache = Cache(cache_prefix="", cache_max_size_bytes=1000)
+        publisher = CacheNotifier(cache)
+        consumer = CacheNotifier(cache, poll_interval=0.01)
+        threading.Timer(0.05, publisher.publish, args=(42,)).start()
+
+        assert consumer.wait(last_value=41, timeout=5) == 42
+        assert consumer.wait(last_value=42, timeout=0.01) is None
@@ -0,0 +1,134 @@
+import unittest
+from unittest import mock
+
+import responses
+from kinto_remote_settings.changes import listeners
+from kinto_remote_settings.changes.cdn import HTTPPurger
+
+from . import BaseWebTest
+
+
+PURGE_URL = "https://cdn.example.com/service/abc/purge"
+
+
+class SurrogateKeysTest(BaseWebTest, unittest.TestCase):
+    @classmethod
+    def get_app_settings(cls, extras=None):
+        settings = super().get_app_settings(extras)
+        settings["changes.cdn_purge_backend"] = "kinto_remote_settings.changes.cdn"
+        settings["changes.cdn_purge_url"] = PURGE_URL
+        settings["changes.cdn_purge_token"] = "secret"
+        return settings
+
+    def setUp(self):
+        super().setUp()
+        self.create_collection("blocklists", "excluded")
+        self.responses = responses.RequestsMock(assert_all_requests_are_fired=False)
+        self.responses.start()
+        self.addCleanup(self.responses.stop)
+        self.responses.add(responses.POST, PURGE_URL)
+
+    def purged_keys(self):
+        return [call.request.headers["Surrogate-Key"] for call in self.responses.calls]
+
+    def test_changeset_responses_are_tagged(self):
+        resp = self.app.get(
+            "/buckets/blocklists/collections/certificates/changeset?_expected=42",
+            headers=self.headers,
+        )
+
+        assert resp.headers["Surrogate-Key"] == "blocklists blocklists/certificates"
+
+    def test_monitor_changes_responses_are_tagged(self):
+        resp = self.app.get("/buckets/monitor/collections/changes/records")
+
+        assert resp.headers["Surrogate-Key"] == "monitor monitor/changes"
+
+    def test_monitored_changes_are_purged_after_commit(self):
+        self.app.post_json(
+            "/buckets/blocklists/collections/certificates/records",
+            {},
+            headers=self.headers,
+        )
+
+        assert self.purged_keys() == ["blocklists/certificates monitor/changes"]
+        assert self.responses.calls[0].request.headers["Fastly-Key"] == "secret"
+
+    def test_changes_of_a_batch_are_purged_at_once(self):
+        self.app.post_json(
+            "/batch",
+            {
+                "defaults": {"method": "POST", "body": {}},
+                "requests": [
+                    {"path": "/buckets/blocklists/collections/certificates/records"},
+                    {"path": "/buckets/blocklists/collections/certificates/records"},
+                ],
+            },
+            headers=self.headers,
+        )
+
+        assert self.purged_keys() == ["blocklists/certificates monitor/changes"]
+
+    def test_unmonitored_changes_are_not_purged(self):
+        self.app.post_json(
+            "/buckets/blocklists/collections/excluded/records",
+            {},
+            headers=self.headers,
+        )
+
+        assert self.purged_keys() == []
+
+    def test_purge_errors_do_not_fail_requests(self):
+        self.responses.replace(responses.POST, PURGE_URL, status=500)
+
+        with mock.patch.object(listeners.logger, "error") as mocked:
+            self.app.post_json(
+                "/buckets/blocklists/collections/certificates/records",
+                {},
+                headers=self.headers,
+            )
+
+        mocked.assert_called_with("Unable to purge CDN", exc_info=True)
+
+
+class ReviewApprovedPurgeTest(unittest.TestCase):
+    def test_preview_and_destination_are_purged(self):
+        request = mock.MagicMock()
+        request.bound_data = {}
+        event = mock.MagicMock(
+            request=request,
+            resource={
+                "source": {"bucket": "main-workspace", "collection": "cid"},
+                "preview": {"bucket": "main-preview", "collection": "cid"},
+                "destination": {"bucket": "main", "collection": "cid"},
+            },
+        )
+
+        with mock.patch.object(listeners, "transaction") as mocked:
+            listeners.queue_cdn_purge_on_approval(event)
+        (hook,), hook_kwargs = mocked.get().addAfterCommitHook.call_args
+        hook(True, *hook_kwargs["args"])
+
+        request.registry.cdn_purger.purge.assert_called_with(
+            ["main-preview/cid", "main/cid", "monitor/changes"]
+        )
+
+    def test_nothing_is_purged_if_transaction_failed(self):
+        request = mock.MagicMock()
+        request.bound_data = {listeners.CDN_PURGE_QUEUE: {"main/cid"}}
+
+        listeners._purge_cdn(False, request)
+
+        request.registry.cdn_purger.purge.assert_not_called()
+
+
+class HTTPPurgerTest(unittest.TestCase):
+    @responses.activate
+    def test_keys_are_sent_in_header(self):
+        responses.add(responses.POST, PURGE_URL)
+
+        HTTPPurger(url=PURGE_URL).purge(["a", "a/b"])
+
+        request = responses.calls[0].request
+        assert request.headers["Surrogate-Key"] == "a a/b"
+        assert "Fastly-Key" not in request.headers
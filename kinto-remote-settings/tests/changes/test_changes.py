@@ -102,9 +102,8 @@ class UpdateChangesTest(BaseWebTest, unittest.TestCase):
         before_timestamp = resp.headers["ETag"]
 
         # With ?_since
-        resp = self.app.get(
-            self.changes_uri + f"?_since={before_timestamp}", status=200
-        )
+        since = before_timestamp.strip('"')
+        resp = self.app.get(self.changes_uri + f"?_since={since}", status=200)
         assert len(resp.json["data"]) == 0
 
         # With ETag precondition headers
@@ -120,7 +119,7 @@ class UpdateChangesTest(BaseWebTest, unittest.TestCase):
         resp = self.app.get(self.changes_uri)
         assert "max-age" not in resp.headers["Cache-Control"]
 
-        resp = self.app.get(self.changes_uri + '?_expected="42"')
+        resp = self.app.get(self.changes_uri + "?_expected=42")
         assert "max-age" not in resp.headers["Cache-Control"]
 
     def test_returns_empty_list_if_no_resource_configured(self):
@@ -194,7 +193,7 @@ class CacheExpiresTest(BaseWebTest, unittest.TestCase):
 
     def test_cache_expires_header_is_maximum_with_cache_busting(self):
         resp = self.app.get(
-            self.changes_uri + f"?_since={HOUR_AGO}&_expected={HOUR_AGO + 1}"
+            self.changes_uri + f"?_expected={HOUR_AGO + 1}&_since={HOUR_AGO}"
         )
         assert "max-age=3600" in resp.headers["Cache-Control"]
 
@@ -263,7 +262,7 @@ class OldSinceRedirectTest(BaseWebTest, unittest.TestCase):
         assert response.headers["Cache-Control"] == "max-age=86400"
 
 
-class UnquoteExpectedRedirectTest(BaseWebTest, unittest.TestCase):
+class CanonicalQuerystringRedirectTest(BaseWebTest, unittest.TestCase):
     changes_uri = "/buckets/monitor/collections/changes/changeset"
 
     @classmethod
@@ -280,3 +279,68 @@ class UnquoteExpectedRedirectTest(BaseWebTest, unittest.TestCase):
                 resp.headers["Location"]
                 == "https://cdn-host/v1/buckets/monitor/collections/changes/changeset?_expected=42"
             )
+
+    def test_redirects_to_sorted_and_unquoted_params(self):
+        since = 4000000000000  # Not old enough to be dropped.
+        resp = self.app.get(
+            self.changes_uri
+            + f"?collection=cid&_since=%22{since}%22&bucket=bid&_expected={since + 1}"
+        )
+        assert resp.status_code == 307
+        assert resp.headers["Location"].endswith(
+            f"/changeset?_expected={since + 1}&_since={since}&bucket=bid&collection=cid"
+        )
+
+    def test_redirects_and_drops_unknown_params(self):
+        resp = self.app.get(self.changes_uri + "?_expected=42&_rand=123&foo=bar")
+        assert resp.status_code == 307
+        assert resp.headers["Location"].endswith("/changeset?_expected=42")
+
+    def test_redirects_and_drops_redundant_limit(self):
+        resp = self.app.get(self.changes_uri + "?_expected=42&_limit=99999999")
+        assert resp.status_code == 307
+        assert resp.headers["Location"].endswith("/changeset?_expected=42")
+
+    def test_does_not_redirect_canonical_querystring(self):
+        resp = self.app.get(self.changes_uri + "?_expected=42&_limit=2&bucket=bid")
+        assert resp.status_code == 200
+
+    def test_records_endpoint_keeps_unknown_params(self):
+        resp = self.app.get(
+            "/buckets/monitor/collections/changes/records?bucket=bid&_expected=42"
+        )
+        assert resp.status_code == 307
+        assert resp.headers["Location"].endswith("/records?_expected=42&bucket=bid")
+
+    def test_redirects_are_cached_for_long(self):
+        resp = self.app.get(self.changes_uri + "?_expected=%2242%22")
+        assert resp.headers["Cache-Control"] == "max-age=604800"
+
+    def test_redirects_are_counted_per_variant(self):
+        metrics_client = self.app.app.registry.metrics
+        with mock.patch.object(metrics_client, "count") as mocked:
+            self.app.get(self.changes_uri + "?bucket=bid&_expected=%2243%22")
+
+        mocked.assert_any_call(
+            "plugins.changes.canonical_redirects",
+            unique=[("variant", "params_order")],
+        )
+        mocked.assert_any_call(
+            "plugins.changes.canonical_redirects",
+            unique=[("variant", "quoted_timestamp")],
+        )
+
+
+class CanonicalRedirectTTLTest(BaseWebTest, unittest.TestCase):
+    @classmethod
+    def get_app_settings(cls, extras=None):
+        settings = super().get_app_settings(extras)
+        settings["changes.canonical_redirect_ttl_seconds"] = "-1"
+        return settings
+
+    def test_redirects_cache_can_be_disabled(self):
+        resp = self.app.get(
+            "/buckets/monitor/collections/changes/changeset?_expected=%2242%22"
+        )
+        assert resp.status_code == 307
+        assert "Cache-Control" not in resp.headers
@@ -0,0 +1,96 @@
+import datetime
+import unittest
+from unittest import mock
+
+from kinto_remote_settings.changes import scripts
+
+from . import BaseWebTest
+
+
+class PurgeOldTombstonesTest(BaseWebTest, unittest.TestCase):
+    @classmethod
+    def get_app_settings(cls, extras=None):
+        settings = super().get_app_settings(extras)
+        settings["kinto.changes.since_max_age_days"] = "21"
+        return settings
+
+    def setUp(self):
+        super().setUp()
+        self.create_collection("blocklists", "excluded")
+        for cid in ("certificates", "excluded"):
+            records_uri = f"/buckets/blocklists/collections/{cid}/records"
+            self.app.post_json(records_uri, {}, headers=self.headers)
+            self.app.delete(records_uri, headers=self.headers)
+        self.env = {"registry": self.app.app.registry}
+
+        patch = mock.patch.object(scripts, "utcnow")
+        self.utcnow = patch.start()
+        self.addCleanup(patch.stop)
+
+    def count_tombstones(self, cid):
+        storage = self.app.app.registry.storage
+        objects = storage.list_all(
+            resource_name="record",
+            parent_id=f"/buckets/blocklists/collections/{cid}",
+            include_deleted=True,
+        )
+        return len(objects)
+
+    def test_recent_tombstones_are_kept(self):
+        self.utcnow.return_value = datetime.datetime.now(datetime.timezone.utc)
+
+        assert scripts.purge_old_tombstones(self.env) == 0
+
+        assert self.count_tombstones("certificates") == 1
+
+    def test_old_tombstones_of_monitored_collections_are_purged(self):
+        self.utcnow.return_value = datetime.datetime.now(
+            datetime.timezone.utc
+        ) + datetime.timedelta(days=22)
+
+        with mock.patch.object(scripts.logger, "info") as mocked:
+            assert scripts.purge_old_tombstones(self.env) == 0
+
+        assert self.count_tombstones("certificates") == 0
+        assert self.count_tombstones("excluded") == 1
+        mocked.assert_called_with(
+            "%s tombstone(s) older than %s days deleted in total.", 1, 21
+        )
+
+    def test_old_tombstones_are_purged_in_batches(self):
+        records_uri = "/buckets/blocklists/collections/certificates/records"
+        for _ in range(4):
+            self.app.post_json(records_uri, {}, headers=self.headers)
+        self.app.delete(records_uri, headers=self.headers)  # 5 tombstones.
+        self.utcnow.return_value = datetime.datetime.now(
+            datetime.timezone.utc
+        ) + datetime.timedelta(days=22)
+        storage = self.app.app.registry.storage
+
+        with mock.patch.object(
+            storage, "purge_deleted", wraps=storage.purge_deleted
+        ) as mocked:
+            assert scripts.purge_old_tombstones(self.env, batch_size=2) == 0
+
+        assert self.count_tombstones("certificates") == 0
+        certificates_calls = [
+            c
+            for c in mocked.call_args_list
+            if c.kwargs["parent_id"].endswith("/certificates")
+        ]
+        assert len(certificates_calls) == 3
+
+    def test_tombstones_are_kept_if_old_since_are_not_redirected(self):
+        self.app.app.registry.settings["changes.since_max_age_days"] = "-1"
+        self.addCleanup(
+            self.app.app.registry.settings.__setitem__,
+            "changes.since_max_age_days",
+            "21",
+        )
+        self.utcnow.return_value = datetime.datetime.now(
+            datetime.timezone.utc
+        ) + datetime.timedelta(days=365)
+
+        assert scripts.purge_old_tombstones(self.env) == 1
+
+        assert self.count_tombstones("certificates") == 1
@@ -1,12 +1,13 @@
 import configparser
 import os
+from unittest import mock
 
 from kinto import main as kinto_main
 from kinto.core.testing import BaseWebTest as CoreWebTest
 from kinto.core.testing import DummyRequest, get_user_headers
 
 
-__all__ = ["BaseWebTest", "DummyRequest", "get_user_headers"]
+__all__ = ["BaseWebTest", "DummyRequest", "get_user_headers", "patch_autograph"]
 
 
 here = os.path.abspath(os.path.dirname(__file__))
@@ -29,3 +30,21 @@ class BaseWebTest(CoreWebTest):
         settings = dict(config.items("app:main"))
         settings["signer.to_review_enabled"] = False
         return settings
+
+
+def patch_autograph(testcase, make_signature=None):
+    """Patch the requests sent to Autograph, that return the signatures obtained
+    with ``make_signature()`` (one per input of the batch).
+    """
+    patch = mock.patch(
+        "kinto_remote_settings.signer.backends.autograph.requests.Session.post"
+    )
+    testcase.addCleanup(patch.stop)
+    mocked = patch.start()
+    if make_signature is not None:
+
+        def fake_post(url, auth, json):
+            return mock.MagicMock(json=lambda: [make_signature() for _ in json])
+
+        mocked.side_effect = fake_post
+    return mocked
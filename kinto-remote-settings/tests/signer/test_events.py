@@ -1,3 +1,4 @@
+import json
 import os
 import unittest
 from typing import ClassVar
@@ -498,6 +499,10 @@ class SignoffEventsTest(BaseWebTest, unittest.TestCase):
         assert isinstance(self.events[-1], signer_events.ReviewApproved)
         assert self.events[-1].changes_count == 2
         assert self.events[-1].changes_size_bytes == 216
+        # Subscribers receive a plain resource (eg. can be serialized).
+        assert json.loads(json.dumps(self.events[-1].resource)) == (
+            self.events[-1].resource
+        )
 
     def test_changes_count_is_zero_when_no_changes(self):
         self.app.delete(
@@ -548,3 +553,64 @@ class SignoffEventsTest(BaseWebTest, unittest.TestCase):
     def test_database_changes_in_subscribers_are_committed(self):
         count = self.storage.count_all(resource_name="custom", parent_id="")
         assert count == 1
+
+
+class PublicationsTrackingTest(BaseWebTest, unittest.TestCase):
+    source_collection = "/buckets/alice/collections/scid"
+
+    @classmethod
+    def get_app_settings(cls, extras=None):
+        settings = super().get_app_settings(extras)
+        settings["kinto.signer.resources"] = (
+            "/buckets/alice/collections/scid -> /buckets/destination/collections/dcid"
+        )
+        settings["kinto.signer.signer_backend"] = (
+            "kinto_remote_settings.signer.backends.local_ecdsa"
+        )
+        settings["signer.ecdsa.private_key"] = os.path.join(here, "ecdsa.private.pem")
+        settings["kinto.changes.resources"] = "/buckets/destination"
+        settings["destination.record_cache_adaptive_expires"] = "true"
+        return settings
+
+    def setUp(self):
+        super().setUp()
+        self.cache = self.app.app.registry.cache
+        self.cache.flush()
+        self.app.put_json("/buckets/alice", headers=self.headers)
+        self.app.put_json(self.source_collection, headers=self.headers)
+        for rid in ("a", "b"):
+            self.app.put_json(
+                f"{self.source_collection}/records/{rid}",
+                {"data": {"title": rid}},
+                headers=self.headers,
+            )
+        self.sign()
+
+    def tearDown(self):
+        super().tearDown()
+        self.cache.flush()
+
+    def sign(self):
+        self.app.patch_json(
+            self.source_collection,
+            {"data": {"status": "to-sign"}},
+            headers=self.headers,
+        )
+
+    def test_one_publication_is_tracked_per_approval(self):
+        self.app.put_json(
+            f"{self.source_collection}/records/a",
+            {"data": {"title": "updated"}},
+            headers=self.headers,
+        )
+        self.app.delete(f"{self.source_collection}/records/b", headers=self.headers)
+        self.app.put_json(
+            f"{self.source_collection}/records/c",
+            {"data": {"title": "c"}},
+            headers=self.headers,
+        )
+
+        self.sign()
+
+        history = self.cache.get("publications/destination/dcid")
+        assert len(history) == 2
@@ -0,0 +1,247 @@
+import os
+import unittest
+from unittest import mock
+
+from kinto_remote_settings.signer import events as signer_events
+from kinto_remote_settings.signer import jobs
+
+from .support import BaseWebTest, get_user_headers
+
+
+here = os.path.abspath(os.path.dirname(__file__))
+
+
+class AsyncSigningTest(BaseWebTest, unittest.TestCase):
+    source_collection = "/buckets/alice/collections/scid"
+    destination_collection = "/buckets/alice/collections/dcid"
+
+    @classmethod
+    def get_app_settings(cls, extras=None):
+        settings = super().get_app_settings(extras)
+        settings["signer.async_signing_enabled"] = "true"
+        settings["kinto.signer.resources"] = "%s -> %s" % (
+            cls.source_collection,
+            cls.destination_collection,
+        )
+        settings["kinto.signer.signer_backend"] = (
+            "kinto_remote_settings.signer.backends.local_ecdsa"
+        )
+        settings["signer.ecdsa.private_key"] = os.path.join(here, "ecdsa.private.pem")
+        return settings
+
+    def setUp(self):
+        super().setUp()
+        self.worker = self.app.app.registry.signing_worker
+        self.headers = get_user_headers("tarte:en-pion")
+        resp = self.app.get("/", headers=self.headers)
+        self.userid = resp.json["user"]["id"]
+
+        self.app.put_json(
+            "/buckets/alice",
+            {"permissions": {"write": ["system.Authenticated"]}},
+            headers=self.headers,
+        )
+        self.app.put_json(self.source_collection, headers=self.headers)
+        self.app.post_json(
+            self.source_collection + "/records",
+            {"data": {"id": "hello", "title": "hello"}},
+            headers=self.headers,
+        )
+
+    def request_signature(self):
+        return self.app.patch_json(
+            self.source_collection,
+            {"data": {"status": "to-sign"}},
+            headers=self.headers,
+        )
+
+    def test_collection_is_being_signed_when_request_returns(self):
+        with mock.patch.object(self.worker, "enqueue"):
+            self.request_signature()
+
+        resp = self.app.get(self.source_collection, headers=self.headers)
+        assert resp.json["data"]["status"] == "signing"
+        resp = self.app.get(self.destination_collection + "/records")
+        assert resp.json["data"] == []
+
+    def test_collection_is_signed_by_the_worker(self):
+        self.request_signature()
+        self.worker.wait()
+
+        resp = self.app.get(self.source_collection, headers=self.headers)
+        assert resp.json["data"]["status"] == "signed"
+        assert resp.json["data"]["last_review_by"] == self.userid
+        resp = self.app.get(self.destination_collection)
+        assert resp.json["data"]["signature"]["signature"]
+        resp = self.app.get(self.destination_collection + "/records")
+        assert [r["id"] for r in resp.json["data"]] == ["hello"]
+
+    def test_review_approved_event_is_sent_once_signed(self):
+        registry = self.app.app.registry
+        with mock.patch.object(registry, "notify", wraps=registry.notify) as mocked:
+            self.request_signature()
+            self.worker.wait()
+
+        (approved,) = [
+            call.args[0]
+            for call in mocked.call_args_list
+            if isinstance(call.args[0], signer_events.ReviewApproved)
+        ]
+        assert approved.changes_count == 1
+        assert approved.payload["user_id"] == self.userid
+        assert approved.payload["collection_id"] == "scid"
+
+    def test_job_status_can_be_polled(self):
+        self.app.get(
+            self.source_collection + "/signing-job", headers=self.headers, status=404
+        )
+        with mock.patch.object(self.worker, "enqueue"):
+            self.request_signature()
+
+        resp = self.app.get(
+            self.source_collection + "/signing-job", headers=self.headers
+        )
+        assert resp.json["data"]["status"] == "pending"
+        assert resp.json["data"]["user_id"] == self.userid
+
+        self.worker.process(self.source_collection)
+        resp = self.app.get(
+            self.source_collection + "/signing-job", headers=self.headers
+        )
+        assert resp.json["data"]["status"] == "done"
+
+    def test_records_cannot_be_changed_while_signing(self):
+        with mock.patch.object(self.worker, "enqueue"):
+            self.request_signature()
+
+        resp = self.app.post_json(
+            self.source_collection + "/records",
+            {"data": {"title": "bonjour"}},
+            headers=self.headers,
+            status=400,
+        )
+        assert resp.json["message"] == "Signature in progress"
+
+    def test_status_cannot_be_changed_while_signing(self):
+        with mock.patch.object(self.worker, "enqueue"):
+            self.request_signature()
+
+        resp = self.app.patch_json(
+            self.source_collection,
+            {"data": {"status": "to-rollback"}},
+            headers=self.headers,
+            status=400,
+        )
+        assert resp.json["message"] == "Signature in progress"
+
+    def test_status_is_restored_if_signature_fails(self):
+        signer = self.app.app.registry.signers[self.source_collection]
+        with mock.patch.object(signer, "sign_many", side_effect=ValueError("Boom")):
+            self.request_signature()
+            self.worker.wait()
+
+        resp = self.app.get(self.source_collection, headers=self.headers)
+        assert resp.json["data"]["status"] == "work-in-progress"
+        resp = self.app.get(
+            self.source_collection + "/signing-job", headers=self.headers
+        )
+        assert resp.json["data"]["status"] == "failed"
+        # Details are only logged.
+        assert resp.json["data"]["error"] == "Signature failed"
+
+    def test_job_is_not_recreated_if_collection_was_deleted(self):
+        with mock.patch.object(self.worker, "enqueue"):
+            self.request_signature()
+        storage = self.app.app.registry.storage
+
+        def delete_collection(*args, **kwargs):
+            # Like a DELETE of the collection during the signature.
+            storage.delete(
+                resource_name="collection",
+                parent_id="/buckets/alice",
+                object_id="scid",
+            )
+            storage.delete_all(
+                resource_name="signer-job", parent_id=self.source_collection
+            )
+            raise ValueError("Boom")
+
+        with mock.patch.object(self.worker, "_sign", side_effect=delete_collection):
+            self.worker.process(self.source_collection)
+
+        jobs_left = storage.list_all(
+            resource_name="signer-job", parent_id=self.source_collection
+        )
+        assert jobs_left == []
+
+    def test_pending_jobs_are_resumed(self):
+        with mock.patch.object(self.worker, "enqueue"):
+            self.request_signature()
+
+        self.worker.resume()
+        self.worker.wait()
+
+        resp = self.app.get(self.source_collection, headers=self.headers)
+        assert resp.json["data"]["status"] == "signed"
+
+    def test_jobs_are_processed_once(self):
+        self.request_signature()
+        self.worker.wait()
+
+        with mock.patch.object(jobs.LocalUpdater, "sign_and_update_destinations") as m:
+            self.worker.process(self.source_collection)
+        assert not m.called
+
+    def test_jobs_are_claimed_once(self):
+        with mock.patch.object(self.worker, "enqueue"):
+            self.request_signature()
+
+        job = self.worker.claim(self.source_collection)
+        assert job["status"] == "running"
+        assert self.worker.claim(self.source_collection) is None
+
+    def test_claimed_jobs_are_not_processed_again(self):
+        with mock.patch.object(self.worker, "enqueue"):
+            self.request_signature()
+        self.worker.claim(self.source_collection)
+
+        with mock.patch.object(jobs.LocalUpdater, "sign_and_update_destinations") as m:
+            self.worker.process(self.source_collection)
+        assert not m.called
+
+    def test_stalled_running_jobs_are_resumed(self):
+        with mock.patch.object(self.worker, "enqueue"):
+            self.request_signature()
+        self.worker.claim(self.source_collection)
+        settings = self.app.app.registry.settings
+
+        self.worker.resume()
+        self.worker.wait()
+        job = self.worker.get_job(self.source_collection)
+        assert job["status"] == "running"
+
+        with mock.patch.dict(settings, {"signer.async_signing_timeout_seconds": -1}):
+            self.worker.resume()
+            self.worker.wait()
+
+        resp = self.app.get(self.source_collection, headers=self.headers)
+        assert resp.json["data"]["status"] == "signed"
+
+    def test_job_is_deleted_with_the_collection(self):
+        self.request_signature()
+        self.worker.wait()
+
+        self.app.delete(self.source_collection, headers=self.headers)
+
+        assert self.worker.get_job(self.source_collection) is None
+
+
+class SyncSigningTest(BaseWebTest, unittest.TestCase):
+    def test_job_status_endpoint_is_disabled(self):
+        self.app.put_json("/buckets/alice", headers=self.headers)
+        self.app.put_json("/buckets/alice/collections/other", headers=self.headers)
+        self.app.get(
+            "/buckets/alice/collections/other/signing-job",
+            headers=self.headers,
+            status=404,
+        )
@@ -4,16 +4,23 @@ import unittest
 import uuid
 from unittest import mock
 
+import pytest
 from kinto import main as kinto_main
 from kinto.core.events import ResourceChanged
 from kinto_remote_settings import __version__
-from kinto_remote_settings.signer import includeme, utils
+from kinto_remote_settings.signer import backends, includeme, utils
+from kinto_remote_settings.signer.backends import Heartbeat
 from kinto_remote_settings.signer.backends.autograph import AutographSigner
-from kinto_remote_settings.signer.listeners import sign_collection_data
+from kinto_remote_settings.signer.listeners import (
+    ResourcesIndex,
+    pick_resource_and_signer,
+    sign_collection_data,
+)
 from pyramid import testing
+from pyramid.exceptions import ConfigurationError
 from requests import exceptions as requests_exceptions
 
-from .support import BaseWebTest, get_user_headers
+from .support import BaseWebTest, get_user_headers, patch_autograph
 
 
 class HelloViewTest(BaseWebTest, unittest.TestCase):
@@ -89,13 +96,9 @@ class HeartbeatTest(BaseWebTest, unittest.TestCase):
         return settings
 
     def setUp(self):
-        req_patch = mock.patch(
-            "kinto_remote_settings.signer.backends.autograph.requests"
-        )
-        self.request_mock = req_patch.start()
-        self.addCleanup(req_patch.stop)
+        self.post_mock = patch_autograph(self)
         self.signature = {"signature": "", "x5u": "", "mode": "", "ref": "abc"}
-        self.request_mock.post.return_value.json.return_value = [self.signature]
+        self.post_mock.return_value.json.return_value = [self.signature]
 
         fetch_cert_patch = mock.patch(
             "kinto_remote_settings.signer.backends.autograph.fetch_cert"
@@ -112,14 +115,14 @@ class HeartbeatTest(BaseWebTest, unittest.TestCase):
         assert "signer" in resp.json
 
     def test_heartbeat_fails_if_unreachable(self):
-        self.request_mock.post.side_effect = requests_exceptions.ConnectTimeout()
+        self.post_mock.side_effect = requests_exceptions.ConnectTimeout()
         resp = self.app.get("/__heartbeat__", status=503)
         assert resp.json["signer"] is False
 
     def test_heartbeat_fails_if_missing_attributes(self):
         invalid = self.signature.copy()
         invalid.pop("signature")
-        self.request_mock.post.return_value.json.return_value = [invalid]
+        self.post_mock.return_value.json.return_value = [invalid]
         resp = self.app.get("/__heartbeat__", status=503)
         assert resp.json["signer"] is False
 
@@ -173,6 +176,64 @@ class HeartbeatTest(BaseWebTest, unittest.TestCase):
         resp = self.app.get("/__heartbeat__", status=200)
         assert resp.json["signer"] is True
 
+    def test_heartbeat_checks_signers_with_same_configuration_once(self):
+        signers = self.app.app.registry.signers
+        assert len(signers) > 1
+
+        self.app.get("/__heartbeat__")
+
+        assert self.post_mock.call_count == 1
+        assert self.fetch_cert_mock.call_count == 1
+
+
+class HeartbeatCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.signer = mock.MagicMock()
+        self.request = mock.MagicMock()
+        self.request.registry.signers = {"a": self.signer, "b": self.signer}
+
+    def test_results_are_not_kept_by_default(self):
+        heartbeat = Heartbeat()
+        assert heartbeat(self.request)
+        self.signer.sign.side_effect = ValueError
+        assert not heartbeat(self.request)
+        assert self.signer.sign.call_count == 2
+
+    def test_results_are_kept_during_ttl(self):
+        heartbeat = Heartbeat(ttl=60)
+        with mock.patch.object(heartbeat, "_start_refresher"):
+            assert heartbeat(self.request)
+            self.signer.sign.side_effect = ValueError
+            assert heartbeat(self.request)
+        assert self.signer.sign.call_count == 1
+
+    def test_results_are_checked_again_once_expired(self):
+        heartbeat = Heartbeat(ttl=60)
+        with mock.patch.object(heartbeat, "_start_refresher"):
+            assert heartbeat(self.request)
+            self.signer.sign.side_effect = ValueError
+            with mock.patch.object(backends.time, "monotonic", return_value=1e12):
+                assert not heartbeat(self.request)
+
+    def test_refresher_is_started_once(self):
+        heartbeat = Heartbeat(ttl=60)
+        with mock.patch.object(heartbeat, "_refresh_forever") as refresh_forever:
+            heartbeat(self.request)
+            heartbeat._thread.join()
+            heartbeat(self.request)
+            heartbeat._thread.join()
+        assert refresh_forever.call_count == 2  # Dead threads are restarted.
+        refresh_forever.assert_called_with(self.request.registry)
+
+    def test_refresh_checks_signers_again(self):
+        heartbeat = Heartbeat(ttl=60)
+        with mock.patch.object(heartbeat, "_start_refresher"):
+            assert heartbeat(self.request)
+            self.signer.sign.side_effect = ValueError
+            heartbeat.refresh(self.request.registry)
+            assert not heartbeat(self.request)
+        assert self.signer.sign.call_count == 2
+
 
 class IncludeMeTest(unittest.TestCase):
     def includeme(self, settings):
@@ -276,6 +337,44 @@ class IncludeMeTest(unittest.TestCase):
         assert signer2.server_url == "http://localhost"
         assert signer2.auth.credentials["id"] == "bob"
 
+    def test_fast_canonical_json_encoder_can_be_selected(self):
+        settings = {
+            "signer.resources": (
+                "/buckets/sb1/collections/sc1 -> /buckets/db1/collections/dc1"
+            ),
+            "signer.ecdsa.public_key": "/path/to/key",
+            "signer.ecdsa.private_key": "/path/to/private",
+            "signer.canonical_json_encoder": "fast",
+        }
+        config = self.includeme(settings)
+
+        assert config.registry.signer_serializer.encoder == "fast"
+
+    def test_unknown_canonical_json_encoder_is_rejected(self):
+        settings = {
+            "signer.resources": (
+                "/buckets/sb1/collections/sc1 -> /buckets/db1/collections/dc1"
+            ),
+            "signer.ecdsa.public_key": "/path/to/key",
+            "signer.ecdsa.private_key": "/path/to/private",
+            "signer.canonical_json_encoder": "fastest",
+        }
+        with pytest.raises(ConfigurationError):
+            self.includeme(settings)
+
+    def test_fast_canonical_json_encoder_forbids_floats(self):
+        settings = {
+            "signer.resources": (
+                "/buckets/sb1/collections/sc1 -> /buckets/db1/collections/dc1"
+            ),
+            "signer.ecdsa.public_key": "/path/to/key",
+            "signer.ecdsa.private_key": "/path/to/private",
+            "signer.allow_floats": "true",
+            "signer.canonical_json_encoder": "fast",
+        }
+        with pytest.raises(ConfigurationError):
+            self.includeme(settings)
+
     def test_a_metrics_timer_is_used_for_signature_if_configured(self):
         settings = {
             "statsd_url": "udp://127.0.0.1:8125",
@@ -329,7 +428,7 @@ class OnCollectionChangedTest(unittest.TestCase):
     def setUp(self):
         patch = mock.patch("kinto_remote_settings.signer.listeners.LocalUpdater")
         self.updater_mocked = patch.start()
-        self.updater_mocked.return_value.sign_and_update_destination.return_value = (
+        self.updater_mocked.return_value.sign_and_update_destinations.return_value = (
             123,
             456,
         )
@@ -352,7 +451,7 @@ class OnCollectionChangedTest(unittest.TestCase):
         sign_collection_data(
             evt, resources=utils.parse_resources("a/b -> c/d"), to_review_enabled=True
         )
-        assert not self.updater_mocked.sign_and_update_destination.called
+        assert not self.updater_mocked.sign_and_update_destinations.called
 
     def test_updater_is_called_when_resource_and_status_matches(self):
         evt = mock.MagicMock(
@@ -361,9 +460,14 @@ class OnCollectionChangedTest(unittest.TestCase):
         )
         evt.request.registry.storage = mock.sentinel.storage
         evt.request.registry.permission = mock.sentinel.permission
+        evt.request.registry.signer_serializer = mock.sentinel.serializer
         evt.request.registry.signers = {
             "/buckets/a/collections/b": mock.sentinel.signer
         }
+        evt.request.registry.settings = {
+            "signer.async_signing_enabled": "false",
+            "signer.incremental_diff_enabled": "true",
+        }
         evt.request.route_path.return_value = "/v1/buckets/a/collections/b"
         sign_collection_data(
             evt, resources=utils.parse_resources("a/b -> c/d"), to_review_enabled=True
@@ -374,10 +478,12 @@ class OnCollectionChangedTest(unittest.TestCase):
             permission=mock.sentinel.permission,
             source={"bucket": "a", "collection": "b"},
             destination={"bucket": "c", "collection": "d"},
+            incremental_diff=True,
+            serializer=mock.sentinel.serializer,
         )
 
         mocked = self.updater_mocked.return_value
-        assert mocked.sign_and_update_destination.called
+        assert mocked.sign_and_update_destinations.called
 
     def test_kinto_attachment_property_is_set_to_allow_metadata_updates(self):
         evt = mock.MagicMock(
@@ -405,23 +511,71 @@ class OnCollectionChangedTest(unittest.TestCase):
         )
 
 
+class PickResourceAndSignerTest(unittest.TestCase):
+    def setUp(self):
+        self.resources = utils.parse_resources(
+            "/buckets/a -> /buckets/b -> /buckets/c\n"
+            "/buckets/d/collections/e -> /buckets/f/collections/g"
+        )
+        self.request = mock.MagicMock()
+        self.request.registry.signers = {
+            "/buckets/a": mock.sentinel.bucket_signer,
+            "/buckets/d/collections/e": mock.sentinel.collection_signer,
+        }
+        self.request.registry.signer_resources_index = ResourcesIndex(
+            self.resources, self.request.registry.signers
+        )
+
+    def pick(self, bid, cid):
+        return pick_resource_and_signer(
+            self.request, self.resources, bucket_id=bid, collection_id=cid
+        )
+
+    def test_per_bucket_resources_are_resolved_for_the_collection(self):
+        resource, signer = self.pick("a", "cid")
+        assert resource["source"] == {"bucket": "a", "collection": "cid"}
+        assert resource["preview"] == {"bucket": "b", "collection": "cid"}
+        assert resource["destination"] == {"bucket": "c", "collection": "cid"}
+        assert signer is mock.sentinel.bucket_signer
+        # The configuration is left intact.
+        assert self.resources["/buckets/a"]["source"]["collection"] is None
+
+    def test_unconfigured_collections_are_resolved_to_none(self):
+        assert self.pick("d", "other") == (None, None)
+
+    def test_resolved_resources_are_cached_plain_dicts(self):
+        resource, signer = self.pick("d", "e")
+        assert self.pick("d", "e")[0] is resource
+        assert signer is mock.sentinel.collection_signer
+        assert type(resource) is dict
+        assert type(resource["source"]) is dict
+        # Copied from the configuration.
+        assert resource == self.resources["/buckets/d/collections/e"]
+        assert resource is not self.resources["/buckets/d/collections/e"]
+
+    def test_index_of_the_loaded_configuration_is_used(self):
+        self.request.registry.signer_resources_index = ResourcesIndex(
+            self.resources, {"/buckets/a": mock.sentinel.new_signer}
+        )
+        _, signer = self.pick("a", "cid")
+        assert signer is mock.sentinel.new_signer
+
+
 class PatchAutographMixin:
     def setUp(self):
         super().setUp()
         # Patch calls to Autograph.
-        patch = mock.patch("kinto_remote_settings.signer.backends.autograph.requests")
-        mocked = patch.start()
-        self.addCleanup(patch.stop)
-        mocked.post.return_value.json.side_effect = lambda: [
-            {
+        patch_autograph(
+            self,
+            lambda: {
                 "signature": uuid.uuid4().hex,
                 "hash_algorithm": "",
                 "signature_encoding": "",
                 "content-signature": "",
                 "x5u": "",
                 "ref": "",
-            }
-        ]
+            },
+        )
 
 
 class BatchTest(BaseWebTest, PatchAutographMixin, unittest.TestCase):
@@ -529,9 +683,7 @@ class RecordChangedTest(BaseWebTest, unittest.TestCase):
         super().setUp()
         self.headers = get_user_headers("me")
 
-        patch = mock.patch("kinto_remote_settings.signer.backends.autograph.requests")
-        self.mock = patch.start()
-        self.addCleanup(patch.stop)
+        patch_autograph(self, lambda: {"signature": "", "x5u": ""})
 
         self.collection_uri = "/buckets/alice/collections/source"
         self.records_uri = self.collection_uri + "/records"
@@ -822,3 +974,35 @@ class ExpandedSettingsTest(BaseWebTest, PatchAutographMixin, unittest.TestCase):
         assert "magic-(\\w+)" not in source_collections
         assert "evil-magic-word" not in source_collections
         assert "magic-word-evil" not in source_collections
+
+    def test_configuration_is_not_reloaded_if_no_glob_setting_matches(self):
+        signers = self.app.app.registry.signers
+
+        self.app.put_json(
+            "/buckets/main-workspace/collections/no-magic", headers=self.headers
+        )
+
+        assert self.app.app.registry.signers is signers
+
+    def test_signers_are_reused_when_glob_settings_match(self):
+        signers = dict(self.app.app.registry.signers)
+
+        self.app.put_json(
+            "/buckets/main-workspace/collections/magic-word", headers=self.headers
+        )
+
+        new_signers = self.app.app.registry.signers
+        assert new_signers is not signers
+        for key, signer in signers.items():
+            assert new_signers[key] is signer
+
+    def test_resources_index_is_replaced_with_signers(self):
+        registry = self.app.app.registry
+        index = registry.signer_resources_index
+
+        self.app.put_json(
+            "/buckets/main-workspace/collections/magic-word", headers=self.headers
+        )
+
+        assert registry.signer_resources_index is not index
+        assert registry.signer_resources_index.signers is registry.signers
@@ -1,6 +1,14 @@
 import json
+import random
+import string
 
-from kinto_remote_settings.signer.serializer import canonical_json
+import pytest
+from kinto_remote_settings.signer import serializer
+from kinto_remote_settings.signer.serializer import (
+    FragmentsCache,
+    Serializer,
+    canonical_json,
+)
 
 
 #
@@ -64,3 +72,131 @@ def test_preserves_data():
     ]
     serialized = canonical_json(records, "45678")
     assert records == json.loads(serialized)["data"]
+
+
+#
+# Fragments cache
+#
+
+
+def random_string(rnd):
+    alphabet = string.printable + "éü€\u2028\U0001f600\x00\x1f"
+    return "".join(rnd.choice(alphabet) for _ in range(rnd.randint(0, 12)))
+
+
+def random_value(rnd, depth=0):
+    kinds = ["str", "int", "bool", "null"] + (["list", "dict"] if depth < 3 else [])
+    kind = rnd.choice(kinds)
+    if kind == "str":
+        return random_string(rnd)
+    if kind == "int":
+        return rnd.randint(-(2**53), 2**53)
+    if kind == "bool":
+        return rnd.choice([True, False])
+    if kind == "null":
+        return None
+    if kind == "list":
+        return [random_value(rnd, depth + 1) for _ in range(rnd.randint(0, 4))]
+    return {
+        random_string(rnd): random_value(rnd, depth + 1)
+        for _ in range(rnd.randint(0, 4))
+    }
+
+
+def random_record(rnd, record_id, last_modified):
+    record = {k: random_value(rnd) for k in rnd.sample(string.ascii_letters, 4)}
+    record.update(id=record_id, last_modified=last_modified)
+    if rnd.random() < 0.1:
+        record["deleted"] = True
+    return record
+
+
+@pytest.fixture
+def cached_serializer():
+    return Serializer(cache_max_bytes=1024 * 1024)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_cached_serialization_is_identical(seed, cached_serializer):
+    rnd = random.Random(seed)
+    timestamp = 1000
+    records = {}
+    for _ in range(5):
+        # Create, update or delete some records between signatures.
+        for _ in range(rnd.randint(1, 30)):
+            timestamp += 1
+            record_id = str(rnd.randint(0, 40))
+            records[record_id] = random_record(rnd, record_id, timestamp)
+        collection = list(records.values())
+        rnd.shuffle(collection)
+
+        cached = cached_serializer.canonical_json(
+            collection, timestamp, cache_scope="/buckets/b/c"
+        )
+
+        assert cached == canonical_json(collection, timestamp)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_fast_encoder_is_identical_to_canonicaljson(seed):
+    rnd = random.Random(seed)
+    records = [random_record(rnd, str(i), i) for i in range(20)]
+    expected = canonical_json(records, 42)
+
+    fast = Serializer(encoder="fast")
+
+    assert fast.canonical_json(records, 42) == expected
+    assert fast.dumps(records) == serializer.canonicaljson.dumps(records)
+
+
+@pytest.mark.parametrize("value", [2**64, -(2**63) - 1, {"a": [2**64]}])
+def test_fast_encoder_rejects_out_of_range_integers(value):
+    with pytest.raises(TypeError):
+        serializer.canonicaljson.dumps(value)
+    with pytest.raises(TypeError):
+        Serializer(encoder="fast").dumps(value)
+
+
+@pytest.mark.parametrize("value", [chr(0xD800), {"a": ["é" + chr(0xDC00)]}])
+def test_fast_encoder_rejects_lone_surrogates(value):
+    with pytest.raises(TypeError):
+        serializer.canonicaljson.dumps(value)
+    with pytest.raises(TypeError):
+        Serializer(encoder="fast").dumps(value)
+
+
+def test_fast_encoder_rejects_lone_surrogates_in_keys():
+    # ``canonicaljson`` replaces them, which cannot be reproduced.
+    with pytest.raises(TypeError):
+        Serializer(encoder="fast").dumps({chr(0xD83D): 1})
+
+
+def test_fast_encoder_accepts_integers_bounds():
+    fast = Serializer(encoder="fast")
+    for value in (2**64 - 1, -(2**63)):
+        assert fast.dumps(value) == serializer.canonicaljson.dumps(value)
+
+
+def test_only_new_records_are_encoded(cached_serializer, monkeypatch):
+    records = [{"id": str(i), "last_modified": i} for i in range(3)]
+    cached_serializer.canonical_json(records, 3, cache_scope="/buckets/b/c")
+
+    encoded = []
+    dumps = serializer.canonicaljson.dumps
+    monkeypatch.setattr(
+        serializer.canonicaljson, "dumps", lambda v: encoded.append(v) or dumps(v)
+    )
+    records[1] = {"id": "1", "last_modified": 4, "foo": "bar"}
+    cached_serializer.canonical_json(records, 4, cache_scope="/buckets/b/c")
+
+    assert encoded == [records[1], "4"]
+
+
+def test_fragments_cache_is_bounded():
+    cache = FragmentsCache(max_bytes=60)
+    for i in range(10):
+        cache.encode("scope", {"id": str(i), "last_modified": i})
+
+    # Each fragment is 28 bytes long, only the last two are kept.
+    assert list(cache._fragments) == [("scope", "8", 8), ("scope", "9", 9)]
+    assert cache._size == 56
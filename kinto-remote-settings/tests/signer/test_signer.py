@@ -9,6 +9,7 @@ from kinto_remote_settings.signer.backends import (
     autograph,
     base,
     exceptions,
+    local_cryptography,
     local_ecdsa,
 )
 
@@ -33,6 +34,14 @@ class BaseSignerTest(unittest.TestCase):
         with pytest.raises(NotImplementedError):
             signer.sign("TEST")
 
+    def test_heartbeat_key_is_unique_per_instance(self):
+        assert base.SignerBase().heartbeat_key() != base.SignerBase().heartbeat_key()
+
+    def test_sign_many_signs_each_payload(self):
+        signer = base.SignerBase()
+        with mock.patch.object(signer, "sign", side_effect=lambda p: [{"p": p}]):
+            assert signer.sign_many(["a", "b"]) == [[{"p": "a"}], [{"p": "b"}]]
+
 
 class ECDSASignerTest(unittest.TestCase):
     @classmethod
@@ -128,12 +137,75 @@ class ECDSASignerTest(unittest.TestCase):
         assert str(excinfo.value) == msg
 
 
+class ECDSAKeysCacheTest(unittest.TestCase):
+    def setUp(self):
+        sk, _ = local_ecdsa.ECDSASigner.generate_keypair()
+        self.sk_location = save_key(sk, "signing-key")
+        self.addCleanup(os.remove, self.sk_location)
+        self.signer = local_ecdsa.ECDSASigner(private_key=self.sk_location)
+
+    def test_keys_are_parsed_once(self):
+        key = self.signer.load_private_key()
+
+        with mock.patch.object(local_ecdsa.SigningKey, "from_pem") as mocked:
+            self.signer.sign("this is some text")
+            assert self.signer.load_private_key() is key
+
+        assert not mocked.called
+
+    def test_keys_are_reloaded_if_file_is_modified(self):
+        signatures = self.signer.sign("this is some text")
+
+        new_sk, new_vk = local_ecdsa.ECDSASigner.generate_keypair()
+        with open(self.sk_location, "wb") as key_file:
+            key_file.write(new_sk)
+        stat = os.stat(self.sk_location)
+        os.utime(self.sk_location, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000))
+
+        with pytest.raises(exceptions.BadSignatureError):
+            self.signer.verify("this is some text", signatures[0])
+        new_signatures = self.signer.sign("this is some text")
+        vk_location = save_key(new_vk, "verifying-key")
+        self.addCleanup(os.remove, vk_location)
+        verifier = local_ecdsa.ECDSASigner(public_key=vk_location)
+        verifier.verify("this is some text", new_signatures[0])
+
+
+class CryptographyECDSASignerTest(ECDSASignerTest):
+    @classmethod
+    def get_backend(cls, **options):
+        return local_cryptography.ECDSASigner(**options)
+
+    def test_signatures_are_compatible_with_ecdsa_backend(self):
+        ecdsa_signer = local_ecdsa.ECDSASigner(public_key=self.vk_location)
+
+        signature = self.signer.sign("this is some text")[0]
+        ecdsa_signer.verify("this is some text", signature)
+
+        ecdsa_signer = local_ecdsa.ECDSASigner(private_key=self.sk_location)
+        signature = ecdsa_signer.sign("this is some text")[0]
+        self.signer.verify("this is some text", signature)
+
+    def test_load_from_settings_returns_cryptography_signer(self):
+        signer = local_cryptography.load_from_settings(
+            {"settings_prefix": "kinto", "signer.ecdsa.private_key": self.sk_location},
+            prefixes=["signer."],
+        )
+
+        assert isinstance(signer, local_cryptography.ECDSASigner)
+        assert signer.private_key == self.sk_location
+
+
 class AutographSignerTest(unittest.TestCase):
-    @mock.patch("kinto_remote_settings.signer.backends.autograph.requests")
-    def test_request_is_being_crafted_with_payload_as_input(self, requests):
+    def setUp(self):
+        patch = mock.patch("kinto_remote_settings.signer.backends.autograph.requests")
+        self.addCleanup(patch.stop)
+        self.session = patch.start().Session.return_value
+
+    def test_request_is_being_crafted_with_payload_as_input(self):
         response = mock.MagicMock()
         response.json.return_value = [{"signature": SIGNATURE, "x5u": "", "ref": ""}]
-        requests.post.return_value = response
+        self.session.post.return_value = response
 
         signer = autograph.AutographSigner(
             hawk_id="alice",
@@ -142,7 +214,7 @@ class AutographSignerTest(unittest.TestCase):
             keyids=["remote-settings"],
         )
         signature_bundles = signer.sign("test data")
-        requests.post.assert_called_with(
+        self.session.post.assert_called_with(
             "http://localhost:8000/sign/data",
             auth=signer.auth,
             json=[
@@ -154,14 +226,25 @@ class AutographSignerTest(unittest.TestCase):
         )
         assert signature_bundles[0]["signature"] == SIGNATURE
 
-    @mock.patch("kinto_remote_settings.signer.backends.autograph.requests")
-    def test_one_request_per_key_id_is_issued(self, requests):
-        requests.post.side_effect = [
-            mock.MagicMock(
-                json=lambda i=i: [
-                    {"signature": f"sign-{i}", "x5u": f"x5u-{i}", "ref": f"ref-{i}"}
-                ]
+    def test_heartbeat_key_depends_on_configuration(self):
+        def build(**options):
+            return autograph.AutographSigner(
+                **{
+                    "hawk_id": "alice",
+                    "hawk_secret": "secret",
+                    "server_url": "http://localhost:8000",
+                    "keyids": ["remote-settings"],
+                    **options,
+                }
             )
+
+        assert build().heartbeat_key() == build().heartbeat_key()
+        assert build().heartbeat_key() != build(hawk_id="bob").heartbeat_key()
+        assert build().heartbeat_key() != build(keyids=["other"]).heartbeat_key()
+
+    def test_all_key_ids_are_sent_in_one_request(self):
+        self.session.post.return_value.json.return_value = [
+            {"signature": f"sign-{i}", "x5u": f"x5u-{i}", "ref": f"ref-{i}"}
             for i in range(3)
         ]
         signer = autograph.AutographSigner(
@@ -173,24 +256,72 @@ class AutographSignerTest(unittest.TestCase):
 
         signatures = signer.sign("test data")
 
-        print(requests.post.call_args_list)
         assert len(signatures) == 3
         for i in range(3):
             assert signatures[i]["signature"] == f"sign-{i}"
             assert signatures[i]["x5u"] == f"x5u-{i}"
             assert signatures[i]["ref"] == f"ref-{i}"
+        self.session.post.assert_called_once_with(
+            "http://localhost:8000/sign/data",
+            auth=signer.auth,
+            json=[{"input": "dGVzdCBkYXRh", "keyid": f"key{i + 1}"} for i in range(3)],
+        )
+
+    def test_several_payloads_are_signed_in_one_request(self):
+        self.session.post.return_value.json.return_value = [
+            {"signature": f"sign-{i}", "x5u": f"x5u-{i}"} for i in range(4)
+        ]
+        signer = autograph.AutographSigner(
+            hawk_id="alice",
+            hawk_secret="fs5wgcer9",  # pragma: allowlist secret
+            server_url="http://localhost:8000",
+            keyids=["key1", "key2"],
+        )
 
-            requests.post.assert_any_call(
-                "http://localhost:8000/sign/data",
-                auth=signer.auth,
-                json=[
-                    {
-                        "input": "dGVzdCBkYXRh",
-                        "keyid": f"key{i + 1}",
-                    }
-                ],
+        signatures = signer.sign_many([b"preview", b"main"])
+
+        assert [[s["signature"] for s in sigs] for sigs in signatures] == [
+            ["sign-0", "sign-1"],
+            ["sign-2", "sign-3"],
+        ]
+        self.session.post.assert_called_once_with(
+            "http://localhost:8000/sign/data",
+            auth=signer.auth,
+            json=[
+                {"input": "cHJldmlldw==", "keyid": "key1"},
+                {"input": "cHJldmlldw==", "keyid": "key2"},
+                {"input": "bWFpbg==", "keyid": "key1"},
+                {"input": "bWFpbg==", "keyid": "key2"},
+            ],
+        )
+
+    def test_raises_if_signatures_are_missing(self):
+        self.session.post.return_value.json.return_value = [
+            {"signature": "sign", "x5u": "x5u"}
+        ]
+        signer = autograph.AutographSigner(
+            hawk_id="alice",
+            hawk_secret="fs5wgcer9",  # pragma: allowlist secret
+            server_url="http://localhost:8000",
+            keyids=["key1", "key2"],
+        )
+
+        with pytest.raises(ValueError, match="Unexpected number of signatures"):
+            signer.sign("test data")
+
+    def test_connections_are_pooled(self):
+        with mock.patch.object(autograph, "HTTPAdapter") as adapter:
+            signer = autograph.AutographSigner(
+                hawk_id="alice",
+                hawk_secret="fs5wgcer9",  # pragma: allowlist secret
+                server_url="https://autograph",
+                keyids=["key1"],
+                pool_maxsize=25,
             )
 
+        adapter.assert_called_with(pool_connections=1, pool_maxsize=25)
+        signer.session.mount.assert_any_call("https://", adapter.return_value)
+
     @mock.patch("kinto_remote_settings.signer.backends.autograph.AutographSigner")
     def test_load_from_settings(self, mocked_signer):
         autograph.load_from_settings(
@@ -208,4 +339,5 @@ class AutographSignerTest(unittest.TestCase):
             hawk_id=mock.sentinel.hawk_id,
             hawk_secret=mock.sentinel.hawk_secret,
             keyids=["remote-settings"],
+            pool_maxsize=10,
         )
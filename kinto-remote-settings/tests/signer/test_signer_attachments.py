@@ -2,9 +2,8 @@ import random
 import re
 import string
 import unittest
-from unittest import mock
 
-from .support import BaseWebTest, get_user_headers
+from .support import BaseWebTest, get_user_headers, patch_autograph
 
 
 RE_ISO8601 = re.compile(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\.\d{6}\+00:00")
@@ -13,25 +12,20 @@ RE_ISO8601 = re.compile(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\.\d{6}\+00:00")
 class SignerAttachmentsTest(BaseWebTest, unittest.TestCase):
     def setUp(self):
         super().setUp()
-        # Patch calls to Autograph.
-        patch = mock.patch("kinto_remote_settings.signer.backends.autograph.requests")
-        self.addCleanup(patch.stop)
-        self.mocked_autograph = patch.start()
 
+        # Patch calls to Autograph.
         def fake_sign():
             fake_signature = "".join(random.sample(string.ascii_lowercase, 10))
-            return [
-                {
-                    "signature": "",
-                    "hash_algorithm": "",
-                    "signature_encoding": "",
-                    "content-signature": fake_signature,
-                    "x5u": "",
-                    "ref": "",
-                }
-            ]
-
-        self.mocked_autograph.post.return_value.json.side_effect = fake_sign
+            return {
+                "signature": "",
+                "hash_algorithm": "",
+                "signature_encoding": "",
+                "content-signature": fake_signature,
+                "x5u": "",
+                "ref": "",
+            }
+
+        self.mocked_autograph = patch_autograph(self, fake_sign)
 
         self.headers = get_user_headers("tarte:en-pion")
         resp = self.app.get("/", headers=self.headers)
@@ -8,7 +8,7 @@ import pytest
 from kinto.core.errors import ERRORS
 from kinto.core.testing import FormattedErrorMixin
 
-from .support import BaseWebTest, get_user_headers
+from .support import BaseWebTest, get_user_headers, patch_autograph
 
 
 RE_ISO8601 = re.compile(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\.\d{6}\+00:00")
@@ -23,24 +23,19 @@ class PostgresWebTest(BaseWebTest):
 
     def setUp(self):
         super(PostgresWebTest, self).setUp()
-        # Patch calls to Autograph.
-        patch = mock.patch("kinto_remote_settings.signer.backends.autograph.requests")
-        self.addCleanup(patch.stop)
-        self.mocked_autograph = patch.start()
 
+        # Patch calls to Autograph.
         def fake_sign():
             fake_signature = "".join(random.sample(string.ascii_lowercase, 10))
-            return [
-                {
-                    "signature": fake_signature,
-                    "hash_algorithm": "",
-                    "signature_encoding": "",
-                    "x5u": "",
-                    "ref": "",
-                }
-            ]
+            return {
+                "signature": fake_signature,
+                "hash_algorithm": "",
+                "signature_encoding": "",
+                "x5u": "",
+                "ref": "",
+            }
 
-        self.mocked_autograph.post.return_value.json.side_effect = fake_sign
+        self.mocked_autograph = patch_autograph(self, fake_sign)
 
     @classmethod
     def get_app_settings(cls, extras=None):
@@ -422,7 +417,7 @@ class RefreshSignatureTest(SignoffWebTest, unittest.TestCase):
         assert resp.json["data"]["status"] == "signed"
 
     def test_if_resign_fails_signature_is_rolledback(self):
-        self.mocked_autograph.post.side_effect = ValueError("Boom!")
+        self.mocked_autograph.side_effect = ValueError("Boom!")
 
         self.app.patch_json(
             self.source_collection,
@@ -1447,14 +1442,14 @@ class PerBucketTest(SignoffWebTest, unittest.TestCase):
         )
 
     def test_signer_can_be_specified_per_collection(self):
-        self.mocked_autograph.post.reset_mock()
+        self.mocked_autograph.reset_mock()
         self.app.put_json(
             self.source_bucket + "/collections/specific",
             {"data": {"status": "to-sign"}},
             headers=self.headers,
         )
 
-        args, kwargs = self.mocked_autograph.post.call_args_list[0]
+        args, kwargs = self.mocked_autograph.call_args_list[0]
         assert args[0].startswith("http://localhost:8000")  # global.
         assert kwargs["auth"].credentials["id"] == "for-specific"
         assert (
@@ -3,7 +3,10 @@ import unittest
 from unittest import mock
 
 import pytest
+from kinto.core.events import ACTIONS
+from kinto.core.storage import memory
 from kinto.core.storage.exceptions import RecordNotFoundError
+from kinto_remote_settings.signer import updater as updater_module
 from kinto_remote_settings.signer.updater import LocalUpdater
 from kinto_remote_settings.signer.utils import STATUS
 
@@ -88,7 +91,13 @@ class LocalUpdaterTest(unittest.TestCase):
         }
 
     def test_push_records_removes_deleted_records(self):
-        self.patch(self.updater, "get_destination_records", return_value=([], 1324))
+        dest_records = [{"id": idx, "last_modified": 40} for idx in range(3, 5)]
+        self.patch(
+            self.updater, "get_destination_records", return_value=(dest_records, 1324)
+        )
+        self.storage.delete_all.return_value = [
+            {"id": idx, "deleted": True, "last_modified": 43} for idx in range(3, 5)
+        ]
         records = [
             {"id": idx, "foo": "bar %s" % idx, "last_modified": 42 - idx}
             for idx in range(0, 2)
@@ -100,7 +109,48 @@ class LocalUpdaterTest(unittest.TestCase):
         self.updater.push_records_to_destination(DummyRequest())
         assert self.updater.get_source_records.call_count == 1
         assert self.storage.update.call_count == 2
-        assert self.storage.delete.call_count == 2
+        # Deleted in one batch.
+        assert self.storage.delete_all.call_count == 1
+        (filtr,) = self.storage.delete_all.call_args[1]["filters"]
+        assert (filtr.field, filtr.value) == ("id", [3, 4])
+        assert self.storage.delete.call_count == 0
+
+    def test_push_records_does_not_fetch_previous_versions(self):
+        dest_records = [{"id": 1, "foo": "old", "last_modified": 40}]
+        self.patch(
+            self.updater, "get_destination_records", return_value=(dest_records, 1324)
+        )
+        records = [
+            {"id": idx, "foo": "bar %s" % idx, "last_modified": 42 - idx}
+            for idx in range(1, 3)
+        ]
+        self.patch(self.updater, "get_source_records", return_value=(records, 1325))
+        self.storage.update.side_effect = lambda obj, **kw: {**obj, "last_modified": 50}
+
+        with mock.patch.object(updater_module, "notify_records_events") as mocked:
+            self.updater.push_records_to_destination(DummyRequest())
+
+        assert self.storage.get.call_count == 0
+        assert self.storage.create.call_count == 0
+        assert self.storage.delete_all.call_count == 0
+        changes = mocked.call_args[1]["changes"]
+        assert [(action, old) for action, _, old in changes] == [
+            (ACTIONS.UPDATE, dest_records[0]),
+            (ACTIONS.CREATE, None),
+        ]
+
+    def test_push_records_are_pushed_in_batches(self):
+        self.patch(self.updater, "get_destination_records", return_value=([], 1324))
+        records = [{"id": idx, "last_modified": 42} for idx in range(5)]
+        self.patch(self.updater, "get_source_records", return_value=(records, 1325))
+
+        with mock.patch.object(updater_module, "PUSH_BATCH_SIZE", 2):
+            with mock.patch.object(
+                updater_module, "upsert_records", return_value=[]
+            ) as mocked:
+                self.updater.push_records_to_destination(DummyRequest())
+
+        assert [len(c[0][2]) for c in mocked.call_args_list] == [2, 2, 1]
 
     def test_push_records_skip_already_deleted_records(self):
         # In case the record doesn't exists in the destination
@@ -273,6 +323,7 @@ class LocalUpdaterTest(unittest.TestCase):
         self.patch(self.updater, "get_destination_records", return_value=([], "0"))
         self.patch(self.updater, "push_records_to_destination", return_value=(0, 0))
         self.patch(self.updater, "set_destination_signatures")
+        self.signer_instance.sign_many.return_value = [[mock.sentinel.signature]]
 
         self.updater.sign_and_update_destination(DummyRequest(), {"id": "source"})
 
@@ -280,6 +331,35 @@ class LocalUpdaterTest(unittest.TestCase):
         assert self.updater.push_records_to_destination.call_count == 1
         assert self.updater.set_destination_signatures.call_count == 1
 
+    def test_sign_and_update_destinations_signs_all_at_once(self):
+        self.patch(self.updater, "get_destination_records", return_value=([], 42))
+        self.patch(self.updater, "push_records_to_destination", return_value=(1, 2))
+        self.patch(self.updater, "set_destination_signatures")
+        self.signer_instance.sign_many.return_value = [
+            [mock.sentinel.preview_signature],
+            [mock.sentinel.signature],
+        ]
+        preview = {"bucket": "previewbucket", "collection": "destcollection"}
+        destination = {"bucket": "destbucket", "collection": "destcollection"}
+
+        result = self.updater.sign_and_update_destinations(
+            DummyRequest(), [preview, destination], {"id": "source"}
+        )
+
+        assert result == (1, 2)
+        assert self.updater.push_records_to_destination.call_count == 2
+        assert self.signer_instance.sign_many.call_count == 1
+        (payloads,) = self.signer_instance.sign_many.call_args[0]
+        assert len(payloads) == 2
+        signed = [
+            c[0][0] for c in self.updater.set_destination_signatures.call_args_list
+        ]
+        assert signed == [
+            [mock.sentinel.preview_signature],
+            [mock.sentinel.signature],
+        ]
+        assert self.updater.destination == destination
+
     def test_refresh_signature_does_not_push_records(self):
         self.storage.list_all.return_value = []
         self.patch(self.updater, "set_destination_signatures")
@@ -342,3 +422,107 @@ class LocalUpdaterTest(unittest.TestCase):
                 "signature": mock.sentinel.signature,
             },
         )
+
+
+class IncrementalDiffTest(unittest.TestCase):
+    source_uri = "/buckets/sourcebucket/collections/sourcecollection"
+    dest_uri = "/buckets/destbucket/collections/destcollection"
+
+    def setUp(self):
+        self.storage = memory.Storage()
+        self.updater = LocalUpdater(
+            source={"bucket": "sourcebucket", "collection": "sourcecollection"},
+            destination={"bucket": "destbucket", "collection": "destcollection"},
+            signer=mock.MagicMock(),
+            storage=self.storage,
+            permission=mock.MagicMock(),
+            incremental_diff=True,
+        )
+        patcher = mock.patch.object(updater_module, "notify_records_events")
+        self.addCleanup(patcher.stop)
+        patcher.start()
+
+        for i in range(5):
+            self.create_source_record({"id": f"r{i}", "value": i})
+        self.updater.push_records_to_destination(DummyRequest())
+
+    def create_source_record(self, obj):
+        return self.storage.create(
+            resource_name="record", parent_id=self.source_uri, obj=obj
+        )
+
+    def records(self, parent_id):
+        records = self.storage.list_all(resource_name="record", parent_id=parent_id)
+        return sorted(
+            ({k: v for k, v in r.items() if k != "last_modified"} for r in records),
+            key=lambda r: r["id"],
+        )
+
+    def push(self):
+        with mock.patch.object(
+            self.storage, "list_all", wraps=self.storage.list_all
+        ) as list_all:
+            changes_count, _ = self.updater.push_records_to_destination(DummyRequest())
+        assert self.records(self.source_uri) == self.records(self.dest_uri)
+        is_full = any(
+            c[1]["parent_id"] == self.source_uri and "filters" not in c[1]
+            for c in list_all.call_args_list
+        )
+        return changes_count, is_full
+
+    def test_only_changed_source_records_are_read(self):
+        self.storage.update(
+            resource_name="record",
+            parent_id=self.source_uri,
+            object_id="r1",
+            obj={"value": 42},
+        )
+        self.storage.delete(
+            resource_name="record", parent_id=self.source_uri, object_id="r2"
+        )
+        self.create_source_record({"id": "r5", "value": 5})
+
+        assert self.push() == (3, False)
+
+    def test_nothing_is_pushed_if_nothing_changed(self):
+        assert self.push() == (0, False)
+
+    def test_everything_is_compared_if_destination_was_modified(self):
+        self.storage.delete(
+            resource_name="record", parent_id=self.dest_uri, object_id="r0"
+        )
+
+        assert self.push() == (1, True)
+
+    def test_everything_is_compared_if_records_count_do_not_match(self):
+        # Created with a timestamp in the past.
+        self.create_source_record({"id": "r6", "value": 6, "last_modified": 1})
+
+        assert self.push() == (1, True)
+
+    def test_everything_is_compared_if_disabled(self):
+        self.updater.incremental_diff = False
+        self.create_source_record({"id": "r5", "value": 5})
+
+        assert self.push() == (1, True)
+
+    def test_rollback_only_reads_changed_source_records(self):
+        self.storage.update(
+            resource_name="record",
+            parent_id=self.source_uri,
+            object_id="r1",
+            obj={"value": 42},
+        )
+        self.create_source_record({"id": "r5", "value": 5})
+
+        with mock.patch.object(
+            self.storage, "list_all", wraps=self.storage.list_all
+        ) as list_all:
+            changed = self.updater.rollback_changes(
+                DummyRequest(), refresh_last_edit=False
+            )
+
+        assert changed == 2
+        assert self.records(self.source_uri) == self.records(self.dest_uri)
+        assert all("filters" in c[1] for c in list_all.call_args_list)
+        assert self.push() == (0, False)
@@ -3,6 +3,7 @@ from unittest import mock
 
 import cryptography.x509
 import pytest
+from kinto.core.events import ACTIONS
 from kinto_remote_settings.signer import utils
 from pyramid.exceptions import ConfigurationError
 
@@ -266,6 +267,40 @@ def test_expand_collections_glob_settings():
     }
 
 
+def test_expand_collection_glob_settings():
+    settings = {
+        "signer.some_setting": "foo",
+        "signer.main-workspace.quicksuggest-(\\w+)-(desktop|mobile).to_review_enabled": True,
+        "signer.(main|security)-workspace.(\\w+)-fr.to_review_enabled": False,
+    }
+    glob_settings = utils.compile_glob_settings(settings)
+
+    assert utils.expand_collection_glob_settings(
+        glob_settings, "main-workspace", "quicksuggest-fr-mobile"
+    ) == {"signer.main-workspace.quicksuggest-fr-mobile.to_review_enabled": True}
+    assert utils.expand_collection_glob_settings(
+        glob_settings, "security-workspace", "onecrl-fr"
+    ) == {"signer.security-workspace.onecrl-fr.to_review_enabled": False}
+    assert (
+        utils.expand_collection_glob_settings(glob_settings, "main", "onecrl-fr") == {}
+    )
+
+
+@pytest.mark.parametrize(
+    ("obj", "path"),
+    [
+        ({"a": 3.14}, "a"),
+        ({"a": {"b": 41.0}}, "a.b"),
+        ({"a": [{"b": 41.0}]}, "a.0.b"),
+        ({"x": [1, {"y": "z"}], "a": {"b": [True, 1, [2.5]]}}, "a.b.2.0"),
+        ({"x": {"y": 1}, "a": 0.5}, "a"),
+        ({"a": [1, "2", True, None, {}, []], "b": {"c": 3}}, None),
+    ],
+)
+def test_find_float(obj, path):
+    assert utils.find_float(obj) == path
+
+
 # spellchecker:off  # noqa: ERA001
 CERT_PEM = """-----BEGIN CERTIFICATE-----
 MIIC8zCCAnmgAwIBAgIIGGahTB7ZjAEwCgYIKoZIzj0EAwMwgZExCzAJBgNVBAYT
@@ -378,3 +413,35 @@ def test_fetch_cert():
 )
 def test_attachments_size_diff(left, right, expected):
     assert utils.attachments_size_diff(left, right) == expected
+
+
+def test_notify_records_events_builds_one_request_per_action():
+    request = mock.MagicMock()
+    changes = [
+        (ACTIONS.CREATE, {"id": "a", "last_modified": 1}, None),
+        (ACTIONS.DELETE, {"id": "b", "last_modified": 2}, {"id": "b"}),
+        (ACTIONS.CREATE, {"id": "c", "last_modified": 3}, None),
+    ]
+    with mock.patch.object(utils, "build_request") as build_request:
+        utils.notify_records_events(
+            request,
+            parent_id="/buckets/main/collections/cid",
+            matchdict={"bucket_id": "main", "collection_id": "cid"},
+            changes=changes,
+        )
+
+    assert [c.args[1] for c in build_request.call_args_list] == [
+        {"method": "PUT", "path": "/buckets/main/collections/cid/records/a"},
+        {"method": "DELETE", "path": "/buckets/main/collections/cid/records/b"},
+    ]
+    fakerequest = build_request.return_value
+    assert fakerequest.selected_userid == "remote-settings"
+    assert fakerequest._attachment_auto_save
+    assert [
+        (c.kwargs["action"], c.kwargs["data"]["id"], c.kwargs["timestamp"])
+        for c in fakerequest.notify_resource_event.call_args_list
+    ] == [
+        (ACTIONS.CREATE, "a", 1),
+        (ACTIONS.CREATE, "c", 3),
+        (ACTIONS.DELETE, "b", 2),
+    ]